@@ -0,0 +1,103 @@
+"""Mede tempo e pico de memória da correção de inclinação/perspectiva por foto."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import cv2  # type: ignore
+except Exception as exc:  # noqa: BLE001
+    raise SystemExit(
+        "OpenCV indisponível. Instale com: pip install opencv-python"
+    ) from exc
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.ml_extraction import (  # noqa: E402
+    GEOMETRY_ANALYSIS_SIDE,
+    MLHybridDocumentExtractor,
+)
+
+SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--input-root",
+        required=True,
+        type=Path,
+        help="Diretório com fotos de documentos.",
+    )
+    parser.add_argument(
+        "--analysis-side",
+        type=int,
+        default=GEOMETRY_ANALYSIS_SIDE,
+        help="Lado maior do nível da pirâmide usado na análise.",
+    )
+    return parser.parse_args()
+
+
+def measure(extractor: MLHybridDocumentExtractor, image) -> Tuple[float, float]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    deskewed = extractor._deskew_image(image)
+    extractor._try_perspective_warp(deskewed)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main() -> None:
+    args = parse_args()
+    images = sorted(
+        path
+        for path in args.input_root.rglob("*")
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+    if not images:
+        raise SystemExit(f"Nenhuma imagem encontrada em {args.input_root}")
+
+    extractor = MLHybridDocumentExtractor()
+    # Antes: análise na foto inteira (lado 0). Depois: nível reduzido da pirâmide.
+    modes = {
+        "resolução total": 0,
+        f"pirâmide ({args.analysis_side}px)": args.analysis_side,
+    }
+    results: Dict[str, List[Tuple[float, float]]] = {name: [] for name in modes}
+
+    for path in images:
+        image = cv2.imread(str(path))
+        if image is None:
+            print(f"  ignorado (não abriu): {path.name}")
+            continue
+        for name, side in modes.items():
+            extractor.geometry_analysis_side = side
+            results[name].append(measure(extractor, image))
+
+    print(f"Fotos: {len(results['resolução total'])}")
+    print(
+        f"{'modo':<22} {'tempo médio(ms)':>16} {'pico médio(MB)':>15} {'pico máx(MB)':>13}"
+    )
+    for name, samples in results.items():
+        if not samples:
+            continue
+        times = [elapsed for elapsed, _ in samples]
+        peaks = [peak for _, peak in samples]
+        print(
+            f"{name:<22} {statistics.mean(times) * 1000:>16.1f} "
+            f"{statistics.mean(peaks):>15.1f} {max(peaks):>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
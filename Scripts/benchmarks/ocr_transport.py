@@ -0,0 +1,90 @@
+"""Compara o transporte de imagens ao Tesseract: arquivos temporários x stdin."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from PIL import Image, ImageOps  # type: ignore
+except Exception as exc:  # noqa: BLE001
+    raise SystemExit("Pillow indisponível. Instale com: pip install Pillow") from exc
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.extractors.local import OCR_CONFIGS  # noqa: E402
+from app.extractors.ocr_engine import create_ocr_engine  # noqa: E402
+
+SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--input-root",
+        required=True,
+        type=Path,
+        help="Diretório com imagens de documentos.",
+    )
+    parser.add_argument(
+        "--lang",
+        default="por+eng",
+        help="Idioma do OCR para o Tesseract.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    images = sorted(
+        path
+        for path in args.input_root.rglob("*")
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+    if not images:
+        raise SystemExit(f"Nenhuma imagem encontrada em {args.input_root}")
+
+    engines = {}
+    for name in ("pytesseract", "tesseract"):
+        engine = create_ocr_engine(preference=name)
+        if engine is not None and engine.name == name:
+            engines[name] = engine
+    if not engines:
+        raise SystemExit("Nenhum motor via binário disponível (pytesseract/tesseract).")
+
+    timings: Dict[str, List[float]] = {name: [] for name in engines}
+    for path in images:
+        with Image.open(path) as img:
+            gray = ImageOps.grayscale(img.convert("RGB"))
+        # Mesma imagem com os três PSMs, como no plano de OCR.
+        for name, engine in engines.items():
+            for config in OCR_CONFIGS:
+                started = time.perf_counter()
+                try:
+                    engine.image_to_string(gray, lang=args.lang, config=config)
+                except Exception as exc:  # noqa: BLE001
+                    print(f"  {name}: falha em {path.name}: {exc}")
+                    continue
+                timings[name].append(time.perf_counter() - started)
+
+    print(
+        f"Imagens: {len(images)}  Chamadas por motor: {len(images) * len(OCR_CONFIGS)}"
+    )
+    print(f"{'motor':<12} {'média(ms)':>10} {'mediana(ms)':>12} {'total(s)':>9}")
+    for name, samples in timings.items():
+        if not samples:
+            continue
+        print(
+            f"{name:<12} {statistics.mean(samples) * 1000:>10.1f} "
+            f"{statistics.median(samples) * 1000:>12.1f} {sum(samples):>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Mede a vazão da gramática de campos sobre textos de OCR já extraídos."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.extractors.local import DocumentExtractor  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--input-root",
+        required=True,
+        type=Path,
+        help=(
+            "Diretório com saídas de OCR em .txt ou entradas .json do cache de "
+            "extração (campo `text`)."
+        ),
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Repetições sobre o corpus; o resultado usa a mediana.",
+    )
+    return parser.parse_args()
+
+
+def load_corpus(root: Path) -> List[str]:
+    texts: List[str] = []
+    for path in sorted(root.rglob("*")):
+        if not path.is_file():
+            continue
+        suffix = path.suffix.lower()
+        try:
+            if suffix == ".txt":
+                texts.append(path.read_text(encoding="utf-8", errors="replace"))
+            elif suffix == ".json":
+                with open(path, "r", encoding="utf-8") as handle:
+                    payload = json.load(handle)
+                if isinstance(payload, dict) and isinstance(payload.get("text"), str):
+                    texts.append(payload["text"])
+        except (OSError, ValueError) as exc:
+            print(f"  ignorado {path.name}: {exc}")
+    return [text for text in texts if text.strip()]
+
+
+def measure(run: Callable[[str], object], texts: List[str], repeat: int) -> float:
+    timings = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        for text in texts:
+            run(text)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    args = parse_args()
+    texts = load_corpus(args.input_root)
+    if not texts:
+        raise SystemExit(f"Nenhum texto de OCR encontrado em {args.input_root}")
+
+    extractor = DocumentExtractor(cache=None)
+    cleaned = [extractor._clean_text(text) for text in texts]
+    megabytes = sum(len(text.encode("utf-8")) for text in cleaned) / (1024 * 1024)
+
+    extractor.field_prefilter = False
+    reference = [extractor._parse_cleaned(text) for text in cleaned]
+    extractor.field_prefilter = True
+    divergent = sum(
+        extractor._parse_cleaned(text) != fields
+        for text, fields in zip(cleaned, reference)
+    )
+
+    print(
+        f"Textos: {len(texts)}  Tamanho: {megabytes:.2f} MB  Repetições: {args.repeat}"
+    )
+    print(f"{'modo':<10} {'total(ms)':>10} {'textos/s':>10} {'MB/s':>8}")
+    for mode, prefilter in (("completa", False), ("indexada", True)):
+        extractor.field_prefilter = prefilter
+        elapsed = measure(extractor._parse_cleaned, cleaned, args.repeat)
+        print(
+            f"{mode:<10} {elapsed * 1000:>10.1f} {len(cleaned) / elapsed:>10.0f} "
+            f"{megabytes / elapsed:>8.2f}"
+        )
+    extractor.field_prefilter = True
+    elapsed = measure(extractor.parse_fields, texts, args.repeat)
+    print(
+        f"{'+limpeza':<10} {elapsed * 1000:>10.1f} {len(texts) / elapsed:>10.0f} "
+        f"{megabytes / elapsed:>8.2f}"
+    )
+    if divergent:
+        print(f"Atenção: {divergent} texto(s) com campos diferentes entre os modos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compara os backends de PDF (abertura, texto por página e rasterização)."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.extractors.pdf_backend import available_pdf_backends, open_pdf  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--input-root",
+        required=True,
+        type=Path,
+        help="Diretório com PDFs (ex.: certidões digitais e escaneadas).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Repetições por arquivo; o resultado usa a mediana.",
+    )
+    parser.add_argument(
+        "--zoom",
+        type=float,
+        default=200 / 72,
+        help="Zoom de rasterização (padrão: 200 DPI).",
+    )
+    return parser.parse_args()
+
+
+def measure(file_path: Path, backend: str, zoom: float) -> Dict[str, float]:
+    started = time.perf_counter()
+    with open_pdf(file_path, preference=backend) as doc:
+        opened = time.perf_counter()
+        pages = doc.page_count
+        for index in range(pages):
+            doc.page_text(index)
+        text_done = time.perf_counter()
+        render = 0.0
+        if doc.can_render:
+            for index in range(pages):
+                doc.render_page(index, zoom)
+            render = time.perf_counter() - text_done
+    return {
+        "pages": float(pages),
+        "open": opened - started,
+        "text": text_done - opened,
+        "render": render,
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    pdfs = sorted(args.input_root.rglob("*.pdf"))
+    if not pdfs:
+        raise SystemExit(f"Nenhum PDF encontrado em {args.input_root}")
+    backends = available_pdf_backends()
+    if not backends:
+        raise SystemExit("Nenhum backend de PDF instalado (pymupdf ou pypdf).")
+
+    print(f"Arquivos: {len(pdfs)}  Repetições: {args.repeat}")
+    print(
+        f"{'backend':<8} {'páginas':>8} {'abrir(ms)':>10} {'texto(ms)':>10} "
+        f"{'render(ms)':>11} {'total(ms)':>10}"
+    )
+    for backend in backends:
+        totals = {"pages": 0.0, "open": 0.0, "text": 0.0, "render": 0.0}
+        for pdf in pdfs:
+            runs: List[Dict[str, float]] = []
+            for _ in range(max(1, args.repeat)):
+                try:
+                    runs.append(measure(pdf, backend, args.zoom))
+                except Exception as exc:  # noqa: BLE001
+                    print(f"  {backend}: falha em {pdf.name}: {exc}")
+                    break
+            if not runs:
+                continue
+            for key in totals:
+                totals[key] += statistics.median(run[key] for run in runs)
+        total = totals["open"] + totals["text"] + totals["render"]
+        print(
+            f"{backend:<8} {int(totals['pages']):>8} {totals['open'] * 1000:>10.1f} "
+            f"{totals['text'] * 1000:>10.1f} {totals['render'] * 1000:>11.1f} "
+            f"{total * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
@@ -12,12 +13,18 @@ try:
 except Exception as exc:  # noqa: BLE001
     raise SystemExit("Pillow indisponível. Instale com: pip install Pillow") from exc
 
-try:
-    import pytesseract  # type: ignore
-except Exception as exc:  # noqa: BLE001
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.extractors.ocr_engine import get_ocr_engine  # noqa: E402
+
+OCR_ENGINE = get_ocr_engine()
+if OCR_ENGINE is None:
     raise SystemExit(
-        "pytesseract indisponível. Instale com: pip install pytesseract"
-    ) from exc
+        "Motor OCR indisponível. Instale com: pip install pytesseract "
+        "(ou tesserocr para OCR em processo)"
+    )
 
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
 
@@ -84,10 +91,10 @@ def ocr_best_text(image_obj, lang: str) -> str:
         for config in configs:
             text = ""
             try:
-                text = pytesseract.image_to_string(variant, lang=lang, config=config)
+                text = OCR_ENGINE.image_to_string(variant, lang=lang, config=config)
             except Exception:
                 try:
-                    text = pytesseract.image_to_string(variant, config=config)
+                    text = OCR_ENGINE.image_to_string(variant, config=config)
                 except Exception:
                     continue
 
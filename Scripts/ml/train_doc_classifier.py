@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
 try:
     import joblib  # type: ignore
@@ -14,10 +15,13 @@ except Exception as exc:  # noqa: BLE001
     raise SystemExit("joblib indisponível. Instale com: pip install joblib") from exc
 
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
+    import numpy as np  # type: ignore
+    from sklearn.feature_extraction.text import (  # type: ignore
+        HashingVectorizer,
+        TfidfVectorizer,
+    )
     from sklearn.metrics import accuracy_score  # type: ignore
     from sklearn.model_selection import train_test_split  # type: ignore
-    from sklearn.pipeline import Pipeline  # type: ignore
     from sklearn.svm import LinearSVC  # type: ignore
 except Exception as exc:  # noqa: BLE001
     raise SystemExit(
@@ -26,6 +30,7 @@ except Exception as exc:  # noqa: BLE001
 
 
 MIN_SAMPLES = 40
+HASH_FEATURES = 2**18
 
 
 def parse_args() -> argparse.Namespace:
@@ -54,6 +59,20 @@ def parse_args() -> argparse.Namespace:
         default=42,
         help="Seed para split reprodutível.",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help=(
+            "Gera artefato compacto: HashingVectorizer sem vocabulário e "
+            "coeficientes float32 carregados via memory map."
+        ),
+    )
+    parser.add_argument(
+        "--hash-features",
+        type=int,
+        default=HASH_FEATURES,
+        help="Dimensão do espaço de hashing no modo --compact.",
+    )
     return parser.parse_args()
 
 
@@ -85,23 +104,48 @@ def load_rows(path: Path) -> Tuple[List[str], List[str], List[str]]:
     return texts, types, sides
 
 
-def build_pipeline() -> Pipeline:
-    return Pipeline(
-        [
-            (
-                "tfidf",
-                TfidfVectorizer(
-                    lowercase=True,
-                    ngram_range=(1, 3),
-                    min_df=2,
-                    max_features=40000,
-                ),
-            ),
-            ("clf", LinearSVC()),
-        ]
+def build_vectorizer() -> TfidfVectorizer:
+    return TfidfVectorizer(
+        lowercase=True,
+        ngram_range=(1, 3),
+        min_df=2,
+        max_features=40000,
     )
 
 
+def hashing_params(n_features: int) -> Dict[str, Any]:
+    # Mesmos parâmetros são gravados no artefato e recriados na carga.
+    return {
+        "lowercase": True,
+        "ngram_range": (1, 3),
+        "n_features": n_features,
+        "alternate_sign": False,
+        "norm": "l2",
+    }
+
+
+def export_head(head: LinearSVC) -> Dict[str, Any]:
+    # Só colunas do hashing vistas no treino têm peso: o resto não é gravado.
+    columns = np.flatnonzero(np.any(head.coef_ != 0, axis=0)).astype(np.int32)
+    return {
+        "coef": np.ascontiguousarray(head.coef_[:, columns], dtype=np.float32),
+        "columns": columns,
+        "intercept": np.ascontiguousarray(head.intercept_, dtype=np.float32),
+        "classes": [str(label) for label in head.classes_],
+    }
+
+
+def report_artifact(path: Path, repeat: int = 5) -> None:
+    size_kb = path.stat().st_size / 1024
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        joblib.load(path, mmap_mode="r")
+        timings.append(time.perf_counter() - started)
+    print(f"Tamanho do artefato: {size_kb:.1f} KB")
+    print(f"Carga (joblib, mmap): {min(timings) * 1000:.1f} ms (melhor de {repeat})")
+
+
 def main() -> None:
     args = parse_args()
     dataset_path = args.dataset_jsonl.expanduser().resolve()
@@ -131,31 +175,50 @@ def main() -> None:
     y_side_train = [sides[index] for index in train_idx]
     y_side_test = [sides[index] for index in test_idx]
 
-    type_model = build_pipeline()
-    side_model = build_pipeline()
+    # Um único vetorizador alimenta as duas cabeças: cada texto é tokenizado uma vez.
+    if args.compact:
+        vectorizer = HashingVectorizer(**hashing_params(args.hash_features))
+    else:
+        vectorizer = build_vectorizer()
+    features_train = vectorizer.fit_transform(x_train)
+    features_test = vectorizer.transform(x_test)
 
-    type_model.fit(x_train, y_type_train)
-    side_model.fit(x_train, y_side_train)
+    type_head = LinearSVC()
+    side_head = LinearSVC()
+    type_head.fit(features_train, y_type_train)
+    side_head.fit(features_train, y_side_train)
 
-    pred_type = type_model.predict(x_test)
-    pred_side = side_model.predict(x_test)
+    pred_type = type_head.predict(features_test)
+    pred_side = side_head.predict(features_test)
 
     type_accuracy = accuracy_score(y_type_test, pred_type)
     side_accuracy = accuracy_score(y_side_test, pred_side)
 
-    payload = {
-        "type_model": type_model,
-        "side_model": side_model,
-        "metadata": {
-            "samples": len(texts),
-            "test_size": args.test_size,
-            "seed": args.seed,
-            "type_accuracy": float(type_accuracy),
-            "side_accuracy": float(side_accuracy),
-            "trained_at": datetime.now(timezone.utc).isoformat(),
-            "source": str(dataset_path),
-        },
+    metadata = {
+        "samples": len(texts),
+        "test_size": args.test_size,
+        "seed": args.seed,
+        "type_accuracy": float(type_accuracy),
+        "side_accuracy": float(side_accuracy),
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "source": str(dataset_path),
     }
+    if args.compact:
+        payload: Dict[str, Any] = {
+            "format": "compact",
+            "hashing": hashing_params(args.hash_features),
+            "type_head": export_head(type_head),
+            "side_head": export_head(side_head),
+            "metadata": metadata,
+        }
+    else:
+        payload = {
+            "format": "joint",
+            "vectorizer": vectorizer,
+            "type_head": type_head,
+            "side_head": side_head,
+            "metadata": metadata,
+        }
 
     output_model.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(payload, output_model)
@@ -164,6 +227,7 @@ def main() -> None:
     print(f"Acurácia tipo: {type_accuracy:.4f}")
     print(f"Acurácia lado: {side_accuracy:.4f}")
     print(f"Modelo salvo em: {output_model}")
+    report_artifact(output_model)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+"""Treina o pré-classificador visual de tipo/lado (antes do OCR) a partir de imagens."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import joblib  # type: ignore
+except Exception as exc:  # noqa: BLE001
+    raise SystemExit("joblib indisponível. Instale com: pip install joblib") from exc
+
+try:
+    import numpy as np  # type: ignore
+    from sklearn.linear_model import LogisticRegression  # type: ignore
+    from sklearn.metrics import accuracy_score  # type: ignore
+    from sklearn.model_selection import train_test_split  # type: ignore
+    from sklearn.preprocessing import StandardScaler  # type: ignore
+except Exception as exc:  # noqa: BLE001
+    raise SystemExit(
+        "scikit-learn indisponível. Instale com: pip install scikit-learn"
+    ) from exc
+
+try:
+    from PIL import Image  # type: ignore
+except Exception as exc:  # noqa: BLE001
+    raise SystemExit("Pillow indisponível. Instale com: pip install Pillow") from exc
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.ml_extraction import (  # noqa: E402
+    DEFAULT_IMAGE_MODEL_PATH,
+    IMAGE_FEATURE_SIDE,
+    image_layout_features,
+)
+
+MIN_SAMPLES = 40
+SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--input-root",
+        required=True,
+        type=Path,
+        help="Dataset em estrutura: <tipo>/<lado>/*.jpg",
+    )
+    parser.add_argument(
+        "--output-model",
+        default=Path(DEFAULT_IMAGE_MODEL_PATH),
+        type=Path,
+        help="Caminho do artefato .joblib.",
+    )
+    parser.add_argument(
+        "--test-size",
+        type=float,
+        default=0.2,
+        help="Percentual para validação holdout.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Seed para split reprodutível.",
+    )
+    return parser.parse_args()
+
+
+def iter_images(root: Path) -> Iterable[Path]:
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS:
+            yield path
+
+
+def infer_labels(root: Path, image_path: Path) -> Tuple[str, str]:
+    parts = image_path.relative_to(root).parts
+    if len(parts) < 3:
+        raise ValueError(
+            "Estrutura inválida. Use: <input-root>/<doc_type>/<doc_side>/<arquivo>"
+        )
+    return parts[0].upper(), parts[1].upper()
+
+
+def load_features(path: Path):
+    with Image.open(path) as img:
+        # A miniatura basta: decodifica o JPEG já reduzido.
+        img.draft("RGB", (IMAGE_FEATURE_SIDE * 2, IMAGE_FEATURE_SIDE * 2))
+        return image_layout_features(img.convert("RGB"))
+
+
+def export_head(head: LogisticRegression, scaler: StandardScaler) -> Dict[str, Any]:
+    # Padronização embutida: w' = w / escala, b' = b - w' . média.
+    coef = head.coef_ / scaler.scale_
+    intercept = head.intercept_ - coef @ scaler.mean_
+    return {
+        "coef": np.ascontiguousarray(coef, dtype=np.float32),
+        "intercept": np.ascontiguousarray(intercept, dtype=np.float32),
+        "classes": [str(label) for label in head.classes_],
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    input_root = args.input_root.expanduser().resolve()
+    output_model = args.output_model.expanduser().resolve()
+
+    if not input_root.exists():
+        raise SystemExit(f"Diretório de entrada inexistente: {input_root}")
+
+    rows: List[Any] = []
+    types: List[str] = []
+    sides: List[str] = []
+    for image_path in iter_images(input_root):
+        try:
+            doc_type, doc_side = infer_labels(input_root, image_path)
+            features = load_features(image_path)
+        except Exception:
+            continue
+        rows.append(features)
+        types.append(doc_type)
+        sides.append(doc_side)
+
+    if len(rows) < MIN_SAMPLES:
+        raise SystemExit(
+            f"Amostras insuficientes ({len(rows)}). Necessário pelo menos {MIN_SAMPLES}."
+        )
+
+    matrix = np.vstack(rows)
+    labels = [f"{doc_type}/{doc_side}" for doc_type, doc_side in zip(types, sides)]
+    train_idx, test_idx = train_test_split(
+        np.arange(len(rows)),
+        test_size=args.test_size,
+        random_state=args.seed,
+        stratify=labels,
+    )
+
+    scaler = StandardScaler().fit(matrix[train_idx])
+    x_train = scaler.transform(matrix[train_idx])
+    x_test = scaler.transform(matrix[test_idx])
+
+    y_type = np.asarray(types)
+    y_side = np.asarray(sides)
+    type_head = LogisticRegression(max_iter=2000)
+    side_head = LogisticRegression(max_iter=2000)
+    type_head.fit(x_train, y_type[train_idx])
+    side_head.fit(x_train, y_side[train_idx])
+
+    type_accuracy = accuracy_score(y_type[test_idx], type_head.predict(x_test))
+    side_accuracy = accuracy_score(y_side[test_idx], side_head.predict(x_test))
+
+    payload: Dict[str, Any] = {
+        "format": "image",
+        "feature_side": IMAGE_FEATURE_SIDE,
+        "type_head": export_head(type_head, scaler),
+        "side_head": export_head(side_head, scaler),
+        "metadata": {
+            "samples": len(rows),
+            "test_size": args.test_size,
+            "seed": args.seed,
+            "type_accuracy": float(type_accuracy),
+            "side_accuracy": float(side_accuracy),
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+            "source": str(input_root),
+        },
+    }
+
+    output_model.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(payload, output_model)
+
+    print(f"Amostras: {len(rows)}")
+    print(f"Acurácia tipo: {type_accuracy:.4f}")
+    print(f"Acurácia lado: {side_accuracy:.4f}")
+    print(f"Modelo salvo em: {output_model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,55 @@ from __future__ import annotations
 
 try:
     from .extractors import (
+        CancellationToken,
         DocumentExtractor,
+        ExtractionCancelled,
+        ExtractionProgress,
         ExtractionResult,
         ExtractorProtocol,
+        FileExtraction,
         GeminiDocumentExtractor,
+        OcrBudget,
+        OcrCandidate,
+        OcrProfile,
         create_document_extractor,
+        get_document_extractor,
+        image_fingerprint,
+        preload_document_extractor,
     )
 except Exception:
     from extractors import (  # type: ignore
+        CancellationToken,
         DocumentExtractor,
+        ExtractionCancelled,
+        ExtractionProgress,
         ExtractionResult,
         ExtractorProtocol,
+        FileExtraction,
         GeminiDocumentExtractor,
+        OcrBudget,
+        OcrCandidate,
+        OcrProfile,
         create_document_extractor,
+        get_document_extractor,
+        image_fingerprint,
+        preload_document_extractor,
     )
 
 __all__ = [
+    "CancellationToken",
     "DocumentExtractor",
+    "ExtractionCancelled",
+    "ExtractionProgress",
     "ExtractionResult",
     "ExtractorProtocol",
+    "FileExtraction",
     "GeminiDocumentExtractor",
+    "OcrBudget",
+    "OcrCandidate",
+    "OcrProfile",
     "create_document_extractor",
+    "get_document_extractor",
+    "image_fingerprint",
+    "preload_document_extractor",
 ]
@@ -1,13 +1,37 @@
 """Extratores de documentos organizados por provider."""
 
-from .factory import create_document_extractor
+from .factory import (
+    create_document_extractor,
+    get_document_extractor,
+    preload_document_extractor,
+)
 from .gemini import GeminiDocumentExtractor
-from .local import DocumentExtractor, ExtractionResult, ExtractorProtocol
+from .local import (
+    CancellationToken,
+    DocumentExtractor,
+    ExtractionCancelled,
+    ExtractionProgress,
+    ExtractionResult,
+    ExtractorProtocol,
+    FileExtraction,
+    OcrCandidate,
+)
+from .ocr_planner import OcrBudget, OcrProfile, image_fingerprint
 
 __all__ = [
+    "CancellationToken",
     "DocumentExtractor",
+    "ExtractionCancelled",
+    "ExtractionProgress",
     "ExtractionResult",
     "ExtractorProtocol",
+    "FileExtraction",
     "GeminiDocumentExtractor",
+    "OcrBudget",
+    "OcrCandidate",
+    "OcrProfile",
     "create_document_extractor",
+    "get_document_extractor",
+    "image_fingerprint",
+    "preload_document_extractor",
 ]
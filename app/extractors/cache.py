@@ -0,0 +1,204 @@
+"""Cache persistente de extrações endereçado pelo conteúdo do arquivo."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .ocr_engine import get_ocr_engine
+from .paths import extraction_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Incrementar sempre que OCR, normalização ou parsing mudarem o resultado.
+PIPELINE_VERSION = "8"
+
+DEFAULT_CACHE_MAX_MB = 64
+
+
+def file_sha256(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tesseract_version() -> str:
+    engine = get_ocr_engine()
+    if engine is None:
+        return "none"
+    try:
+        # Idiomas instalados mudam o texto reconhecido tanto quanto a versão.
+        language = engine.capabilities().language() or "default"
+        return f"{engine.name}-{engine.version()}-{language}"
+    except Exception:  # noqa: BLE001
+        return engine.name
+
+
+class ExtractionCache:
+    """Cache em disco com índice JSON e remoção LRU limitada por tamanho.
+
+    Cada entrada é um JSON com texto, campos e avisos de um arquivo. A chave
+    combina hash do conteúdo, provider, versão do pipeline e versão do
+    Tesseract, então qualquer mudança nesses fatores invalida a entrada.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, float]] = {}
+        self._engine_version = ""
+        self._load_index()
+
+    def make_key(self, file_path: Path, provider: str) -> str:
+        if not self._engine_version:
+            self._engine_version = tesseract_version()
+        parts = (
+            file_sha256(file_path),
+            provider,
+            PIPELINE_VERSION,
+            self._engine_version,
+        )
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key not in self._index:
+                return None
+            try:
+                with open(self._entry_path(key), "r", encoding="utf-8") as handle:
+                    payload = json.load(handle)
+            except Exception:  # noqa: BLE001
+                self._index.pop(key, None)
+                self._save_index()
+                return None
+            # Só em memória: o índice é gravado em put/clear, não a cada acerto.
+            self._index[key]["last_access"] = time.time()
+        return payload if isinstance(payload, dict) else None
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        try:
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        except (TypeError, ValueError) as exc:
+            logger.warning(f"Entrada de cache não serializável: {exc}")
+            return
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self._atomic_write(self._entry_path(key), data)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Falha ao gravar cache de extração: {exc}")
+                return
+            self._index[key] = {"size": len(data), "last_access": time.time()}
+            self._evict()
+            self._save_index()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._index):
+                self._remove_entry(key)
+            self._save_index()
+
+    def _evict(self) -> None:
+        total = sum(int(item.get("size", 0)) for item in self._index.values())
+        if total <= self.max_bytes:
+            return
+        by_age = sorted(self._index, key=lambda k: self._index[k]["last_access"])
+        for key in by_age:
+            if total <= self.max_bytes:
+                break
+            total -= int(self._index[key].get("size", 0))
+            self._remove_entry(key)
+
+    def _remove_entry(self, key: str) -> None:
+        self._index.pop(key, None)
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Falha ao remover entrada de cache {key}: {exc}")
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load_index(self) -> None:
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return
+        try:
+            with open(index_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Índice do cache de extração inválido: {exc}")
+            return
+        if isinstance(data, dict):
+            self._index = {
+                key: value
+                for key, value in data.items()
+                if isinstance(value, dict) and self._entry_path(key).exists()
+            }
+
+    def _save_index(self) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            data = json.dumps(self._index).encode("utf-8")
+            self._atomic_write(self.cache_dir / self.INDEX_FILE, data)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Falha ao salvar índice do cache de extração: {exc}")
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+
+_cache_lock = threading.Lock()
+_cache_instance: Optional[ExtractionCache] = None
+_cache_resolved = False
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Cache global de extração (None quando desativado).
+
+    Variáveis:
+    - EXTRACTION_CACHE=1|0 (default: 1)
+    - EXTRACTION_CACHE_DIR (opcional; padrão: cache do usuário, ver `paths`)
+    - EXTRACTION_CACHE_MAX_MB=64 (opcional)
+    """
+    global _cache_instance, _cache_resolved
+    with _cache_lock:
+        if _cache_resolved:
+            return _cache_instance
+        _cache_resolved = True
+        enabled = os.environ.get("EXTRACTION_CACHE", "1").strip().lower()
+        if enabled in {"0", "false", "no", "off"}:
+            return None
+        try:
+            max_mb = float(os.environ.get("EXTRACTION_CACHE_MAX_MB", "").strip())
+        except ValueError:
+            max_mb = DEFAULT_CACHE_MAX_MB
+        _cache_instance = ExtractionCache(
+            extraction_cache_dir(),
+            max_bytes=int(max_mb * 1024 * 1024),
+        )
+        return _cache_instance
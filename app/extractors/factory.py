@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import logging
 import os
-from typing import List, Tuple
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 from .gemini import GeminiDocumentExtractor
 from .local import DocumentExtractor, ExtractorProtocol
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_ML_MODEL_PATH = "app/models/doc_classifier.joblib"
+DEFAULT_ML_IMAGE_MODEL_PATH = "app/models/doc_image_classifier.joblib"
+
 
 def create_document_extractor() -> Tuple[ExtractorProtocol, List[str]]:
     """
@@ -18,6 +26,7 @@ def create_document_extractor() -> Tuple[ExtractorProtocol, List[str]]:
     - GEMINI_API_KEY=...
     - GEMINI_MODEL=gemini-2.5-flash (opcional)
     - ML_DOC_MODEL_PATH=app/models/doc_classifier.joblib (opcional)
+    - ML_IMAGE_MODEL_PATH=app/models/doc_image_classifier.joblib (opcional)
     """
     provider = os.environ.get("EXTRACTION_PROVIDER", "auto").strip().lower()
     api_key = os.environ.get("GEMINI_API_KEY", "").strip()
@@ -32,8 +41,9 @@ def create_document_extractor() -> Tuple[ExtractorProtocol, List[str]]:
         )
 
     if provider in {"ml", "machine", "hybrid"}:
-        model_path = os.environ.get(
-            "ML_DOC_MODEL_PATH", "app/models/doc_classifier.joblib"
+        model_path = os.environ.get("ML_DOC_MODEL_PATH", DEFAULT_ML_MODEL_PATH).strip()
+        image_model_path = os.environ.get(
+            "ML_IMAGE_MODEL_PATH", DEFAULT_ML_IMAGE_MODEL_PATH
         ).strip()
         try:
             try:
@@ -43,7 +53,72 @@ def create_document_extractor() -> Tuple[ExtractorProtocol, List[str]]:
         except Exception as exc:  # noqa: BLE001
             warnings.append(f"Extrator ML indisponível ({exc}); usado extrator local.")
         else:
-            extractor = MLHybridDocumentExtractor(model_path=model_path)
+            extractor = MLHybridDocumentExtractor(
+                model_path=model_path, image_model_path=image_model_path
+            )
             return extractor, warnings
 
     return DocumentExtractor(), warnings
+
+
+_extractor_lock = threading.Lock()
+_extractor_entry: Optional[
+    Tuple[Tuple[str, ...], ExtractorProtocol, Tuple[str, ...]]
+] = None
+
+
+def _model_stamp(path: str) -> str:
+    try:
+        # Um artefato retreinado no mesmo caminho também exige recarga.
+        return str(Path(path).stat().st_mtime_ns)
+    except OSError:
+        return ""
+
+
+def _extractor_settings() -> Tuple[str, ...]:
+    model_path = os.environ.get("ML_DOC_MODEL_PATH", DEFAULT_ML_MODEL_PATH).strip()
+    image_model_path = os.environ.get(
+        "ML_IMAGE_MODEL_PATH", DEFAULT_ML_IMAGE_MODEL_PATH
+    ).strip()
+    return (
+        os.environ.get("EXTRACTION_PROVIDER", "auto").strip().lower(),
+        model_path,
+        _model_stamp(model_path),
+        image_model_path,
+        _model_stamp(image_model_path),
+        os.environ.get("GEMINI_MODEL", "").strip(),
+        os.environ.get("GEMINI_API_KEY", "").strip(),
+    )
+
+
+def get_document_extractor() -> Tuple[ExtractorProtocol, List[str]]:
+    """
+    Extrator compartilhado pelo processo.
+
+    Reconstruído apenas quando EXTRACTION_PROVIDER, ML_DOC_MODEL_PATH,
+    ML_IMAGE_MODEL_PATH (ou os próprios arquivos dos modelos), GEMINI_MODEL ou
+    GEMINI_API_KEY mudam; assim o
+    modelo ML e o motor de OCR são carregados uma única vez.
+    """
+    global _extractor_entry
+    settings = _extractor_settings()
+    with _extractor_lock:
+        if _extractor_entry is None or _extractor_entry[0] != settings:
+            extractor, warnings = create_document_extractor()
+            _extractor_entry = (settings, extractor, tuple(warnings))
+        return _extractor_entry[1], list(_extractor_entry[2])
+
+
+def preload_document_extractor() -> threading.Thread:
+    """Carrega e aquece o extrator em segundo plano (imports, modelo e OCR)."""
+
+    def run() -> None:
+        try:
+            extractor, _ = get_document_extractor()
+            extractor.warm_up()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Pré-carregamento do extrator falhou: {exc}")
+
+    thread = threading.Thread(target=run, name="extractor-preload", daemon=True)
+    thread.start()
+    return thread
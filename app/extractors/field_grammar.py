@@ -0,0 +1,351 @@
+"""Gramática declarativa dos campos lidos do texto de documentos.
+
+Cada `FieldRule` descreve uma forma de obter um ou mais campos: os rótulos que
+precisam aparecer no texto, os padrões de valor em ordem de prioridade (ou um
+leitor por linhas do extrator) e, por campo, o validador aplicado ao valor
+escolhido. A tabela é compilada uma única vez por processo; cada texto é
+convertido para ASCII uma vez para localizar os rótulos, e as regras sem
+rótulo presente nem chegam a ser avaliadas.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Pattern, Sequence, Tuple
+
+_UFS = (
+    "AC|AL|AP|AM|BA|CE|DF|ES|GO|MA|MT|MS|MG|PA|PB|PR|PE|PI|RJ|RN|RS|RO|RR|SC|SP|SE|TO"
+)
+_DATE = r"[0-3]?\d[\/\-][01]?\d[\/\-]\d{2,4}"
+_MATRICULA = r"(?:matr[íi]cula|matricula)\s*(?:n[ºo.]*)?"
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """Uma alternativa de extração; a ordem na tabela define a prioridade.
+
+    `labels` são trechos em ASCII minúsculo dos quais ao menos um precisa
+    existir no texto para algum padrão casar (vazio: a regra sempre roda).
+    Com `scanner`, os padrões são argumentos do método `_scan_<scanner>` do
+    extrator; sem ele, vale o primeiro padrão cujo grupo não fica vazio.
+    Regras `fallback` só rodam depois dos validadores, para campos que
+    continuam vazios.
+    """
+
+    keys: Tuple[str, ...]
+    labels: Tuple[str, ...] = ()
+    patterns: Tuple[str, ...] = ()
+    scanner: str = ""
+    join_groups: bool = False
+    fallback: bool = False
+
+
+FIELD_GRAMMAR: Tuple[FieldRule, ...] = (
+    FieldRule(
+        ("nome",),
+        labels=("nome",),
+        patterns=(
+            r"(?:^|\n)\s*nome(?:\s+completo)?\s*[:\-]\s*(?!social\b)([^\n]{3,120})",
+            r"(?:^|\n)\s*nome(?:\s+completo)?\s+(?!social\b)([^\n]{3,120})",
+        ),
+    ),
+    FieldRule(
+        ("nome",),
+        labels=("outorgante",),
+        patterns=(r"(?:^|\n)\s*outorgante\s*[:\-]\s*([^\n]{3,120})",),
+    ),
+    FieldRule(
+        ("nome",),
+        labels=("registro",),
+        patterns=(r"(?:^|\n)\s*registro\s+civil\s+([A-ZÁÀÂÃÉÊÍÓÔÕÚÇ ]{6,})",),
+    ),
+    FieldRule(("nome",), labels=("nome",), scanner="best_name", fallback=True),
+    FieldRule(
+        ("nome_pai",),
+        labels=("pai",),
+        patterns=(
+            r"(?:^|\n)\s*nome_pai\s*[:\-]\s*([^\n]{3,120})",
+            r"(?:^|\n)\s*(?:nome\s+do\s+pai|pai)\s*[:\-]\s*([^\n]{3,120})",
+            r"filiaç[ãa]o\s*[:\-].*?\bpai\s*[:\-]\s*([^\n;]+)",
+        ),
+    ),
+    FieldRule(
+        ("nome_mae",),
+        labels=("mae",),
+        patterns=(
+            r"(?:^|\n)\s*nome_mae\s*[:\-]\s*([^\n]{3,120})",
+            r"(?:^|\n)\s*(?:nome\s+da\s+m[ãa]e|m[ãa]e)\s*[:\-]\s*([^\n]{3,120})",
+            r"filiaç[ãa]o\s*[:\-].*?\bm[ãa]e\s*[:\-]\s*([^\n;]+)",
+        ),
+    ),
+    FieldRule(("nome_pai", "nome_mae"), labels=("filiac", "filh"), scanner="filiation"),
+    FieldRule(
+        ("sexo",),
+        labels=("sex",),
+        patterns=(
+            r"(?:^|\n)\s*sexo\s*[:\-]?\s*(masculino|feminino|m|f)\b",
+            r"(?:^|\n)\s*sex\s*[:\-]?\s*(masculino|feminino|m|f)\b",
+            r"\bsexo\s+([mf])\b",
+        ),
+    ),
+    FieldRule(
+        ("nacionalidade",),
+        labels=("nacionalidade", "brasileir", "naturalizad", "estrangeir"),
+        patterns=(
+            r"(?:^|\n)\s*nacionalidade\s*[:\-]\s*([^\n]{3,120})",
+            r"\bnacionalidade\s*[:\-]\s*([^\n]{3,120})",
+            r"\b(brasileir[oa]|brasileir[oa]\s+nato|naturalizad[oa]|estrangeir[oa])\b",
+        ),
+    ),
+    FieldRule(
+        ("estado_civil",),
+        labels=("civil", "solteir", "casad", "divorciad", "separad", "viuv", "uniao"),
+        patterns=(
+            r"(?:^|\n)\s*estado\s*civil\s*[:\-]\s*([^\n]{3,120})",
+            r"\b(solteir[oa]|casad[oa]|divorciad[oa]|separad[oa]|vi[uú]v[oa]"
+            r"|uni[aã]o\s+est[aá]vel)\b",
+        ),
+    ),
+    FieldRule(
+        ("naturalidade",),
+        labels=("natural",),
+        patterns=(
+            r"(?:^|\n)\s*naturalidade\s*[:\-]\s*([^\n]{2,120})",
+            r"\bnaturalidade\s*[:\-]\s*([^\n]{2,120})",
+            r"(?:^|\n)\s*natural\s+de\s*[:\-]?\s*([^\n]{2,120})",
+        ),
+    ),
+    FieldRule(
+        ("naturalidade",),
+        labels=("nasc",),
+        patterns=(r"c\.?\s*nasc[^,\n;]*[,;\s]\s*([A-ZÁÀÂÃÉÊÍÓÔÕÚÇ]{3,}(?:-[A-Z]{2}))",),
+    ),
+    FieldRule(
+        ("data_nascimento",),
+        labels=("nasc",),
+        patterns=(
+            rf"(?:data\s+de\s+nascimento|nascimento)\s*[:\-]\s*({_DATE})",
+            rf"\bnascid[oa]?\s*(?:em|aos)?\s*({_DATE})",
+        ),
+    ),
+    FieldRule(
+        ("data_nascimento",),
+        labels=("nascimento", "birth"),
+        patterns=(r"(?:data\s+de\s+nascimento|nascimento|date\s+of\s+birth)",),
+        scanner="date_near_keyword",
+    ),
+    FieldRule(("data_nascimento",), scanner="date_by_words"),
+    FieldRule(
+        ("profissao",),
+        labels=("profiss",),
+        patterns=(r"(?:^|\n)\s*profiss[ãa]o\s*[:\-]\s*([^\n]{2,120})",),
+    ),
+    FieldRule(
+        ("logradouro",),
+        labels=("logradouro", "endereco", "rua", "av", "travessa", "alameda"),
+        patterns=(
+            r"(?:^|\n)\s*(?:logradouro|endere[cç]o)\s*[:\-]\s*([^\n]{3,160})",
+            r"(?:^|\n)\s*(rua|avenida|av\.|travessa|alameda)\s+([^\n]{3,160})",
+        ),
+        join_groups=True,
+    ),
+    FieldRule(
+        ("numero",),
+        labels=("numero",),
+        patterns=(r"(?:^|\n)\s*n[úu]mero\s*[:\-]\s*([^\n]{1,20})",),
+    ),
+    FieldRule(
+        ("bairro",),
+        labels=("bairro",),
+        patterns=(r"(?:^|\n)\s*bairro\s*[:\-]\s*([^\n]{2,120})",),
+    ),
+    FieldRule(
+        ("cidade",),
+        labels=("cidade", "municipio"),
+        patterns=(
+            r"(?:^|\n)\s*(?:cidade|munic[íi]pio)\s*[:\-]\s*([^\n]{2,120})",
+            r"(?:^|\n)\s*localidade\s*[:\-]\s*([^\n]{2,120})",
+        ),
+    ),
+    FieldRule(("email",), labels=("@",), scanner="email"),
+    FieldRule(
+        ("cep",),
+        labels=("cep",),
+        patterns=(
+            r"(?:^|\n)\s*cep\s*[:\-]?\s*(\d{5}-?\d{3})\b",
+            r"(?:\bcep\b)[^\n]{0,15}(\d{5}-?\d{3})",
+        ),
+    ),
+    FieldRule(("cpf",), scanner="cpf"),
+    FieldRule(
+        ("cnh_numero",),
+        labels=("cnh", "habilita", "permiss"),
+        patterns=(r"\b(cnh|habilita[cç][aã]o|permiss[aã]o)\b",),
+        scanner="cnh_number",
+    ),
+    FieldRule(
+        ("cnh_data_expedicao",),
+        labels=("expedic", "emiss"),
+        patterns=(
+            r"(?:data\s+de\s+expedi[cç][aã]o|expedi[cç][aã]o|emiss[aã]o)\s*[:\-]?\s*"
+            r"([0-3]?\d[\/\-.][01]?\d[\/\-.]\d{2,4})",
+        ),
+    ),
+    FieldRule(
+        ("cnh_uf",),
+        labels=("detran", "cnh", "uf"),
+        patterns=(
+            rf"(?:\bdetran\b|\bcnh\b)[^\n]{{0,28}}\b({_UFS})\b",
+            rf"(?:^|\n)\s*uf\s*[:\-]?\s*({_UFS})\b",
+        ),
+    ),
+    FieldRule(
+        ("cert_matricula",),
+        labels=("matricula",),
+        patterns=(
+            rf"(?:^|\n)\s*{_MATRICULA}\s*[:\-]?\s*([^\n]{{6,120}})",
+            rf"(?:certid[aã]o[^\n]{{0,80}})\b{_MATRICULA}\s*([^\n]{{6,120}})",
+        ),
+    ),
+    FieldRule(
+        ("cert_casamento_matricula",),
+        labels=("casamento",),
+        patterns=(
+            rf"(?:certid[aã]o\s+de\s+casamento[^\n]{{0,100}})\b{_MATRICULA}\s*([^\n]{{6,120}})",
+        ),
+    ),
+    FieldRule(
+        ("cert_data",),
+        labels=("certid",),
+        patterns=(
+            rf"(?:certid[aã]o[^\n]{{0,80}})\b(?:em|expedida\s+em|data)\s*[:\-]?\s*({_DATE})",
+        ),
+    ),
+    FieldRule(
+        ("regime_casamento",),
+        labels=("regime", "comunh", "separac", "participac"),
+        patterns=(
+            r"(?:^|\n)\s*regime(?:\s+de\s+bens)?\s*[:\-]\s*([^\n]{3,120})",
+            r"\b(comunh[aã]o\s+parcial|comunh[aã]o\s+universal|separa[cç][aã]o\s+total"
+            r"|participa[cç][aã]o\s+final\s+nos\s+aquestos)\b",
+        ),
+    ),
+    FieldRule(
+        ("loteamento",),
+        labels=("loteamento",),
+        patterns=(r"(?:^|\n)\s*loteamento\s*[:\-]\s*([^\n]{2,120})",),
+    ),
+    FieldRule(("rg", "orgao_rg", "uf_rg"), labels=("rg", "registro"), scanner="rg"),
+)
+
+# Validador (`_validate_<nome>` do extrator) aplicado ao valor escolhido.
+FIELD_VALIDATORS: Dict[str, str] = {
+    "nome": "holder_name",
+    "nome_pai": "person_name",
+    "nome_mae": "person_name",
+    "sexo": "sex",
+    "naturalidade": "location",
+    "nacionalidade": "nationality",
+    "cnh_data_expedicao": "issue_date",
+    "cnh_uf": "upper",
+}
+
+
+def ascii_lower(value: str) -> str:
+    normalized = unicodedata.normalize("NFKD", value or "")
+    return normalized.encode("ascii", "ignore").decode("ascii").lower()
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule: FieldRule
+    patterns: Tuple[Pattern[str], ...]
+
+
+class TextIndex:
+    """Texto já normalizado com os rótulos presentes e as linhas indexadas."""
+
+    def __init__(
+        self,
+        text: str,
+        labels: Optional[FrozenSet[str]] = None,
+        searched: FrozenSet[str] = frozenset(),
+    ) -> None:
+        self.text = text
+        self.lines = text.splitlines()
+        # None: sem pré-filtro, todo rótulo é tratado como presente.
+        self.labels = labels
+        self._absent = searched - labels if labels is not None else frozenset()
+        self._ascii_lines: Optional[List[str]] = None
+        self._lines_with: Dict[Tuple[str, ...], List[int]] = {}
+
+    def has_any(self, labels: Sequence[str]) -> bool:
+        if not labels or self.labels is None:
+            return True
+        return any(label in self.labels for label in labels)
+
+    def line_numbers(self, *labels: str) -> List[int]:
+        """Linhas cujo texto em ASCII minúsculo contém algum dos rótulos."""
+        cached = self._lines_with.get(labels)
+        if cached is not None:
+            return cached
+        if all(label in self._absent for label in labels):
+            numbers: List[int] = []
+        else:
+            if self._ascii_lines is None:
+                self._ascii_lines = [ascii_lower(line) for line in self.lines]
+            numbers = [
+                number
+                for number, line in enumerate(self._ascii_lines)
+                if any(label in line for label in labels)
+            ]
+        self._lines_with[labels] = numbers
+        return numbers
+
+
+class FieldGrammar:
+    """`FIELD_GRAMMAR` com padrões compilados e o conjunto de rótulos."""
+
+    def __init__(
+        self,
+        rules: Sequence[FieldRule] = FIELD_GRAMMAR,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> None:
+        flags = re.IGNORECASE | re.MULTILINE
+        self.rules = tuple(
+            CompiledRule(rule, tuple(re.compile(p, flags) for p in rule.patterns))
+            for rule in rules
+        )
+        self.validators = dict(FIELD_VALIDATORS if validators is None else validators)
+        keys: List[str] = []
+        for rule in rules:
+            keys.extend(key for key in rule.keys if key not in keys)
+        self.keys = tuple(keys)
+
+        # Todos os rótulos da tabela, testados uma vez por texto já convertido
+        # para ASCII minúsculo; no CPython, buscas de substring são mais
+        # rápidas que um único regex alternando todos os rótulos.
+        self._labels = frozenset(label for rule in rules for label in rule.labels)
+
+    def index(self, text: str, prefilter: bool = True) -> TextIndex:
+        if not prefilter:
+            return TextIndex(text)
+        folded = ascii_lower(text)
+        present = frozenset(label for label in self._labels if label in folded)
+        return TextIndex(text, present, self._labels)
+
+
+_grammar_lock = threading.Lock()
+_grammar: Optional[FieldGrammar] = None
+
+
+def get_field_grammar() -> FieldGrammar:
+    """Gramática compilada, compartilhada por todos os extratores do processo."""
+    global _grammar
+    with _grammar_lock:
+        if _grammar is None:
+            _grammar = FieldGrammar()
+        return _grammar
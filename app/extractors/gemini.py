@@ -10,9 +10,14 @@ import re
 import urllib.error
 import urllib.request
 from pathlib import Path
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
-from .local import DocumentExtractor, ExtractionResult
+from .local import (
+    CancellationToken,
+    DocumentExtractor,
+    ExtractionProgress,
+    ExtractionResult,
+)
 
 
 class GeminiDocumentExtractor:
@@ -48,29 +53,80 @@ class GeminiDocumentExtractor:
         self.timeout_seconds = timeout_seconds
         self.local_extractor = DocumentExtractor()
 
-    def extract_from_files(self, files: Sequence[Path]) -> ExtractionResult:
+    def extract_from_files(
+        self, files: Sequence[Path], required_keys: Sequence[str] = ()
+    ) -> ExtractionResult:
+        return self.local_extractor._collect(
+            self.iter_extract_from_files(files, required_keys),
+            ExtractionResult(raw_text="", fields={}, warnings=[]),
+        )
+
+    def warm_up(self) -> None:
+        # Só o fallback local tem algo a carregar.
+        self.local_extractor.warm_up()
+
+    def iter_extract_from_files(
+        self,
+        files: Sequence[Path],
+        required_keys: Sequence[str] = (),
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[ExtractionProgress]:
+        # O Gemini recebe o arquivo inteiro numa chamada; `required_keys` só
+        # existe para manter a interface comum dos extratores.
         blocks: List[str] = []
         warnings: List[str] = []
         merged_fields: Dict[str, str] = {}
 
-        for file_path in files:
-            if not file_path.exists():
-                warnings.append(f"Arquivo não encontrado: {file_path.name}")
+        # Requisições simultâneas; a fusão segue a ordem de entrada.
+        for progress, outcome in self.local_extractor._stream_files(
+            self._extract_single_cached, files, cancel_token
+        ):
+            if progress.page:
+                yield progress
                 continue
+            if outcome is None:
+                warnings.append(f"Arquivo não encontrado: {progress.file_name}")
+            else:
+                fields, text, file_warnings = outcome
+                warnings.extend(file_warnings)
+                if text.strip():
+                    blocks.append(f"===== {progress.file_name} =====\n{text.strip()}")
+                for key in self._TARGET_KEYS:
+                    value = str(fields.get(key, "")).strip()
+                    if value and not merged_fields.get(key):
+                        merged_fields[key] = value
+
+            progress.result = ExtractionResult(
+                raw_text="\n\n".join(blocks).strip(),
+                fields=dict(merged_fields),
+                warnings=list(warnings),
+            )
+            yield progress
+
+    def _extract_single_cached(
+        self, file_path: Path
+    ) -> Tuple[Dict[str, str], str, List[str]]:
+        cache = self.local_extractor.cache
+        if cache is None:
+            return self._extract_single(file_path)
+        try:
+            key = cache.make_key(file_path, f"gemini:{self.model}")
+        except OSError:
+            return self._extract_single(file_path)
+
+        cached = cache.get(key)
+        if cached is not None:
+            return (
+                dict(cached.get("fields", {})),
+                str(cached.get("text", "")),
+                list(cached.get("warnings", [])),
+            )
 
-            fields, text, file_warnings = self._extract_single(file_path)
-            warnings.extend(file_warnings)
-            if text.strip():
-                blocks.append(f"===== {file_path.name} =====\n{text.strip()}")
-            for key in self._TARGET_KEYS:
-                value = str(fields.get(key, "")).strip()
-                if value and not merged_fields.get(key):
-                    merged_fields[key] = value
-
-        raw_text = "\n\n".join(blocks).strip()
-        return ExtractionResult(
-            raw_text=raw_text, fields=merged_fields, warnings=warnings
-        )
+        fields, text, warnings = self._extract_single(file_path)
+        # Só respostas do Gemini sem avisos; fallbacks locais são refeitos.
+        if text.strip() and not warnings:
+            cache.put(key, {"fields": fields, "text": text, "warnings": warnings})
+        return fields, text, warnings
 
     def _extract_single(self, file_path: Path) -> Tuple[Dict[str, str], str, List[str]]:
         suffix = file_path.suffix.lower()
@@ -130,13 +186,13 @@ class GeminiDocumentExtractor:
         return fields, text_output, []
 
     def _extract_local(self, file_path: Path) -> Tuple[Dict[str, str], str, List[str]]:
-        text, warnings = self.local_extractor._extract_single(file_path)
-        parsed = self.local_extractor.parse_fields(text) if text else {}
+        extraction = self.local_extractor._extract_single(file_path)
         local_fields = {
-            key: str(parsed.get(key, "")).strip() for key in self._TARGET_KEYS
+            key: str(extraction.fields.get(key, "")).strip()
+            for key in self._TARGET_KEYS
         }
         local_fields = {k: v for k, v in local_fields.items() if v}
-        return local_fields, text, warnings
+        return local_fields, extraction.text, extraction.warnings
 
     def _extract_with_gemini(
         self,
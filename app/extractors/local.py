@@ -2,31 +2,49 @@
 
 from __future__ import annotations
 
-import io
 import os
+import queue
 import re
-import shutil
-import unicodedata
-from dataclasses import dataclass
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
-
-
-def _load_pdf_reader_class() -> Any:
-    try:
-        from pypdf import PdfReader as pdf_reader_class  # type: ignore
-
-        return pdf_reader_class
-    except Exception:  # noqa: BLE001
-        try:
-            from PyPDF2 import PdfReader as pdf_reader_class  # type: ignore
-
-            return pdf_reader_class
-        except Exception:  # noqa: BLE001
-            return None
-
-
-PdfReaderClass = _load_pdf_reader_class()
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .cache import ExtractionCache, get_extraction_cache
+from .field_grammar import (
+    CompiledRule,
+    FieldGrammar,
+    TextIndex,
+    ascii_lower,
+    get_field_grammar,
+)
+from .ocr_capabilities import OcrCapabilities
+from .ocr_engine import (
+    OcrEngine,
+    OcrResult,
+    OcrWord,
+    default_ocr_workers,
+    get_ocr_engine,
+)
+from .ocr_planner import OcrBudget, OcrPlan, OcrProfile, image_fingerprint
+from .pdf_backend import PdfBackendUnavailable, open_pdf
+from .settings import env_int
 
 try:
     from ..validators import format_cpf as _shared_format_cpf
@@ -42,32 +60,32 @@ except Exception:  # noqa: BLE001
     ImageEnhance = None  # type: ignore[assignment]
     ImageOps = None  # type: ignore[assignment]
 
-try:
-    import pytesseract  # type: ignore
-except Exception:  # noqa: BLE001
-    pytesseract = None  # type: ignore[assignment]
-
-try:
-    import fitz  # type: ignore
-except Exception:  # noqa: BLE001
-    fitz = None  # type: ignore[assignment]
-
-if pytesseract is not None:
-    candidate_paths = [
-        os.environ.get("TESSERACT_CMD", ""),
-        shutil.which("tesseract") or "",
-        str(Path.home() / "miniforge3" / "bin" / "tesseract"),
-        str(Path("/opt/homebrew/bin/tesseract")),
-        str(Path("/usr/local/bin/tesseract")),
-        str(Path(r"C:\Program Files\Tesseract-OCR\tesseract.exe")),
-    ]
-    for candidate in candidate_paths:
-        if candidate and Path(candidate).exists():
-            try:
-                pytesseract.pytesseract.tesseract_cmd = candidate
-            except Exception:  # noqa: BLE001
-                pass
-            break
+OCR_CONFIGS = ("--oem 1 --psm 6", "--oem 1 --psm 11", "--oem 1 --psm 4")
+OCR_PREPROCESSING = ("original", "gray", "contrast", "sharp", "binary")
+# Segunda passada dirigida para CPF/RG: caixas de palavras acham o rótulo e só a
+# faixa ao lado/abaixo dele é relida como linha única de dígitos.
+OCR_LAYOUT_CONFIG = "--oem 1 --psm 11"
+OCR_DIGITS_LINE_CONFIG = "--oem 1 --psm 7 -c tessedit_char_whitelist=0123456789.-/xX"
+# Pontos que um CPF válido soma em `_score_parsed_fields`.
+CPF_FIELD_SCORE = 220
+# CPF válido (220) + nome plausível (150) + nascimento plausível (180).
+OCR_GOOD_ENOUGH_SCORE = 550
+# Confiança média (0-100) das palavras dos campos-chave a partir da qual os
+# demais PSMs da mesma imagem são dispensados.
+OCR_MIN_KEY_CONFIDENCE = 80
+OCR_KEY_FIELDS = ("cpf", "nome", "data_nascimento", "rg")
+# Resolução de trabalho: PDFs renderizados a ~200 DPI e fotos limitadas no lado maior.
+OCR_TARGET_DPI = 200
+OCR_MAX_LONG_SIDE = 2400
+OCR_MIN_LONG_SIDE = 1000
+# Páginas com menos caracteres visíveis que isso são tratadas como escaneadas.
+PDF_PAGE_MIN_TEXT_CHARS = 40
+# Arquivos processados ao mesmo tempo; o OCR de cada um já é paralelo.
+EXTRACTION_MAX_PARALLEL_FILES = 4
+
+_T = TypeVar("_T")
+# Página lida, total de páginas e texto da página.
+PageCallback = Callable[[int, int, str], None]
 
 
 @dataclass
@@ -75,10 +93,106 @@ class ExtractionResult:
     raw_text: str
     fields: Dict[str, str]
     warnings: List[str]
+    # Etapa que produziu cada campo (ver `FileExtraction.provenance`).
+    provenance: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class FileExtraction:
+    """Resultado estruturado de um arquivo, página ou leitura OCR.
+
+    `text` já está normalizado e `fields` já foi interpretado a partir dele:
+    cada saída é normalizada e interpretada uma única vez e as combinações
+    (páginas, arquivos) escolhem campo a campo por `field_scores`.
+    `provenance` indica a etapa de origem de cada campo: "texto" (camada de
+    texto do PDF), "ocr", "ocr_dirigido", "roi" ou "cnh".
+    """
+
+    text: str = ""
+    fields: Dict[str, str] = field(default_factory=dict)
+    field_scores: Dict[str, int] = field(default_factory=dict)
+    provenance: Dict[str, str] = field(default_factory=dict)
+    warnings: List[str] = field(default_factory=list)
+    pages_skipped: int = 0
+
+
+@dataclass
+class ExtractionProgress:
+    """Evento parcial de uma extração em andamento.
+
+    Eventos de página trazem `page`/`page_count` e o texto da página. Eventos
+    de arquivo concluído trazem em `result` o resultado acumulado de todos os
+    arquivos já terminados, sempre na ordem de seleção.
+    """
+
+    file_name: str
+    file_index: int
+    file_count: int
+    page: int = 0
+    page_count: int = 0
+    page_text: str = ""
+    result: Optional[ExtractionResult] = None
+
+    @property
+    def file_done(self) -> bool:
+        return self.result is not None
+
+
+@dataclass
+class OcrCandidate:
+    """Uma leitura OCR pontuada: texto, campos e a confiança de cada campo.
+
+    `confidence` guarda a confiança média (0-100) das palavras que formam o
+    valor de cada campo; -1 quando a leitura não traz caixas de palavras.
+    """
+
+    text: str
+    score: int
+    fields: Dict[str, str]
+    confidence: Dict[str, float] = field(default_factory=dict)
+    # Texto já normalizado, do qual `fields` foi interpretado.
+    cleaned: str = ""
+    source: str = "ocr"
+
+
+class ExtractionCancelled(Exception):
+    """A extração foi interrompida por um `CancellationToken`."""
+
+
+class CancellationToken:
+    """Sinal compartilhado entre a interface e as threads de extração."""
+
+    def __init__(self, parent: Optional["CancellationToken"] = None) -> None:
+        self._event = threading.Event()
+        self._parent = parent
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (
+            self._parent is not None and self._parent.cancelled
+        )
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise ExtractionCancelled()
 
 
 class ExtractorProtocol(Protocol):
-    def extract_from_files(self, files: Sequence[Path]) -> ExtractionResult: ...
+    def extract_from_files(
+        self, files: Sequence[Path], required_keys: Sequence[str] = ()
+    ) -> ExtractionResult: ...
+
+    def iter_extract_from_files(
+        self,
+        files: Sequence[Path],
+        required_keys: Sequence[str] = (),
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[ExtractionProgress]: ...
+
+    def warm_up(self) -> None: ...
 
 
 class DocumentExtractor:
@@ -96,82 +210,557 @@ class DocumentExtractor:
         ".webp",
     }
 
-    def extract_from_files(self, files: Sequence[Path]) -> ExtractionResult:
+    def __init__(
+        self,
+        ocr_workers: Optional[int] = None,
+        ocr_search_mode: str = "",
+        ocr_good_enough_score: Optional[int] = None,
+        ocr_engine: Optional[OcrEngine] = None,
+        cache: Optional[ExtractionCache] = None,
+        file_workers: Optional[int] = None,
+        ocr_budget: Optional[OcrBudget] = None,
+    ) -> None:
+        self.ocr_engine = ocr_engine or get_ocr_engine()
+        self._ocr_capabilities: Optional[OcrCapabilities] = None
+        self.cache = cache if cache is not None else get_extraction_cache()
+        self.ocr_workers = max(1, ocr_workers or default_ocr_workers())
+        self.file_workers = max(
+            1,
+            file_workers
+            or env_int(
+                "EXTRACTION_MAX_PARALLEL_FILES",
+                min(EXTRACTION_MAX_PARALLEL_FILES, os.cpu_count() or 1),
+            ),
+        )
+        mode = (
+            ocr_search_mode or os.environ.get("OCR_SEARCH_MODE", "adaptive")
+        ).strip()
+        self.ocr_search_mode = (
+            "exhaustive" if mode.lower() == "exhaustive" else "adaptive"
+        )
+        if ocr_good_enough_score is None:
+            ocr_good_enough_score = env_int(
+                "OCR_GOOD_ENOUGH_SCORE", OCR_GOOD_ENOUGH_SCORE, minimum=0
+            )
+        self.ocr_good_enough_score = ocr_good_enough_score
+        self.ocr_min_key_confidence = env_int(
+            "OCR_MIN_KEY_CONFIDENCE", OCR_MIN_KEY_CONFIDENCE, minimum=0
+        )
+        self.ocr_budget = ocr_budget or OcrBudget.from_env()
+        # Pula regras da gramática de campos cujos rótulos não estão no texto.
+        self.field_prefilter = True
+        self.ocr_target_dpi = env_int("OCR_TARGET_DPI", OCR_TARGET_DPI)
+        self.ocr_max_long_side = env_int("OCR_MAX_LONG_SIDE", OCR_MAX_LONG_SIDE)
+        self.ocr_min_long_side = min(OCR_MIN_LONG_SIDE, self.ocr_max_long_side)
+        self.pdf_ocr_grayscale = os.environ.get(
+            "PDF_OCR_GRAYSCALE", ""
+        ).strip().lower() in {"1", "true", "yes", "on"}
+        self.pdf_early_stop = os.environ.get(
+            "PDF_EARLY_STOP", "1"
+        ).strip().lower() not in {"0", "false", "no", "off"}
+        # Cancelamento e progresso de página da extração em curso em cada thread.
+        self._hooks = threading.local()
+
+    def extract_from_files(
+        self, files: Sequence[Path], required_keys: Sequence[str] = ()
+    ) -> ExtractionResult:
+        """Extrai texto e campos dos arquivos.
+
+        `required_keys` são os campos que o destino precisa; PDFs longos param
+        de ser lidos quando todos estiverem preenchidos.
+        """
+        return self._collect(
+            self.iter_extract_from_files(files, required_keys),
+            ExtractionResult(raw_text="", fields={}, warnings=[]),
+        )
+
+    def iter_extract_from_files(
+        self,
+        files: Sequence[Path],
+        required_keys: Sequence[str] = (),
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[ExtractionProgress]:
+        """Versão incremental de `extract_from_files`.
+
+        Gera eventos de página e de arquivo concluído; levanta
+        `ExtractionCancelled` quando `cancel_token` é acionado.
+        """
         blocks: List[str] = []
         warnings: List[str] = []
+        extractions: List[FileExtraction] = []
+
+        for progress, outcome in self._stream_files(
+            lambda path: self._extract_single_cached(path, required_keys),
+            files,
+            cancel_token,
+        ):
+            if progress.page:
+                yield progress
+                continue
+            file_path = files[progress.file_index]
+            if outcome is None:
+                warnings.append(f"Arquivo não encontrado: {file_path.name}")
+            else:
+                warnings.extend(outcome.warnings)
+                extractions.append(outcome)
+                if outcome.text.strip():
+                    blocks.append(
+                        f"===== {file_path.name} =====\n{outcome.text.strip()}"
+                    )
+
+            # Campos já interpretados por arquivo, sem reinterpretar o texto
+            # concatenado.
+            merged = self._merge_file_extractions(extractions)
+            progress.result = ExtractionResult(
+                raw_text="\n\n".join(blocks).strip(),
+                fields=merged.fields,
+                warnings=list(warnings),
+                provenance=merged.provenance,
+            )
+            yield progress
+
+    def warm_up(self) -> None:
+        """Faz uma chamada OCR descartável para carregar o Tesseract e o idioma."""
+        if self.ocr_engine is None or Image is None:
+            return
+        self._run_ocr_job(Image.new("L", (64, 32), 255), OCR_CONFIGS[0])
 
-        for file_path in files:
+    @staticmethod
+    def _collect(
+        stream: Iterable[ExtractionProgress], initial: ExtractionResult
+    ) -> ExtractionResult:
+        result = initial
+        for progress in stream:
+            if progress.result is not None:
+                result = progress.result
+        return result
+
+    def _stream_files(
+        self,
+        func: Callable[[Path], _T],
+        files: Sequence[Path],
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[Tuple[ExtractionProgress, Optional[_T]]]:
+        """Aplica `func` a cada arquivo em paralelo e entrega os eventos.
+
+        Arquivos concluídos são entregues na ordem de entrada (um arquivo
+        inexistente resulta em None), intercalados com o progresso de páginas
+        dos arquivos em andamento (eventos com `page` > 0, sem resultado).
+        Cabe a quem consome preencher `result` dos eventos de arquivo. Ao
+        cancelar ou abandonar o iterador, os arquivos pendentes são descartados
+        e os em andamento param no próximo ponto de verificação.
+        """
+        token = CancellationToken(parent=cancel_token)
+        events: "queue.Queue[Tuple[int, int, int, str]]" = queue.Queue()
+        total = len(files)
+
+        def run(index: int, file_path: Path) -> Optional[_T]:
             if not file_path.exists():
-                warnings.append(f"Arquivo não encontrado: {file_path.name}")
-                continue
+                return None
 
-            text, file_warnings = self._extract_single(file_path)
-            warnings.extend(file_warnings)
-            if text.strip():
-                blocks.append(f"===== {file_path.name} =====\n{text.strip()}")
+            def on_page(page: int, page_count: int, text: str) -> None:
+                events.put((index, page, page_count, text))
 
-        raw_text = "\n\n".join(blocks).strip()
-        fields = self.parse_fields(raw_text) if raw_text else {}
-        return ExtractionResult(raw_text=raw_text, fields=fields, warnings=warnings)
+            with self._extraction_hooks(token, on_page):
+                token.raise_if_cancelled()
+                return func(file_path)
 
-    def _extract_single(self, file_path: Path) -> Tuple[str, List[str]]:
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.file_workers, total)))
+        try:
+            futures: List[Future] = []
+            for index, file_path in enumerate(files):
+                future = pool.submit(run, index, file_path)
+                future.add_done_callback(
+                    lambda _future, index=index: events.put((index, -1, 0, ""))
+                )
+                futures.append(future)
+
+            next_index = 0
+            while next_index < total:
+                index, page, page_count, text = events.get()
+                token.raise_if_cancelled()
+                if page >= 0:
+                    yield ExtractionProgress(
+                        file_name=files[index].name,
+                        file_index=index,
+                        file_count=total,
+                        page=page,
+                        page_count=page_count,
+                        page_text=text,
+                    ), None
+                    continue
+                while next_index < total and futures[next_index].done():
+                    outcome = futures[next_index].result()
+                    yield ExtractionProgress(
+                        file_name=files[next_index].name,
+                        file_index=next_index,
+                        file_count=total,
+                    ), outcome
+                    next_index += 1
+                    token.raise_if_cancelled()
+        finally:
+            token.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @contextmanager
+    def _extraction_hooks(
+        self,
+        token: Optional[CancellationToken],
+        on_page: Optional[PageCallback],
+    ) -> Iterator[None]:
+        self._hooks.token = token
+        self._hooks.on_page = on_page
+        try:
+            yield
+        finally:
+            self._hooks.token = None
+            self._hooks.on_page = None
+
+    def _current_hooks(
+        self,
+    ) -> Tuple[Optional[CancellationToken], Optional[PageCallback]]:
+        """Ganchos da thread atual, para repassar a threads auxiliares."""
+        token = getattr(self._hooks, "token", None)
+        return token, getattr(self._hooks, "on_page", None)
+
+    def _check_cancelled(self) -> None:
+        token = getattr(self._hooks, "token", None)
+        if token is not None:
+            token.raise_if_cancelled()
+
+    def _report_page(self, page: int, page_count: int, text: str) -> None:
+        on_page = getattr(self._hooks, "on_page", None)
+        if on_page is not None:
+            on_page(page, page_count, text)
+
+    def _extract_single_cached(
+        self, file_path: Path, required_keys: Sequence[str] = ()
+    ) -> FileExtraction:
+        if self.cache is None:
+            return self._extract_single(file_path, required_keys)
+        try:
+            key = self.cache.make_key(
+                file_path, f"local:{self.ocr_search_mode}:{self.ocr_budget.tag}"
+            )
+        except OSError:
+            return self._extract_single(file_path, required_keys)
+
+        cached = self.cache.get(key)
+        if self._cached_entry_covers(cached, required_keys):
+            try:
+                return FileExtraction(**cached)
+            except TypeError:
+                pass
+
+        result = self._extract_single(file_path, required_keys)
+        if result.text.strip():
+            self.cache.put(key, asdict(result))
+        return result
+
+    def _cached_entry_covers(
+        self, cached: Optional[Dict[str, Any]], required_keys: Sequence[str]
+    ) -> bool:
+        """Entrada de leitura parcial só vale se cobre os campos pedidos agora."""
+        if cached is None:
+            return False
+        if not int(cached.get("pages_skipped", 0) or 0):
+            return True
+        return bool(required_keys) and self._has_required_fields(
+            dict(cached.get("fields", {})), required_keys
+        )
+
+    def _extract_single(
+        self, file_path: Path, required_keys: Sequence[str] = ()
+    ) -> FileExtraction:
         suffix = file_path.suffix.lower()
         if suffix == ".pdf":
-            return self._extract_pdf_text(file_path)
+            return self._extract_pdf_text(file_path, required_keys)
         if suffix in self.SUPPORTED_IMAGES:
             return self._extract_image_text(file_path)
-        return "", [f"Formato não suportado: {file_path.name}"]
-
-    def _extract_pdf_text(self, file_path: Path) -> Tuple[str, List[str]]:
-        if PdfReaderClass is None:
-            return "", ["Biblioteca de PDF indisponível (instale 'pypdf' ou 'PyPDF2')."]
-
+        return FileExtraction(warnings=[f"Formato não suportado: {file_path.name}"])
+
+    def _extract_pdf_text(
+        self, file_path: Path, required_keys: Sequence[str] = ()
+    ) -> FileExtraction:
+        """Extrai texto e campos do PDF, com quantas páginas ficaram sem leitura.
+
+        Com `required_keys` (os campos do destino da extração), as páginas são
+        lidas em ordem e a leitura termina assim que os campos das páginas lidas
+        preenchem todas essas chaves. Sem chaves, ou com alguma que a gramática
+        nunca produz, o PDF é lido inteiro com OCR das páginas em paralelo.
+        """
         warnings: List[str] = []
-        chunks: List[str] = []
         try:
-            reader = PdfReaderClass(str(file_path))
-            for page in reader.pages:
-                try:
-                    content = page.extract_text() or ""
-                except Exception:  # noqa: BLE001
-                    content = ""
-                if content.strip():
-                    chunks.append(content)
+            doc = open_pdf(file_path)
+        except PdfBackendUnavailable as exc:
+            return FileExtraction(warnings=[str(exc)])
         except Exception as exc:  # noqa: BLE001
-            return "", [f"Falha ao ler PDF {file_path.name}: {exc}"]
-
-        text = self._normalize_extracted_text("\n".join(chunks).strip())
-        # Alguns PDFs têm texto parcial ou inexistente mesmo sendo visualmente nítidos.
-        # Neste caso, tenta OCR por página para recuperar conteúdo.
-        char_count = len(re.sub(r"\s+", "", text))
-        if char_count < 80:
-            ocr_text, ocr_warnings = self._extract_pdf_ocr_text(file_path)
-            warnings.extend(ocr_warnings)
-            if len(re.sub(r"\s+", "", ocr_text)) > char_count:
-                text = ocr_text.strip()
+            return FileExtraction(
+                warnings=[f"Falha ao ler PDF {file_path.name}: {exc}"]
+            )
 
+        with doc:
+            total_pages = doc.page_count
+            if self._can_stop_pdf_early(required_keys):
+                pages, ocr_used, scan_warnings = self._scan_pdf_until_complete(
+                    doc, file_path, required_keys
+                )
+            else:
+                pages, ocr_used, scan_warnings = self._scan_pdf_pages(doc, file_path)
+            warnings.extend(dict.fromkeys(scan_warnings))
+
+        extraction = self._merge_extractions(pages)
+        text = extraction.text
+        if text and ocr_used:
+            if ocr_used == len(pages):
+                warnings.append(
+                    f"PDF {file_path.name}: conteúdo obtido por OCR (documento escaneado)."
+                )
+            else:
+                warnings.append(
+                    f"PDF {file_path.name}: {ocr_used} de {len(pages)} página(s) "
+                    "sem texto selecionável obtida(s) por OCR."
+                )
+        pages_skipped = total_pages - len(pages)
+        if pages_skipped:
+            warnings.append(
+                f"PDF {file_path.name}: campos necessários encontrados até a página "
+                f"{len(pages)} de {total_pages}; {pages_skipped} página(s) "
+                "não lida(s)."
+            )
         if not text:
             warnings.append(f"Não foi possível extrair texto do PDF: {file_path.name}.")
-        return text, warnings
+        extraction.warnings = warnings
+        extraction.pages_skipped = pages_skipped
+        return extraction
+
+    def _scan_pdf_pages(
+        self, doc, file_path: Path
+    ) -> Tuple[List[FileExtraction], int, List[str]]:
+        page_texts = [self._read_pdf_page_text(doc, i) for i in range(doc.page_count)]
+        # PDFs mistos: capa digital com anexos escaneados. Só páginas sem camada
+        # de texto utilizável passam pelo OCR.
+        ocr_pages = [
+            index
+            for index, content in enumerate(page_texts)
+            if self._count_text_chars(content) < PDF_PAGE_MIN_TEXT_CHARS
+        ]
+        ocr_results: Dict[int, FileExtraction] = {}
+        warnings: List[str] = []
+        if ocr_pages:
+            ocr_results, warnings = self._extract_pdf_ocr_text(
+                doc, file_path, ocr_pages
+            )
+        pages: List[FileExtraction] = []
+        ocr_used = 0
+        for index, content in enumerate(page_texts):
+            page, used_ocr = self._pdf_page_extraction(content, ocr_results.get(index))
+            pages.append(page)
+            ocr_used += used_ocr
+        return pages, ocr_used, warnings
+
+    def _can_stop_pdf_early(self, required_keys: Sequence[str]) -> bool:
+        return (
+            self.pdf_early_stop
+            and bool(required_keys)
+            and all(key in self.field_grammar.keys for key in required_keys)
+        )
 
-    def _extract_image_text(self, file_path: Path) -> Tuple[str, List[str]]:
+    def _scan_pdf_until_complete(
+        self, doc, file_path: Path, required_keys: Sequence[str]
+    ) -> Tuple[List[FileExtraction], int, List[str]]:
+        page_texts: List[str] = []
+        # Campos já preenchidos por alguma página lida; cada página nova só
+        # acrescenta as suas chaves.
+        found: set[str] = set()
+        # Cada página é interpretada uma vez, ao ser lida (ou após o OCR).
+        pages: Dict[int, FileExtraction] = {}
+        ocr_used = 0
+        warnings: List[str] = []
+        pending: List[int] = []
+        # Como nas ondas de OCR: a primeira página escaneada vai sozinha (o caso
+        # comum é tudo estar na capa); as seguintes em lotes paralelos.
+        batch_size = 1
+        for index in range(doc.page_count):
+            self._check_cancelled()
+            content = self._read_pdf_page_text(doc, index)
+            page_texts.append(content)
+            if self._count_text_chars(content) < PDF_PAGE_MIN_TEXT_CHARS:
+                pending.append(index)
+                if len(pending) < batch_size and index + 1 < doc.page_count:
+                    continue
+            else:
+                self._report_page(index + 1, doc.page_count, content)
+                pages[index], _ = self._pdf_page_extraction(content, None)
+                found.update(self._filled_keys(pages[index]))
+            if pending:
+                ocr_results, ocr_warnings = self._extract_pdf_ocr_text(
+                    doc, file_path, pending
+                )
+                warnings.extend(ocr_warnings)
+                for page_index in pending:
+                    pages[page_index], used_ocr = self._pdf_page_extraction(
+                        page_texts[page_index], ocr_results.get(page_index)
+                    )
+                    ocr_used += used_ocr
+                    found.update(self._filled_keys(pages[page_index]))
+                pending = []
+                batch_size = self.ocr_workers
+            if all(key in found for key in required_keys):
+                break
+        return [pages[i] for i in sorted(pages)], ocr_used, warnings
+
+    @staticmethod
+    def _filled_keys(extraction: FileExtraction) -> List[str]:
+        return [key for key, value in extraction.fields.items() if value]
+
+    @staticmethod
+    def _read_pdf_page_text(doc, index: int) -> str:
+        try:
+            return doc.page_text(index)
+        except Exception:  # noqa: BLE001
+            return ""
+
+    def _pdf_page_extraction(
+        self, content: str, ocr: Optional[FileExtraction]
+    ) -> Tuple[FileExtraction, bool]:
+        """Camada de texto ou OCR da página, o que tiver mais conteúdo.
+
+        Só o vencedor é interpretado; retorna também se o OCR foi usado.
+        """
+        if ocr is not None and self._count_text_chars(
+            ocr.text
+        ) > self._count_text_chars(content):
+            return ocr, True
+        return self._parse_text(content, source="texto"), False
+
+    def _merge_extractions(self, parts: Sequence[FileExtraction]) -> FileExtraction:
+        """Junta as páginas de um mesmo arquivo, campo a campo.
+
+        Cada campo fica com o valor de maior pontuação; em empate vale a página
+        que vem primeiro, como na leitura em ordem.
+        """
+        merged = FileExtraction()
+        chunks: List[str] = []
+        for part in parts:
+            if part.text.strip():
+                chunks.append(part.text.strip())
+            for key, value in part.fields.items():
+                score = part.field_scores.get(key)
+                if score is None:
+                    score = self._score_field_value(key, value)
+                if score > merged.field_scores.get(key, -(10**9)):
+                    merged.fields[key] = value
+                    merged.field_scores[key] = score
+                    merged.provenance[key] = part.provenance.get(key, "")
+        merged.text = "\n".join(chunks)
+        return merged
+
+    @staticmethod
+    def _merge_file_extractions(parts: Sequence[FileExtraction]) -> FileExtraction:
+        """Junta arquivos distintos: cada campo fica com o primeiro valor preenchido.
+
+        Arquivos diferentes podem ser de pessoas diferentes (ex.: documentos de
+        um casal); escolher por pontuação misturaria campos de um e de outro.
+        """
+        merged = FileExtraction()
+        chunks: List[str] = []
+        for part in parts:
+            if part.text.strip():
+                chunks.append(part.text.strip())
+            for key, value in part.fields.items():
+                if str(value).strip() and not merged.fields.get(key):
+                    merged.fields[key] = value
+                    merged.provenance[key] = part.provenance.get(key, "")
+                    if key in part.field_scores:
+                        merged.field_scores[key] = part.field_scores[key]
+        merged.text = "\n".join(chunks)
+        return merged
+
+    @staticmethod
+    def _has_required_fields(
+        fields: Dict[str, str], required_keys: Sequence[str]
+    ) -> bool:
+        return all(str(fields.get(key, "")).strip() for key in required_keys)
+
+    @staticmethod
+    def _count_text_chars(text: str) -> int:
+        return len(re.sub(r"\s+", "", text or ""))
+
+    def _extract_image_text(self, file_path: Path) -> FileExtraction:
         if Image is None:
-            return "", ["Biblioteca 'Pillow' não disponível para leitura de imagens."]
-        if pytesseract is None:
-            return "", ["Biblioteca 'pytesseract' não disponível para OCR de imagens."]
+            return FileExtraction(
+                warnings=["Biblioteca 'Pillow' não disponível para leitura de imagens."]
+            )
+        if self.ocr_engine is None:
+            return FileExtraction(
+                warnings=[
+                    "Biblioteca 'pytesseract' não disponível para OCR de imagens."
+                ]
+            )
 
         try:
-            with Image.open(file_path) as img:
-                img = img.convert("RGB")
-                text, warnings = self._ocr_pil_image(img)
-                return self._normalize_extracted_text(text.strip()), warnings
+            img, _ = self._load_image_for_ocr(file_path)
+            return self._ocr_pil_image(img)
         except Exception as exc:  # noqa: BLE001
-            return "", [f"Falha no OCR da imagem {file_path.name}: {exc}"]
+            return FileExtraction(
+                warnings=[f"Falha no OCR da imagem {file_path.name}: {exc}"]
+            )
 
-    def _extract_pdf_ocr_text(self, file_path: Path) -> Tuple[str, List[str]]:
-        if fitz is None:
+    def _load_image_for_ocr(self, file_path: Path) -> Tuple[Any, float]:
+        """Abre a imagem já na resolução de trabalho do OCR.
+
+        Retorna a imagem RGB e a escala aplicada em relação ao arquivo original
+        (coordenadas no original = coordenadas na imagem / escala).
+        """
+        with Image.open(file_path) as img:
+            source_size = img.size
+            target = self._target_ocr_size(source_size)
+            if target != source_size and hasattr(img, "draft"):
+                # JPEG decodifica direto em 1/2, 1/4 ou 1/8 sem montar a foto inteira.
+                img.draft("RGB", target)
+            rgb = img.convert("RGB")
+        return self._normalize_resolution(rgb, source_size=source_size)
+
+    def _normalize_resolution(
+        self, image_obj, source_size: Optional[Tuple[int, int]] = None
+    ) -> Tuple[Any, float]:
+        source_w, source_h = source_size or image_obj.size
+        target = self._target_ocr_size((source_w, source_h))
+        normalized = image_obj
+        if target != image_obj.size:
+            normalized = image_obj.resize(target, Image.LANCZOS)
+        scale = target[0] / source_w if source_w else 1.0
+        normalized.info["ocr_scale"] = scale
+        return normalized, scale
+
+    def _target_ocr_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        width, height = size
+        long_side = max(width, height)
+        if long_side <= 0:
+            return size
+        if long_side > self.ocr_max_long_side:
+            factor = self.ocr_max_long_side / long_side
+        elif long_side < self.ocr_min_long_side:
+            factor = self.ocr_min_long_side / long_side
+        else:
+            return size
+        return max(1, round(width * factor)), max(1, round(height * factor))
+
+    def _pdf_render_zoom(self, page_width: float, page_height: float) -> float:
+        # Páginas PDF são medidas em pontos (1/72 pol.).
+        zoom = self.ocr_target_dpi / 72.0
+        long_side = max(page_width, page_height)
+        if long_side > 0:
+            zoom = min(zoom, self.ocr_max_long_side / long_side)
+        return max(zoom, 0.5)
+
+    def _extract_pdf_ocr_text(
+        self, doc, file_path: Path, page_indexes: Sequence[int]
+    ) -> Tuple[Dict[int, FileExtraction], List[str]]:
+        if not doc.can_render:
             return (
-                "",
+                {},
                 [
                     (
                         "PDF sem texto selecionável e OCR de PDF indisponível "
@@ -179,109 +768,468 @@ class DocumentExtractor:
                     )
                 ],
             )
-        if Image is None:
-            return "", ["Biblioteca 'Pillow' não disponível para OCR de PDF."]
-        if pytesseract is None:
-            return "", ["Biblioteca 'pytesseract' não disponível para OCR de PDF."]
+        if self.ocr_engine is None:
+            return {}, ["Biblioteca 'pytesseract' não disponível para OCR de PDF."]
+
+        page_workers = max(1, min(self.ocr_workers, len(page_indexes)))
+        outcomes: Dict[int, FileExtraction] = {}
+        # Os ganchos ficam na thread do arquivo; as threads do pool de páginas
+        # recebem o mesmo token para que o cancelamento interrompa o OCR entre
+        # as ondas de cada página.
+        token, on_page = self._current_hooks()
+
+        def ocr_page(image) -> FileExtraction:
+            with self._extraction_hooks(token, on_page):
+                self._check_cancelled()
+                return self._ocr_pil_image(image)
+
+        def collect(index: int, future: Future) -> None:
+            outcomes[index] = self._page_ocr_outcome(future, file_path, index)
+            self._check_cancelled()
+            self._report_page(index + 1, doc.page_count, outcomes[index].text)
+
+        with ThreadPoolExecutor(max_workers=page_workers) as pool:
+            pending: Dict[int, Future] = {}
+            # O documento não é thread-safe: renderiza na thread atual e só o OCR
+            # vai para o pool. A janela limita quantas páginas ficam em memória.
+            for index in page_indexes:
+                if len(pending) >= page_workers:
+                    oldest = min(pending)
+                    collect(oldest, pending.pop(oldest))
+                self._check_cancelled()
+                try:
+                    image = self._render_pdf_page(doc, index)
+                except Exception as exc:  # noqa: BLE001
+                    outcomes[index] = FileExtraction(
+                        warnings=[
+                            f"Falha no OCR da página {index + 1} de "
+                            f"{file_path.name}: {exc}"
+                        ]
+                    )
+                    continue
+                pending[index] = pool.submit(ocr_page, image)
+            for index in sorted(pending):
+                collect(index, pending[index])
 
+        pages: Dict[int, FileExtraction] = {}
         warnings: List[str] = []
-        chunks: List[str] = []
+        for index in sorted(outcomes):
+            outcome = outcomes[index]
+            if outcome.text.strip():
+                pages[index] = outcome
+            warnings.extend(outcome.warnings)
+        return pages, warnings
+
+    @staticmethod
+    def _page_ocr_outcome(
+        future: Future, file_path: Path, index: int
+    ) -> FileExtraction:
         try:
-            with fitz.open(str(file_path)) as doc:
-                for page_number, page in enumerate(doc, start=1):
-                    try:
-                        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
-                        img_bytes = pix.tobytes("png")
-                        with Image.open(io.BytesIO(img_bytes)) as img:
-                            text, ocr_warnings = self._ocr_pil_image(img.convert("RGB"))
-                        if text.strip():
-                            chunks.append(text.strip())
-                        warnings.extend(
-                            f"{file_path.name} - página {page_number}: {item}"
-                            for item in ocr_warnings
-                        )
-                    except Exception as exc:  # noqa: BLE001
-                        warnings.append(
-                            f"Falha no OCR da página {page_number} de {file_path.name}: {exc}"
-                        )
+            outcome = future.result()
+        except ExtractionCancelled:
+            raise
         except Exception as exc:  # noqa: BLE001
-            return "", [f"Falha ao abrir PDF para OCR ({file_path.name}): {exc}"]
+            return FileExtraction(
+                warnings=[
+                    f"Falha no OCR da página {index + 1} de {file_path.name}: {exc}"
+                ]
+            )
+        outcome.warnings = [
+            f"{file_path.name} - página {index + 1}: {item}"
+            for item in outcome.warnings
+        ]
+        return outcome
+
+    def _render_pdf_page(self, doc, index: int):
+        zoom = self._pdf_render_zoom(*doc.page_size(index))
+        return doc.render_page(index, zoom, grayscale=self.pdf_ocr_grayscale)
+
+    def _ocr_pil_image(self, image_obj) -> FileExtraction:
+        if self.ocr_engine is None:
+            return FileExtraction(warnings=["pytesseract indisponível."])
+        plan = self._new_ocr_plan()
+        self._plan_image_jobs(plan, image_obj)
+        candidates, warnings = self._run_ocr_plan(plan)
+        if not candidates.get(0):
+            return FileExtraction(warnings=warnings or ["Falha no OCR."])
+        extraction = self._merge_candidate_fields(candidates[0])
+        extraction.warnings = warnings
+        return extraction
+
+    def _new_ocr_plan(self) -> OcrPlan:
+        return OcrPlan(self.ocr_budget)
+
+    def _plan_image_jobs(
+        self,
+        plan: OcrPlan,
+        image_obj,
+        group: int = 0,
+        profile: Optional[OcrProfile] = None,
+    ) -> None:
+        """Agenda pré-processamentos x PSMs de uma imagem no grupo `group`.
+
+        O rank cresce na diagonal (pré-processamento + PSM): as primeiras
+        chamadas variam os dois eixos em vez de esgotar os PSMs da original.
+        `profile` restringe a busca e define a ordem de cada eixo.
+        """
+        steps = profile.preprocessing if profile and profile.preprocessing else None
+        configs = profile.configs if profile and profile.configs else OCR_CONFIGS
+        plan.sources.setdefault(group, image_obj)
+        prepared_images = self._preprocess_for_ocr(image_obj, steps)
+        for prep_rank, prepared in enumerate(prepared_images):
+            fingerprint = image_fingerprint(prepared)
+            for config_rank, config in enumerate(configs):
+                plan.add(
+                    group,
+                    prepared,
+                    config,
+                    rank=prep_rank + config_rank,
+                    fingerprint=fingerprint,
+                )
 
-        text = self._normalize_extracted_text("\n".join(chunks).strip())
-        if text:
+    def _run_ocr_plan(
+        self, plan: OcrPlan
+    ) -> Tuple[Dict[int, List[OcrCandidate]], List[str]]:
+        """Executa o plano em ondas e devolve os candidatos de cada grupo.
+
+        No modo adaptativo, uma leitura cujos campos-chave vêm com confiança
+        alta dispensa os demais PSMs da mesma imagem pré-processada.
+        """
+        candidates: Dict[int, List[OcrCandidate]] = {}
+        warnings = self._ocr_language_warnings()
+        targeted: set[int] = set()
+        good_enough = False
+        while not good_enough:
+            self._check_cancelled()
+            wave = plan.next_wave(self.ocr_workers)
+            if not wave:
+                break
+            # Resultados voltam na ordem dos jobs: seleção do vencedor segue
+            # determinística.
+            outcomes = self._run_ocr_jobs([(job.image, job.config) for job in wave])
+            touched: set[int] = set()
+            for job, (result, job_warnings) in zip(wave, outcomes):
+                warnings.extend(job_warnings)
+                if not result.text.strip():
+                    plan.record(job, 0)
+                    continue
+                candidate = self._score_ocr_candidate(result)
+                plan.record(job, candidate.score)
+                for group in job.groups:
+                    candidates.setdefault(group, []).append(candidate)
+                    touched.add(group)
+                if (
+                    self.ocr_search_mode == "adaptive"
+                    and self.ocr_min_key_confidence
+                    and self._key_confidence(candidate) >= self.ocr_min_key_confidence
+                ):
+                    plan.drop_alternatives(job)
+            if self.ocr_search_mode != "adaptive":
+                continue
+            for group in sorted(touched):
+                merged_fields = self._merge_candidate_fields(candidates[group]).fields
+                score = self._score_parsed_fields(merged_fields)
+                if (
+                    score < self.ocr_good_enough_score
+                    and score + CPF_FIELD_SCORE >= self.ocr_good_enough_score
+                    and group not in targeted
+                    and "cpf" in self._missing_numeric_fields(candidates[group])
+                ):
+                    # Só o CPF falta: relê a faixa do rótulo em vez de seguir a
+                    # busca completa.
+                    targeted.add(group)
+                    if self._add_targeted_candidate(plan, group, candidates, ("cpf",)):
+                        merged_fields = self._merge_candidate_fields(
+                            candidates[group]
+                        ).fields
+                        score = self._score_parsed_fields(merged_fields)
+                if score >= self.ocr_good_enough_score:
+                    good_enough = True
+                    break
+
+        if not good_enough and candidates:
+            best_group = max(candidates, key=lambda group: plan.group_score(group) or 0)
+            missing = self._missing_numeric_fields(candidates[best_group])
+            if best_group in targeted:
+                missing = tuple(key for key in missing if key != "cpf")
+            self._add_targeted_candidate(plan, best_group, candidates, missing)
+
+        if not good_enough and plan.pending and plan.exhausted:
             warnings.append(
-                f"PDF {file_path.name}: conteúdo obtido por OCR (documento escaneado)."
+                f"Orçamento de OCR esgotado: {plan.calls} chamada(s) em "
+                f"{plan.elapsed:.0f}s; {plan.pending} combinação(ões) não testada(s)."
             )
-        return text, warnings
+        return candidates, warnings
 
-    def _ocr_pil_image(self, image_obj) -> Tuple[str, List[str]]:
-        if pytesseract is None:
-            return "", ["pytesseract indisponível."]
-        candidates: List[Tuple[str, int, Dict[str, str]]] = []
-        warnings: List[str] = []
+    @staticmethod
+    def _key_confidence(candidate: OcrCandidate) -> float:
+        """Menor confiança entre os campos-chave lidos (-1 se nenhum foi lido)."""
+        scores = [
+            candidate.confidence.get(key, -1.0)
+            for key in OCR_KEY_FIELDS
+            if candidate.fields.get(key)
+        ]
+        return min(scores) if scores else -1.0
+
+    def _missing_numeric_fields(
+        self, candidates: Sequence[OcrCandidate]
+    ) -> Tuple[str, ...]:
+        """CPF/RG sem valor válido cujo rótulo aparece em algum texto OCR."""
+        merged_fields = self._merge_candidate_fields(candidates).fields
+        seen = self._ascii_lower(" ".join(item.text for item in candidates))
+        missing: List[str] = []
+        cpf_digits = self._ocr_to_digits(str(merged_fields.get("cpf", "")))
+        if "cpf" in seen and not self._is_valid_cpf(cpf_digits):
+            missing.append("cpf")
+        if "registro geral" in seen and not merged_fields.get("rg"):
+            missing.append("rg")
+        return tuple(missing)
+
+    def _add_targeted_candidate(
+        self,
+        plan: OcrPlan,
+        group: int,
+        candidates: Dict[int, List[OcrCandidate]],
+        keys: Sequence[str],
+    ) -> bool:
+        """Roda a passada dirigida e anexa o resultado como candidato do grupo."""
+        image_obj = plan.sources.get(group)
+        if not keys or image_obj is None or plan.exhausted:
+            return False
+        fields, calls = self._reocr_numeric_fields(image_obj, keys)
+        plan.charge(calls)
+        if not fields:
+            return False
+        # Pontuação mínima: nunca vira o texto principal, só contribui campos.
+        candidates.setdefault(group, []).append(
+            OcrCandidate(
+                text="", score=-(10**9), fields=dict(fields), source="ocr_dirigido"
+            )
+        )
+        return True
+
+    def _reocr_numeric_fields(
+        self, image_obj, keys: Sequence[str]
+    ) -> Tuple[Dict[str, str], int]:
+        """Relê CPF/RG só na faixa vizinha ao rótulo, achado por caixas de palavras.
+
+        Retorna os campos validados e o número de chamadas OCR feitas.
+        """
+        if ImageOps is None or self.ocr_engine is None:
+            return {}, 0
+        gray = image_obj
+        if getattr(image_obj, "mode", "") != "L":
+            gray = ImageOps.grayscale(image_obj)
+        try:
+            capabilities = self.ocr_capabilities
+            words = self.ocr_engine.image_to_data(
+                gray,
+                lang=capabilities.language(),
+                config=capabilities.adapt_config(OCR_LAYOUT_CONFIG),
+            )
+        except Exception:  # noqa: BLE001
+            return {}, 1
+        calls = 1
 
-        for prepared in self._preprocess_for_ocr(image_obj):
-            for config in ("--oem 1 --psm 6", "--oem 1 --psm 11", "--oem 1 --psm 4"):
-                text = ""
-                try:
-                    text = pytesseract.image_to_string(
-                        prepared,
-                        lang="por+eng",
-                        config=config,
+        fields: Dict[str, str] = {}
+        for key in keys:
+            strips = [
+                strip
+                for label in self._find_field_labels(words, key)[:2]
+                for strip in self._label_value_strips(label, gray.size)
+            ]
+            if not strips:
+                continue
+            jobs = [(gray.crop(box), OCR_DIGITS_LINE_CONFIG) for box in strips]
+            calls += len(jobs)
+            for result, _ in self._run_ocr_jobs(jobs):
+                value = self._validated_numeric_value(
+                    key, result.text, fields.get("cpf", "")
+                )
+                if value:
+                    fields[key] = value
+                    break
+        return fields, calls
+
+    def _find_field_labels(
+        self, words: Sequence[OcrWord], key: str
+    ) -> List[Tuple[int, int, int, int]]:
+        """Caixas (esq., topo, dir., base) dos rótulos do campo, em ordem de leitura."""
+        boxes: List[Tuple[int, int, int, int]] = []
+        for index, word in enumerate(words):
+            token = re.sub(r"[^a-z]", "", self._ascii_lower(word.text))
+            label = [word]
+            if key == "cpf" and token != "cpf":
+                continue
+            if key == "rg":
+                following = words[index + 1] if index + 1 < len(words) else None
+                if token == "registro" and following is not None:
+                    next_token = re.sub(
+                        r"[^a-z]", "", self._ascii_lower(following.text)
                     )
-                except Exception:
-                    try:
-                        text = pytesseract.image_to_string(prepared, config=config)
-                        warnings.append(
-                            "Idioma OCR 'por+eng' indisponível; usado OCR padrão do Tesseract."
-                        )
-                    except Exception as exc:  # noqa: BLE001
-                        warnings.append(f"OCR falhou ({config}): {exc}")
+                    if following.line != word.line or next_token != "geral":
                         continue
-                if text.strip():
-                    normalized_text = self._normalize_extracted_text(text)
-                    parsed_fields = (
-                        self.parse_fields(normalized_text) if normalized_text else {}
-                    )
-                    raw_hint_fields = self._extract_fields_from_raw_lines(text)
-                    for key, value in raw_hint_fields.items():
-                        if value and not parsed_fields.get(key):
-                            parsed_fields[key] = value
-                    score = self._score_ocr_text(normalized_text)
-                    score += self._score_parsed_fields(parsed_fields) * 5
-                    candidates.append((text, score, parsed_fields))
+                    label.append(following)
+                elif token not in {"registrogeral", "rg"}:
+                    continue
+            boxes.append(
+                (
+                    min(item.left for item in label),
+                    min(item.top for item in label),
+                    max(item.right for item in label),
+                    max(item.bottom for item in label),
+                )
+            )
+        return boxes
 
-        if not candidates:
-            return "", warnings or ["Falha no OCR."]
+    @staticmethod
+    def _label_value_strips(
+        label: Tuple[int, int, int, int], size: Tuple[int, int]
+    ) -> List[Tuple[int, int, int, int]]:
+        """Faixas onde o valor costuma estar: à direita do rótulo e logo abaixo."""
+        width, height = size
+        left, top, right, bottom = label
+        line_height = max(8, bottom - top)
+        pad = line_height // 3
+        # Um CPF/RG formatado cabe em ~14 alturas de linha.
+        span = line_height * 14
+        strips = [
+            (right, top - pad, min(width, right + span), bottom + pad),
+            (
+                max(0, left - line_height),
+                bottom,
+                min(width, left + span),
+                bottom + line_height * 2 + pad,
+            ),
+        ]
+        return [
+            (max(0, x0), max(0, y0), min(width, x1), min(height, y1))
+            for x0, y0, x1, y1 in strips
+            if x1 - x0 > line_height and min(height, y1) - max(0, y0) > pad
+        ]
+
+    def _validated_numeric_value(self, key: str, text: str, cpf: str = "") -> str:
+        digits = self._ocr_to_digits(text)
+        if key == "cpf":
+            for start in range(max(0, len(digits) - 10)):
+                window = digits[start : start + 11]
+                if self._is_valid_cpf(window):
+                    return self._format_cpf_digits(window)
+            return ""
+        cpf_digits = self._ocr_to_digits(cpf)
+        for candidate in self._extract_numeric_candidates(text, min_len=5, max_len=10):
+            if cpf_digits and candidate == cpf_digits:
+                continue
+            if len(candidate) == 8 and candidate.startswith(("19", "20")):
+                continue
+            return candidate
+        return ""
 
-        best_text, _, best_fields = max(candidates, key=lambda item: item[1])
+    def _score_ocr_candidate(self, result: OcrResult) -> OcrCandidate:
+        text = result.text
+        cleaned = self._clean_text(text)
+        parsed_fields = self._parse_cleaned(cleaned) if cleaned else {}
+        raw_hint_fields = self._extract_fields_from_raw_lines(text)
+        for key, value in raw_hint_fields.items():
+            if value and not parsed_fields.get(key):
+                parsed_fields[key] = value
+        confidence = {
+            key: result.confidence_of(value)
+            for key, value in parsed_fields.items()
+            if value
+        }
+        # Caracteres ponderados pela confiança do Tesseract no lugar da contagem
+        # bruta: ruído lido com confiança baixa não vence a comparação.
+        score = round(result.confident_chars)
+        score += self._score_parsed_fields(parsed_fields) * 5
+        return OcrCandidate(
+            text=text,
+            score=score,
+            fields=parsed_fields,
+            confidence=confidence,
+            cleaned=cleaned,
+        )
+
+    def _merge_candidate_fields(
+        self, candidates: Sequence[OcrCandidate]
+    ) -> FileExtraction:
+        """Escolhe cada campo entre os candidatos: valor válido, depois confiança.
 
-        merged_fields: Dict[str, str] = dict(best_fields)
+        O texto é o do candidato de maior pontuação, já normalizado.
+        """
+        best = max(candidates, key=lambda item: item.score)
+
+        merged_fields: Dict[str, str] = dict(best.fields)
         merged_scores: Dict[str, int] = {
             key: self._score_field_value(key, value)
             for key, value in merged_fields.items()
         }
-        for _, _, parsed in sorted(candidates, key=lambda item: item[1], reverse=True):
-            for key, value in parsed.items():
+        merged_confidence: Dict[str, float] = {
+            key: best.confidence.get(key, -1.0) for key in merged_fields
+        }
+        provenance: Dict[str, str] = {key: best.source for key in merged_fields}
+        for candidate in sorted(candidates, key=lambda item: item.score, reverse=True):
+            for key, value in candidate.fields.items():
                 field_score = self._score_field_value(key, value)
-                if field_score > merged_scores.get(key, -(10**9)):
+                confidence = candidate.confidence.get(key, -1.0)
+                if (field_score, confidence) > (
+                    merged_scores.get(key, -(10**9)),
+                    merged_confidence.get(key, -1.0),
+                ):
                     merged_fields[key] = value
                     merged_scores[key] = field_score
+                    merged_confidence[key] = confidence
+                    provenance[key] = candidate.source
+        return FileExtraction(
+            text=best.cleaned,
+            fields=merged_fields,
+            field_scores=merged_scores,
+            provenance=provenance,
+        )
 
-        hint_lines = self._fields_to_hint_lines(merged_fields, merged_scores)
-        if hint_lines:
-            base_lines = [
-                line.strip() for line in best_text.splitlines() if line.strip()
-            ]
-            existing = {self._ascii_lower(line) for line in base_lines}
-            for line in hint_lines:
-                lowered = self._ascii_lower(line)
-                if lowered not in existing:
-                    base_lines.append(line)
-                    existing.add(lowered)
-            best_text = "\n".join(base_lines)
+    def _run_ocr_jobs(
+        self, jobs: Sequence[Tuple[Any, str]]
+    ) -> List[Tuple[OcrResult, List[str]]]:
+        workers = min(self.ocr_workers, len(jobs))
+        if workers <= 1:
+            return [self._run_ocr_job(prepared, config) for prepared, config in jobs]
+        for prepared, _ in jobs:
+            # Garante pixels carregados antes de compartilhar a imagem entre threads.
+            if hasattr(prepared, "load"):
+                prepared.load()
+        # O Tesseract roda fora do GIL (subprocesso); threads bastam para paralelizar.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda job: self._run_ocr_job(*job), jobs))
+
+    def _run_ocr_job(self, prepared, config: str) -> Tuple[OcrResult, List[str]]:
+        """Uma chamada OCR com caixas e confiança por palavra (saída TSV)."""
+        capabilities = self.ocr_capabilities
+        try:
+            words = self.ocr_engine.image_to_data(
+                prepared,
+                lang=capabilities.language(),
+                config=capabilities.adapt_config(config),
+            )
+        except Exception as exc:  # noqa: BLE001
+            return OcrResult(), [f"OCR falhou ({config}): {exc}"]
+        return OcrResult(words=tuple(words)), []
 
-        return best_text, warnings
+    @property
+    def ocr_capabilities(self) -> OcrCapabilities:
+        """Idiomas e OEM do motor, sondados uma vez e reaproveitados por chamada."""
+        if self._ocr_capabilities is None:
+            try:
+                self._ocr_capabilities = self.ocr_engine.capabilities()
+            except Exception:  # noqa: BLE001
+                self._ocr_capabilities = OcrCapabilities()
+        return self._ocr_capabilities
+
+    def _ocr_language_warnings(self) -> List[str]:
+        missing = self.ocr_capabilities.missing_languages()
+        if not missing:
+            return []
+        language = self.ocr_capabilities.language() or "padrão do Tesseract"
+        return [f"Idioma OCR '{'+'.join(missing)}' indisponível; usando {language}."]
 
     def _score_parsed_fields(self, fields: Dict[str, str]) -> int:
         score = 0
@@ -380,41 +1328,6 @@ class DocumentExtractor:
             return 80
         return 40
 
-    def _fields_to_hint_lines(
-        self,
-        fields: Dict[str, str],
-        field_scores: Optional[Dict[str, int]] = None,
-    ) -> List[str]:
-        hint_map = (
-            ("nome", "NOME"),
-            ("nome_pai", "NOME_PAI"),
-            ("nome_mae", "NOME_MAE"),
-            ("cpf", "CPF"),
-            ("data_nascimento", "DATA DE NASCIMENTO"),
-            ("sexo", "SEXO"),
-            ("nacionalidade", "NACIONALIDADE"),
-            ("naturalidade", "NATURALIDADE"),
-            ("rg", "RG"),
-            ("orgao_rg", "ORGAO_RG"),
-            ("uf_rg", "UF_RG"),
-            ("cnh_numero", "CNH_NUMERO"),
-            ("cnh_uf", "CNH_UF"),
-            ("cnh_data_expedicao", "CNH_DATA_EXPEDICAO"),
-        )
-        out: List[str] = []
-        for key, label in hint_map:
-            if field_scores is not None and field_scores.get(key, -1000) < 80:
-                continue
-            value = self._clean_value(str(fields.get(key, "")))
-            if key == "naturalidade":
-                value = self._clean_location_value(value)
-            elif key == "nacionalidade":
-                value = self._clean_nationality_value(value)
-            if not value:
-                continue
-            out.append(f"{label}: {value}")
-        return out
-
     def _extract_fields_from_raw_lines(self, raw_text: str) -> Dict[str, str]:
         out: Dict[str, str] = {}
         if not raw_text:
@@ -503,187 +1416,166 @@ class DocumentExtractor:
         return out
 
     def parse_fields(self, text: str) -> Dict[str, str]:
-        cleaned = self._normalize_extracted_text(self._normalize(text))
-        fields: Dict[str, str] = {}
-
-        fields["nome"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*nome(?:\s+completo)?\s*[:\-]\s*(?!social\b)([^\n]{3,120})",
-                r"(?:^|\n)\s*nome(?:\s+completo)?\s+(?!social\b)([^\n]{3,120})",
-                r"(?:^|\n)\s*outorgante\s*[:\-]\s*([^\n]{3,120})",
-                r"(?:^|\n)\s*registro\s+civil\s+([A-ZÁÀÂÃÉÊÍÓÔÕÚÇ ]{6,})",
-            ),
-        )
-        fields["nome_pai"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*nome_pai\s*[:\-]\s*([^\n]{3,120})",
-                r"(?:^|\n)\s*(?:nome\s+do\s+pai|pai)\s*[:\-]\s*([^\n]{3,120})",
-                r"filiaç[ãa]o\s*[:\-].*?\bpai\s*[:\-]\s*([^\n;]+)",
-            ),
-        )
-        fields["nome_mae"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*nome_mae\s*[:\-]\s*([^\n]{3,120})",
-                r"(?:^|\n)\s*(?:nome\s+da\s+m[ãa]e|m[ãa]e)\s*[:\-]\s*([^\n]{3,120})",
-                r"filiaç[ãa]o\s*[:\-].*?\bm[ãa]e\s*[:\-]\s*([^\n;]+)",
-            ),
-        )
-        if not fields.get("nome_pai") or not fields.get("nome_mae"):
-            pai, mae = self._extract_filiation(cleaned)
-            if pai and not fields.get("nome_pai"):
-                fields["nome_pai"] = pai
-            if mae and not fields.get("nome_mae"):
-                fields["nome_mae"] = mae
-
-        fields["sexo"] = self._extract_sex(cleaned)
-        fields["nacionalidade"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*nacionalidade\s*[:\-]\s*([^\n]{3,120})",
-                r"\bnacionalidade\s*[:\-]\s*([^\n]{3,120})",
-                r"\b(brasileir[oa]|brasileir[oa]\s+nato|naturalizad[oa]|estrangeir[oa])\b",
-            ),
-        )
-        fields["estado_civil"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*estado\s*civil\s*[:\-]\s*([^\n]{3,120})",
-                r"\b(solteir[oa]|casad[oa]|divorciad[oa]|separad[oa]|vi[uú]v[oa]|uni[aã]o\s+est[aá]vel)\b",
-            ),
-        )
-        fields["naturalidade"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*naturalidade\s*[:\-]\s*([^\n]{2,120})",
-                r"\bnaturalidade\s*[:\-]\s*([^\n]{2,120})",
-                r"(?:^|\n)\s*natural\s+de\s*[:\-]?\s*([^\n]{2,120})",
-            ),
-        )
-        fields["data_nascimento"] = self._find_first(
-            cleaned,
-            (
-                r"(?:data\s+de\s+nascimento|nascimento)\s*[:\-]\s*([0-3]?\d[\/\-][01]?\d[\/\-]\d{2,4})",
-                r"\bnascid[oa]?\s*(?:em|aos)?\s*([0-3]?\d[\/\-][01]?\d[\/\-]\d{2,4})",
-            ),
-        )
-        if not fields.get("data_nascimento"):
-            fields["data_nascimento"] = self._extract_date_near_keyword(
-                cleaned,
-                r"(?:data\s+de\s+nascimento|nascimento|date\s+of\s+birth)",
-            )
-        if not fields.get("data_nascimento"):
-            fields["data_nascimento"] = self._extract_date_by_words(cleaned)
-        fields["profissao"] = self._find_first(
-            cleaned, (r"(?:^|\n)\s*profiss[ãa]o\s*[:\-]\s*([^\n]{2,120})",)
-        )
-        fields["logradouro"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*(?:logradouro|endere[cç]o)\s*[:\-]\s*([^\n]{3,160})",
-                r"(?:^|\n)\s*(rua|avenida|av\.|travessa|alameda)\s+([^\n]{3,160})",
-            ),
-            join_groups=True,
-        )
-        fields["numero"] = self._find_first(
-            cleaned, (r"(?:^|\n)\s*n[úu]mero\s*[:\-]\s*([^\n]{1,20})",)
-        )
-        fields["bairro"] = self._find_first(
-            cleaned, (r"(?:^|\n)\s*bairro\s*[:\-]\s*([^\n]{2,120})",)
-        )
-        fields["cidade"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*(?:cidade|munic[íi]pio)\s*[:\-]\s*([^\n]{2,120})",
-                r"(?:^|\n)\s*localidade\s*[:\-]\s*([^\n]{2,120})",
-            ),
-        )
-        fields["email"] = self._find_email(cleaned)
-        fields["cep"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*cep\s*[:\-]?\s*(\d{5}-?\d{3})\b",
-                r"(?:\bcep\b)[^\n]{0,15}(\d{5}-?\d{3})",
-            ),
+        return self._parse_cleaned(self._clean_text(text))
+
+    def _clean_text(self, text: str) -> str:
+        return self._normalize_extracted_text(self._normalize(text or ""))
+
+    def _parse_text(self, text: str, source: str) -> FileExtraction:
+        """Normaliza e interpreta um texto uma única vez, com pontuação por campo."""
+        cleaned = self._clean_text(text)
+        fields = self._parse_cleaned(cleaned) if cleaned else {}
+        return FileExtraction(
+            text=cleaned,
+            fields=fields,
+            field_scores={
+                key: self._score_field_value(key, value)
+                for key, value in fields.items()
+            },
+            provenance={key: source for key in fields},
         )
 
-        cpf_digits = self._extract_cpf_digits(cleaned)
-        if cpf_digits:
-            fields["cpf"] = self._format_cpf_digits(cpf_digits)
-        fields["cnh_numero"] = self._extract_cnh_number(cleaned)
-        fields["cnh_data_expedicao"] = self._extract_cnh_issue_date(cleaned)
-        fields["cnh_uf"] = self._extract_cnh_uf(cleaned)
-        fields["cert_matricula"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*(?:matr[íi]cula|matricula)\s*(?:n[ºo.]*)?\s*[:\-]?\s*([^\n]{6,120})",
-                r"(?:certid[aã]o[^\n]{0,80})\b(?:matr[íi]cula|matricula)\s*(?:n[ºo.]*)?\s*([^\n]{6,120})",
-            ),
-        )
-        fields["cert_casamento_matricula"] = self._find_first(
-            cleaned,
-            (
-                r"(?:certid[aã]o\s+de\s+casamento[^\n]{0,100})\b(?:matr[íi]cula|matricula)\s*(?:n[ºo.]*)?\s*([^\n]{6,120})",
-            ),
-        )
-        fields["cert_data"] = self._find_first(
-            cleaned,
-            (
-                r"(?:certid[aã]o[^\n]{0,80})\b(?:em|expedida\s+em|data)\s*[:\-]?\s*([0-3]?\d[\/\-][01]?\d[\/\-]\d{2,4})",
-            ),
-        )
-        fields["regime_casamento"] = self._find_first(
-            cleaned,
-            (
-                r"(?:^|\n)\s*regime(?:\s+de\s+bens)?\s*[:\-]\s*([^\n]{3,120})",
-                r"\b(comunh[aã]o\s+parcial|comunh[aã]o\s+universal|separa[cç][aã]o\s+total|participa[cç][aã]o\s+final\s+nos\s+aquestos)\b",
-            ),
+    def _parse_cleaned(self, cleaned: str) -> Dict[str, str]:
+        """Campos de um texto já normalizado por `_clean_text`.
+
+        Executa `FIELD_GRAMMAR` em ordem: a primeira regra que produz valor
+        define o campo, os validadores são aplicados ao final e só então rodam
+        as regras de fallback.
+        """
+        grammar = self.field_grammar
+        index = grammar.index(cleaned, prefilter=self.field_prefilter)
+        fields: Dict[str, str] = {}
+        fallbacks: List[CompiledRule] = []
+        for compiled in grammar.rules:
+            if compiled.rule.fallback:
+                fallbacks.append(compiled)
+                continue
+            self._apply_rule(compiled, index, fields)
+        for key, validator in grammar.validators.items():
+            if fields.get(key):
+                fields[key] = getattr(self, f"_validate_{validator}")(fields[key])
+        for compiled in fallbacks:
+            self._apply_rule(compiled, index, fields)
+        return {key: fields[key] for key in grammar.keys if fields.get(key)}
+
+    @property
+    def field_grammar(self) -> FieldGrammar:
+        return get_field_grammar()
+
+    def _apply_rule(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> None:
+        rule = compiled.rule
+        if all(fields.get(key) for key in rule.keys):
+            return
+        if not index.has_any(rule.labels):
+            return
+        if rule.scanner:
+            found = getattr(self, f"_scan_{rule.scanner}")(compiled, index, fields)
+        else:
+            value = self._first_match(index.text, compiled.patterns, rule.join_groups)
+            found = {rule.keys[0]: value}
+        for key, value in found.items():
+            if value and not fields.get(key):
+                fields[key] = value
+
+    def _scan_best_name(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        return {"nome": self._extract_best_name(index.text, index)}
+
+    def _scan_filiation(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        pai, mae = self._extract_filiation(index.text, index)
+        return {"nome_pai": pai, "nome_mae": mae}
+
+    def _scan_date_near_keyword(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        date = self._extract_date_near_keyword(
+            index.text, compiled.patterns[0], index=index, labels=compiled.rule.labels
         )
-        fields["loteamento"] = self._find_first(
-            cleaned, (r"(?:^|\n)\s*loteamento\s*[:\-]\s*([^\n]{2,120})",)
+        return {"data_nascimento": date}
+
+    def _scan_date_by_words(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        return {"data_nascimento": self._extract_date_by_words(index.text)}
+
+    def _scan_email(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        return {"email": self._find_email(index.text)}
+
+    def _scan_cpf(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        digits = self._extract_cpf_digits(index.text, index)
+        return {"cpf": self._format_cpf_digits(digits) if digits else ""}
+
+    def _scan_cnh_number(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        return {"cnh_numero": self._extract_cnh_number(index.text, index)}
+
+    def _scan_rg(
+        self, compiled: CompiledRule, index: TextIndex, fields: Dict[str, str]
+    ) -> Dict[str, str]:
+        rg, orgao, uf = self._extract_rg_parts(
+            index.text,
+            cpf_digits=self._ocr_to_digits(fields.get("cpf", "")),
+            index=index,
         )
-        if not fields.get("naturalidade"):
-            fields["naturalidade"] = self._find_first(
-                cleaned,
-                (r"c\.?\s*nasc[^,\n;]*[,;\s]\s*([A-ZÁÀÂÃÉÊÍÓÔÕÚÇ]{3,}(?:-[A-Z]{2}))",),
-            )
+        if not rg:
+            return {}
+        return {"rg": rg, "orgao_rg": orgao, "uf_rg": uf}
+
+    def _validate_holder_name(self, value: str) -> str:
+        name = self._clean_person_name(value)
+        name_ascii = self._ascii_lower(name)
+        if any(
+            token in name_ascii
+            for token in ("social", "name", "nome social", "registro")
+        ):
+            return ""
+        return name
 
-        rg_num, orgao_rg, uf_rg = self._extract_rg_parts(
-            cleaned,
-            cpf_digits=cpf_digits,
-        )
-        if rg_num:
-            fields["rg"] = rg_num
-            if orgao_rg:
-                fields["orgao_rg"] = orgao_rg
-            if uf_rg:
-                fields["uf_rg"] = uf_rg
-
-        if fields.get("nome"):
-            cleaned_name = self._clean_person_name(fields["nome"])
-            cleaned_name_ascii = self._ascii_lower(cleaned_name)
-            if any(
-                token in cleaned_name_ascii
-                for token in ("social", "name", "nome social", "registro")
-            ):
-                cleaned_name = ""
-            fields["nome"] = cleaned_name
-        if not fields.get("nome"):
-            fields["nome"] = self._extract_best_name(cleaned)
-        if fields.get("nome_pai"):
-            fields["nome_pai"] = self._clean_person_name(fields["nome_pai"])
-        if fields.get("nome_mae"):
-            fields["nome_mae"] = self._clean_person_name(fields["nome_mae"])
-        if fields.get("naturalidade"):
-            fields["naturalidade"] = self._clean_location_value(fields["naturalidade"])
-        if fields.get("nacionalidade"):
-            fields["nacionalidade"] = self._clean_nationality_value(
-                fields["nacionalidade"]
-            )
+    def _validate_person_name(self, value: str) -> str:
+        return self._clean_person_name(value)
+
+    def _validate_location(self, value: str) -> str:
+        return self._clean_location_value(value)
+
+    def _validate_nationality(self, value: str) -> str:
+        return self._clean_nationality_value(value)
 
-        return {key: value for key, value in fields.items() if value}
+    def _validate_sex(self, value: str) -> str:
+        normalized = self._ascii_lower(value)
+        if normalized in {"m", "masculino"}:
+            return "MASCULINO"
+        if normalized in {"f", "feminino"}:
+            return "FEMININO"
+        return ""
+
+    @staticmethod
+    def _validate_upper(value: str) -> str:
+        return value.upper()
+
+    @staticmethod
+    def _validate_issue_date(value: str) -> str:
+        match = re.search(r"\b([0-3]?\d)[/\-.]([01]?\d)[/\-.](\d{2,4})\b", value)
+        if not match:
+            return ""
+        day = int(match.group(1))
+        month = int(match.group(2))
+        year_raw = match.group(3)
+        year = int(year_raw)
+        if len(year_raw) == 2:
+            year += 2000 if year <= 30 else 1900
+        if day < 1 or day > 31 or month < 1 or month > 12:
+            return ""
+        return f"{day:02d}/{month:02d}/{year:04d}"
 
     @staticmethod
     def _normalize(text: str) -> str:
@@ -697,9 +1589,21 @@ class DocumentExtractor:
         text: str,
         patterns: Iterable[str],
         join_groups: bool = False,
+    ) -> str:
+        compiled = [
+            re.compile(pattern, flags=re.IGNORECASE | re.MULTILINE)
+            for pattern in patterns
+        ]
+        return self._first_match(text, compiled, join_groups)
+
+    def _first_match(
+        self,
+        text: str,
+        patterns: Iterable[Pattern[str]],
+        join_groups: bool = False,
     ) -> str:
         for pattern in patterns:
-            match = re.search(pattern, text, flags=re.IGNORECASE | re.MULTILINE)
+            match = pattern.search(text)
             if not match:
                 continue
             if join_groups and match.lastindex and match.lastindex > 1:
@@ -723,7 +1627,7 @@ class DocumentExtractor:
         return match.group(1).strip() if match else ""
 
     def _extract_rg_parts(
-        self, text: str, cpf_digits: str = ""
+        self, text: str, cpf_digits: str = "", index: Optional[TextIndex] = None
     ) -> Tuple[str, str, str]:
         match = re.search(
             r"(?:^|\n)\s*(?:registro\s*geral|rg)(?:\s*n[ºo.]*)?\s*[:\-]?\s*([0-9.\-xX]{5,20})"
@@ -741,7 +1645,7 @@ class DocumentExtractor:
             uf = self._clean_value(match.group(3) or "").upper()
             return rg, orgao or "SSP", uf
 
-        rg_fallback = self._extract_rg_digits(text, cpf_digits=cpf_digits)
+        rg_fallback = self._extract_rg_digits(text, cpf_digits=cpf_digits, index=index)
         orgao = self._find_first(
             text,
             (
@@ -760,7 +1664,9 @@ class DocumentExtractor:
             return "", "", ""
         return rg_fallback, (orgao or "SSP"), uf.upper()
 
-    def _extract_filiation(self, text: str) -> Tuple[str, str]:
+    def _extract_filiation(
+        self, text: str, index: Optional[TextIndex] = None
+    ) -> Tuple[str, str]:
         # Caso 1: "filiação: PAI e MÃE"
         inline = re.search(
             r"filiaç[ãa]o\s*[:\-]?\s*(.+?)\s+\be\b\s+(?:d[ao]s?\s+)?(.+)",
@@ -786,11 +1692,12 @@ class DocumentExtractor:
                 return pai, mae
 
         # Caso 3: "FILIAÇÃO" em uma linha e nomes nas duas linhas seguintes.
-        lines = [self._clean_value(line) for line in text.splitlines()]
-        for index, line in enumerate(lines):
-            if "filiacao" not in self._ascii_lower(line):
+        raw_lines, numbers = self._candidate_lines(text, index, "filiac")
+        lines = [self._clean_value(line) for line in raw_lines]
+        for number in numbers:
+            if "filiacao" not in self._ascii_lower(lines[number]):
                 continue
-            next_lines = lines[index + 1 : index + 4]
+            next_lines = lines[number + 1 : number + 4]
             name_candidates = [
                 self._clean_person_name(item)
                 for item in next_lines
@@ -801,22 +1708,6 @@ class DocumentExtractor:
 
         return "", ""
 
-    def _extract_sex(self, text: str) -> str:
-        value = self._find_first(
-            text,
-            (
-                r"(?:^|\n)\s*sexo\s*[:\-]?\s*(masculino|feminino|m|f)\b",
-                r"(?:^|\n)\s*sex\s*[:\-]?\s*(masculino|feminino|m|f)\b",
-                r"\bsexo\s+([mf])\b",
-            ),
-        )
-        normalized = self._ascii_lower(value)
-        if normalized in {"m", "masculino"}:
-            return "MASCULINO"
-        if normalized in {"f", "feminino"}:
-            return "FEMININO"
-        return ""
-
     def _looks_like_name_line(self, value: str) -> bool:
         cleaned = self._clean_value(value)
         if not cleaned:
@@ -1201,23 +2092,36 @@ class DocumentExtractor:
             return ""
         return " ".join(tokens).strip()
 
-    def _preprocess_for_ocr(self, image_obj) -> List:
+    def _preprocess_for_ocr(
+        self, image_obj, steps: Optional[Sequence[str]] = None
+    ) -> List:
+        """Variações de pré-processamento, na ordem de `OCR_PREPROCESSING`.
+
+        `steps` restringe as variações geradas; sem nenhuma disponível, volta à
+        imagem original.
+        """
         if Image is None:
             return [image_obj]
-        variants = [image_obj]
+        variants: Dict[str, Any] = {"original": image_obj}
 
         if ImageOps is not None:
-            gray = ImageOps.grayscale(image_obj)
-            variants.append(gray)
+            if getattr(image_obj, "mode", "") == "L":
+                gray = image_obj
+            else:
+                gray = ImageOps.grayscale(image_obj)
+                variants["gray"] = gray
             if ImageEnhance is not None:
                 contrast = ImageEnhance.Contrast(gray).enhance(2.2)
-                variants.append(contrast)
+                variants["contrast"] = contrast
                 sharp = ImageEnhance.Sharpness(contrast).enhance(1.8)
-                variants.append(sharp)
+                variants["sharp"] = sharp
                 lut = [0] * 166 + [255] * 90
                 bw = sharp.point(lut)
-                variants.append(bw)
-        return variants
+                variants["binary"] = bw
+        if steps is None:
+            return list(variants.values())
+        selected = [variants[name] for name in steps if name in variants]
+        return selected or [image_obj]
 
     def _score_ocr_text(self, text: str) -> int:
         plain = self._ascii_lower(text)
@@ -1314,39 +2218,43 @@ class DocumentExtractor:
             return True
         return False
 
-    def _extract_digits_near_keyword(
-        self, text: str, keyword_pattern: str, min_len: int, max_len: int
+    def _extract_date_near_keyword(
+        self,
+        text: str,
+        keyword_pattern: Union[str, Pattern[str]],
+        index: Optional[TextIndex] = None,
+        labels: Sequence[str] = (),
     ) -> str:
-        lines = text.splitlines()
-        for index, line in enumerate(lines):
-            if not re.search(keyword_pattern, line, flags=re.IGNORECASE):
-                continue
-            segments = [line]
-            if index + 1 < len(lines):
-                segments.append(lines[index + 1])
-            for segment in segments:
-                candidates = self._extract_numeric_candidates(
-                    segment, min_len=min_len, max_len=max_len
-                )
-                if candidates:
-                    return candidates[0]
-        return ""
-
-    def _extract_date_near_keyword(self, text: str, keyword_pattern: str) -> str:
-        lines = text.splitlines()
-        for index, line in enumerate(lines):
-            if not re.search(keyword_pattern, line, flags=re.IGNORECASE):
+        keyword = (
+            re.compile(keyword_pattern, flags=re.IGNORECASE)
+            if isinstance(keyword_pattern, str)
+            else keyword_pattern
+        )
+        lines, numbers = self._candidate_lines(text, index, *labels)
+        for number in numbers:
+            line = lines[number]
+            if not keyword.search(line):
                 continue
             segments = [line]
-            if index + 1 < len(lines):
-                segments.append(lines[index + 1])
+            if number + 1 < len(lines):
+                segments.append(lines[number + 1])
             for segment in segments:
                 date = self._extract_date_from_text(segment)
                 if date:
                     return date
         return ""
 
-    def _extract_cpf_digits(self, text: str) -> str:
+    @staticmethod
+    def _candidate_lines(
+        text: str, index: Optional[TextIndex], *labels: str
+    ) -> Tuple[List[str], Iterable[int]]:
+        """Linhas do texto e os números das que podem conter algum rótulo."""
+        if index is None or not labels:
+            lines = text.splitlines()
+            return lines, range(len(lines))
+        return index.lines, index.line_numbers(*labels)
+
+    def _extract_cpf_digits(self, text: str, index: Optional[TextIndex] = None) -> str:
         # 1) Primeiro tenta CPF já bem formado no texto.
         for match in re.finditer(r"\b(\d{3}\.?\d{3}\.?\d{3}-?\d{2})\b", text):
             digits = self._ocr_to_digits(match.group(1))
@@ -1354,13 +2262,14 @@ class DocumentExtractor:
                 return digits
 
         # 2) Depois tenta ao redor da palavra "CPF".
-        lines = text.splitlines()
-        for index, line in enumerate(lines):
+        lines, numbers = self._candidate_lines(text, index, "cpf")
+        for number in numbers:
+            line = lines[number]
             if "cpf" not in self._ascii_lower(line):
                 continue
             segments = [line]
-            if index + 1 < len(lines):
-                segments.append(lines[index + 1])
+            if number + 1 < len(lines):
+                segments.append(lines[number + 1])
             for segment in segments:
                 for candidate in self._extract_numeric_candidates(
                     segment, min_len=10, max_len=11
@@ -1384,10 +2293,13 @@ class DocumentExtractor:
 
         return ""
 
-    def _extract_rg_digits(self, text: str, cpf_digits: str = "") -> str:
-        lines = text.splitlines()
+    def _extract_rg_digits(
+        self, text: str, cpf_digits: str = "", index: Optional[TextIndex] = None
+    ) -> str:
+        lines, numbers = self._candidate_lines(text, index, "rg", "registro")
         rg_candidates: List[str] = []
-        for index, line in enumerate(lines):
+        for number in numbers:
+            line = lines[number]
             line_ascii = self._ascii_lower(line)
             if not (
                 "registrogeral" in line_ascii
@@ -1396,8 +2308,8 @@ class DocumentExtractor:
             ):
                 continue
             segments = [line]
-            if index + 1 < len(lines):
-                segments.append(lines[index + 1])
+            if number + 1 < len(lines):
+                segments.append(lines[number + 1])
             for segment in segments:
                 for candidate in self._extract_numeric_candidates(
                     segment, min_len=5, max_len=10
@@ -1414,15 +2326,18 @@ class DocumentExtractor:
         rg_candidates.sort(key=lambda value: (abs(len(value) - 8), -len(value)))
         return rg_candidates[0]
 
-    def _extract_cnh_number(self, text: str) -> str:
-        lines = text.splitlines()
+    def _extract_cnh_number(self, text: str, index: Optional[TextIndex] = None) -> str:
+        lines, numbers = self._candidate_lines(
+            text, index, "cnh", "habilita", "permiss"
+        )
         candidates: List[str] = []
-        for index, line in enumerate(lines):
+        for number in numbers:
+            line = lines[number]
             if not re.search(r"(?i)\b(cnh|habilita[cç][aã]o|permiss[aã]o)\b", line):
                 continue
             segments = [line]
-            if index + 1 < len(lines):
-                segments.append(lines[index + 1])
+            if number + 1 < len(lines):
+                segments.append(lines[number + 1])
             for segment in segments:
                 for candidate in self._extract_numeric_candidates(
                     segment, min_len=9, max_len=11
@@ -1435,37 +2350,6 @@ class DocumentExtractor:
         )
         return candidates[0]
 
-    def _extract_cnh_issue_date(self, text: str) -> str:
-        value = self._find_first(
-            text,
-            (
-                r"(?:data\s+de\s+expedi[cç][aã]o|expedi[cç][aã]o|emiss[aã]o)\s*[:\-]?\s*([0-3]?\d[\/\-.][01]?\d[\/\-.]\d{2,4})",
-            ),
-        )
-        if not value:
-            return ""
-        match = re.search(r"\b([0-3]?\d)[/\-.]([01]?\d)[/\-.](\d{2,4})\b", value)
-        if not match:
-            return ""
-        day = int(match.group(1))
-        month = int(match.group(2))
-        year_raw = match.group(3)
-        year = int(year_raw)
-        if len(year_raw) == 2:
-            year += 2000 if year <= 30 else 1900
-        if day < 1 or day > 31 or month < 1 or month > 12:
-            return ""
-        return f"{day:02d}/{month:02d}/{year:04d}"
-
-    def _extract_cnh_uf(self, text: str) -> str:
-        return self._find_first(
-            text,
-            (
-                r"(?:\bdetran\b|\bcnh\b)[^\n]{0,28}\b(AC|AL|AP|AM|BA|CE|DF|ES|GO|MA|MT|MS|MG|PA|PB|PR|PE|PI|RJ|RN|RS|RO|RR|SC|SP|SE|TO)\b",
-                r"(?:^|\n)\s*uf\s*[:\-]?\s*(AC|AL|AP|AM|BA|CE|DF|ES|GO|MA|MT|MS|MG|PA|PB|PR|PE|PI|RJ|RN|RS|RO|RR|SC|SP|SE|TO)\b",
-            ),
-        ).upper()
-
     def _extract_numeric_candidates(
         self, text: str, min_len: int, max_len: int
     ) -> List[str]:
@@ -1560,9 +2444,11 @@ class DocumentExtractor:
             tokens = tokens[:6]
         return " ".join(tokens).strip()
 
-    def _extract_best_name(self, text: str) -> str:
+    def _extract_best_name(self, text: str, index: Optional[TextIndex] = None) -> str:
+        lines, numbers = self._candidate_lines(text, index, "nome")
         candidates: List[Tuple[int, str]] = []
-        for line in text.splitlines():
+        for number in numbers:
+            line = lines[number]
             match = re.search(r"(?i)^\s*nome\s*[:\-]\s*(.+)$", line.strip())
             if not match:
                 continue
@@ -1619,9 +2505,7 @@ class DocumentExtractor:
 
     @staticmethod
     def _ascii_lower(value: str) -> str:
-        normalized = unicodedata.normalize("NFKD", value or "")
-        encoded = normalized.encode("ascii", "ignore").decode("ascii")
-        return encoded.lower()
+        return ascii_lower(value)
 
     @staticmethod
     def _clean_value(value: str) -> str:
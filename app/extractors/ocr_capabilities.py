@@ -0,0 +1,190 @@
+"""Sondagem única do Tesseract instalado: binário, versão, idiomas e OEM."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .paths import extraction_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Idiomas pedidos ao OCR, em ordem de preferência.
+OCR_LANGUAGES = ("por", "eng")
+# Gravado no mesmo diretório do cache de extração.
+CAPABILITIES_FILE = "ocr_capabilities.json"
+
+
+@dataclass(frozen=True)
+class OcrCapabilities:
+    tesseract_cmd: str = ""
+    version: str = ""
+    languages: Tuple[str, ...] = ()
+    # OEM 1 (LSTM) existe a partir do Tesseract 4.
+    lstm: bool = True
+
+    def language(self, wanted: Sequence[str] = OCR_LANGUAGES) -> str:
+        """Idiomas pedidos que estão instalados; vazio usa o padrão do Tesseract."""
+        if not self.languages:
+            return "+".join(wanted)
+        return "+".join(lang for lang in wanted if lang in self.languages)
+
+    def missing_languages(self, wanted: Sequence[str] = OCR_LANGUAGES) -> List[str]:
+        if not self.languages:
+            return []
+        return [lang for lang in wanted if lang not in self.languages]
+
+    def adapt_config(self, config: str) -> str:
+        if self.lstm:
+            return config
+        return re.sub(r"--oem\s+\d+\s*", "", config or "").strip()
+
+
+def parse_major_version(version: str) -> int:
+    match = re.search(r"(\d+)\.\d+", version or "")
+    return int(match.group(1)) if match else 0
+
+
+def find_tesseract_cmd() -> str:
+    """Primeiro binário encontrado: TESSERACT_CMD, PATH e instalações comuns."""
+    configured = os.environ.get("TESSERACT_CMD", "").strip()
+    candidates = [
+        configured,
+        shutil.which(configured) or "" if configured else "",
+        shutil.which("tesseract") or "",
+        str(Path.home() / "miniforge3" / "bin" / "tesseract"),
+        str(Path("/opt/homebrew/bin/tesseract")),
+        str(Path("/usr/local/bin/tesseract")),
+        str(Path(r"C:\Program Files\Tesseract-OCR\tesseract.exe")),
+    ]
+    for candidate in candidates:
+        if candidate and Path(candidate).is_file():
+            return str(Path(candidate).resolve())
+    return ""
+
+
+def subprocess_kwargs() -> Dict[str, Any]:
+    # No Windows, evita abrir uma janela de console a cada chamada.
+    if sys.platform == "win32":
+        return {"creationflags": getattr(subprocess, "CREATE_NO_WINDOW", 0)}
+    return {}
+
+
+def probe_tesseract(tesseract_cmd: str) -> OcrCapabilities:
+    """Executa `--version` e `--list-langs` no binário informado."""
+
+    def run(flag: str) -> str:
+        completed = subprocess.run(
+            [tesseract_cmd, flag],
+            capture_output=True,
+            check=False,
+            timeout=30,
+            **subprocess_kwargs(),
+        )
+        # Versões antigas escrevem no stderr.
+        return (completed.stdout + completed.stderr).decode("utf-8", "replace")
+
+    version = run("--version").strip().split("\n", 1)[0].strip()
+    languages = tuple(
+        sorted(
+            line.strip()
+            for line in run("--list-langs").splitlines()[1:]
+            if line.strip() and " " not in line.strip()
+        )
+    )
+    return OcrCapabilities(
+        tesseract_cmd=tesseract_cmd,
+        version=version,
+        languages=languages,
+        lstm=parse_major_version(version) >= 4,
+    )
+
+
+def _capabilities_path() -> Optional[Path]:
+    enabled = os.environ.get("EXTRACTION_CACHE", "1").strip().lower()
+    if enabled in {"0", "false", "no", "off"}:
+        return None
+    return extraction_cache_dir() / CAPABILITIES_FILE
+
+
+def _binary_stamp(tesseract_cmd: str) -> str:
+    # Binário atualizado ou outro TESSDATA_PREFIX invalidam a sondagem salva.
+    stat = Path(tesseract_cmd).stat()
+    tessdata = os.environ.get("TESSDATA_PREFIX", "").strip()
+    return f"{tesseract_cmd}|{stat.st_size}|{stat.st_mtime_ns}|{tessdata}"
+
+
+def _read_saved(path: Path, stamp: str) -> Optional[OcrCapabilities]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("stamp") != stamp:
+            return None
+        return OcrCapabilities(
+            tesseract_cmd=str(data["tesseract_cmd"]),
+            version=str(data["version"]),
+            languages=tuple(str(lang) for lang in data["languages"]),
+            lstm=bool(data["lstm"]),
+        )
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _save(path: Path, stamp: str, capabilities: OcrCapabilities) -> None:
+    payload = {"stamp": stamp, **asdict(capabilities)}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp_path, path)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"Falha ao salvar capacidades do OCR: {exc}")
+
+
+_probe_lock = threading.Lock()
+_probed: Optional[OcrCapabilities] = None
+
+
+def get_tesseract_capabilities(refresh: bool = False) -> OcrCapabilities:
+    """
+    Capacidades do binário do Tesseract, sondadas uma vez por processo.
+
+    O resultado também fica em disco (EXTRACTION_CACHE_DIR) e só é refeito
+    quando o binário ou TESSDATA_PREFIX mudam.
+    """
+    global _probed
+    with _probe_lock:
+        if _probed is not None and not refresh:
+            return _probed
+        tesseract_cmd = find_tesseract_cmd()
+        if not tesseract_cmd:
+            _probed = OcrCapabilities()
+            return _probed
+        try:
+            stamp = _binary_stamp(tesseract_cmd)
+        except OSError:
+            stamp = ""
+        path = _capabilities_path()
+        saved = _read_saved(path, stamp) if path is not None and not refresh else None
+        if saved is not None:
+            _probed = saved
+            return _probed
+        try:
+            _probed = probe_tesseract(tesseract_cmd)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Falha ao sondar o Tesseract ({tesseract_cmd}): {exc}")
+            _probed = OcrCapabilities(tesseract_cmd=tesseract_cmd)
+            return _probed
+        if path is not None and stamp:
+            _save(path, stamp, _probed)
+        return _probed
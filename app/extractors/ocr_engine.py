@@ -0,0 +1,493 @@
+"""Motores de OCR reutilizáveis (Tesseract em processo ou via subprocesso)."""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import shlex
+import subprocess
+import threading
+import unicodedata
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from .ocr_capabilities import (
+    OcrCapabilities,
+    get_tesseract_capabilities,
+    parse_major_version,
+    subprocess_kwargs,
+)
+from .settings import env_int
+
+try:
+    import tesserocr  # type: ignore
+except Exception:  # noqa: BLE001
+    tesserocr = None  # type: ignore[assignment]
+
+try:
+    import pytesseract  # type: ignore
+except Exception:  # noqa: BLE001
+    pytesseract = None  # type: ignore[assignment]
+
+
+def default_ocr_workers() -> int:
+    """Número de chamadas OCR simultâneas (OCR_MAX_WORKERS, padrão: núcleos até 8)."""
+    return env_int("OCR_MAX_WORKERS", min(8, os.cpu_count() or 1))
+
+
+@dataclass(frozen=True)
+class OcrWord:
+    """Palavra reconhecida com caixa em pixels e confiança (0-100)."""
+
+    text: str
+    left: int
+    top: int
+    width: int
+    height: int
+    conf: float
+    # (bloco, parágrafo, linha): palavras da mesma linha compartilham a chave.
+    line: Tuple[int, int, int] = (0, 0, 0)
+
+    @property
+    def right(self) -> int:
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.top + self.height
+
+
+def _token(value: str) -> str:
+    ascii_value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore")
+    return re.sub(r"[^a-z0-9]", "", ascii_value.decode("ascii").lower())
+
+
+@dataclass(frozen=True)
+class OcrResult:
+    """Saída de uma chamada OCR: palavras com caixa/confiança e o texto por linha."""
+
+    words: Tuple[OcrWord, ...] = ()
+
+    @property
+    def text(self) -> str:
+        lines: List[str] = []
+        current: List[str] = []
+        previous: Optional[Tuple[int, int, int]] = None
+        for word in self.words:
+            if previous is not None and word.line != previous:
+                lines.append(" ".join(current))
+                current = []
+                if word.line[0] != previous[0]:
+                    # Blocos separados por linha em branco, como no modo texto.
+                    lines.append("")
+            current.append(word.text)
+            previous = word.line
+        if current:
+            lines.append(" ".join(current))
+        return "\n".join(lines)
+
+    @property
+    def mean_confidence(self) -> float:
+        scores = [word.conf for word in self.words if word.conf >= 0]
+        return sum(scores) / len(scores) if scores else 0.0
+
+    @property
+    def confident_chars(self) -> float:
+        """Caracteres reconhecidos ponderados pela confiança de cada palavra."""
+        return sum(len(word.text) * max(0.0, word.conf) / 100 for word in self.words)
+
+    def confidence_of(self, value: str) -> float:
+        """Confiança média das palavras que compõem `value` (-1 se nenhuma).
+
+        A comparação ignora acentos, caixa e pontuação; palavras curtas só
+        contam quando coincidem com um termo inteiro do valor.
+        """
+        terms = {_token(term) for term in str(value or "").split()}
+        joined = _token(str(value or ""))
+        scores = []
+        for word in self.words:
+            token = _token(word.text)
+            if not token or word.conf < 0:
+                continue
+            if token in terms or (len(token) >= 3 and token in joined):
+                scores.append(word.conf)
+        return sum(scores) / len(scores) if scores else -1.0
+
+
+class OcrEngine(Protocol):
+    name: str
+
+    def image_to_string(self, image, lang: str = "", config: str = "") -> str: ...
+
+    def image_to_data(
+        self, image, lang: str = "", config: str = ""
+    ) -> List[OcrWord]: ...
+
+    def version(self) -> str: ...
+
+    def capabilities(self) -> OcrCapabilities: ...
+
+
+def _parse_config(config: str) -> Tuple[int, int, Dict[str, str]]:
+    """Converte flags no estilo CLI (`--oem 1 --psm 6 -c k=v`) em parâmetros."""
+    oem = 1
+    psm = 3
+    variables: Dict[str, str] = {}
+    tokens = shlex.split(config or "")
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        value = tokens[index + 1] if index + 1 < len(tokens) else ""
+        if token == "--oem" and value.isdigit():
+            oem = int(value)
+            index += 2
+            continue
+        if token == "--psm" and value.isdigit():
+            psm = int(value)
+            index += 2
+            continue
+        if token == "-c" and "=" in value:
+            key, _, item = value.partition("=")
+            variables[key] = item
+            index += 2
+            continue
+        index += 1
+    return oem, psm, variables
+
+
+class PytesseractEngine:
+    """Uma chamada do binário `tesseract` por imagem (comportamento histórico)."""
+
+    name = "pytesseract"
+
+    def __init__(self, max_concurrency: int = 1) -> None:
+        # Pools aninhados (páginas x variações) não devem multiplicar processos.
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        tesseract_cmd = self.capabilities().tesseract_cmd
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def image_to_string(self, image, lang: str = "", config: str = "") -> str:
+        with self._slots:
+            if lang:
+                return pytesseract.image_to_string(image, lang=lang, config=config)
+            return pytesseract.image_to_string(image, config=config)
+
+    def image_to_data(self, image, lang: str = "", config: str = "") -> List[OcrWord]:
+        kwargs: Dict[str, Any] = {
+            "config": config,
+            "output_type": pytesseract.Output.DICT,
+        }
+        if lang:
+            kwargs["lang"] = lang
+        with self._slots:
+            data = pytesseract.image_to_data(image, **kwargs)
+        words: List[OcrWord] = []
+        for index, text in enumerate(data.get("text", [])):
+            if int(data["level"][index]) != 5 or not str(text).strip():
+                continue
+            words.append(
+                OcrWord(
+                    text=str(text).strip(),
+                    left=int(data["left"][index]),
+                    top=int(data["top"][index]),
+                    width=int(data["width"][index]),
+                    height=int(data["height"][index]),
+                    conf=float(data["conf"][index]),
+                    line=(
+                        int(data["block_num"][index]),
+                        int(data["par_num"][index]),
+                        int(data["line_num"][index]),
+                    ),
+                )
+            )
+        return words
+
+    def version(self) -> str:
+        return self.capabilities().version or str(pytesseract.get_tesseract_version())
+
+    def capabilities(self) -> OcrCapabilities:
+        return get_tesseract_capabilities()
+
+
+class _EncodedImageCache:
+    """Raster PNM por imagem, reaproveitado entre jobs com a mesma imagem.
+
+    A chave é a identidade do objeto, conferida por weakref: a entrada some
+    quando a imagem é coletada e nunca é servida para outro objeto.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[Any, bytes]] = {}
+
+    def get(self, image) -> bytes:
+        key = id(image)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is image:
+                return entry[1]
+        encoded = self._encode(image)
+        try:
+            ref = weakref.ref(image, lambda _ref, key=key: self._drop(key, _ref))
+        except TypeError:
+            return encoded
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (ref, encoded)
+        return encoded
+
+    def _drop(self, key: int, ref) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del self._entries[key]
+
+    @staticmethod
+    def _encode(image) -> bytes:
+        # PGM/PPM sem compressão: o Leptonica lê direto da memória.
+        if image.mode not in {"L", "RGB"}:
+            image = image.convert("L" if image.mode in {"1", "I", "F"} else "RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PPM")
+        return buffer.getvalue()
+
+
+class TesseractStdinEngine:
+    """Uma chamada do binário por imagem, com o raster enviado pelo stdin.
+
+    Diferente do pytesseract, não grava a imagem nem lê a saída de arquivos
+    temporários; jobs que compartilham a imagem reaproveitam o raster.
+    """
+
+    name = "tesseract"
+
+    def __init__(self, tesseract_cmd: str, max_concurrency: int = 1) -> None:
+        self.tesseract_cmd = tesseract_cmd
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._encoded = _EncodedImageCache()
+
+    def image_to_string(self, image, lang: str = "", config: str = "") -> str:
+        return self._run(image, lang, config)
+
+    def image_to_data(self, image, lang: str = "", config: str = "") -> List[OcrWord]:
+        output = self._run(image, lang, config, "tsv")
+        rows = [line.split("\t") for line in output.splitlines()]
+        words: List[OcrWord] = []
+        for row in rows[1:]:
+            if len(row) < 12 or row[0] != "5" or not row[11].strip():
+                continue
+            try:
+                words.append(
+                    OcrWord(
+                        text=row[11].strip(),
+                        left=int(row[6]),
+                        top=int(row[7]),
+                        width=int(row[8]),
+                        height=int(row[9]),
+                        conf=float(row[10]),
+                        line=(int(row[2]), int(row[3]), int(row[4])),
+                    )
+                )
+            except ValueError:
+                continue
+        return words
+
+    def version(self) -> str:
+        return self.capabilities().version
+
+    def capabilities(self) -> OcrCapabilities:
+        return get_tesseract_capabilities()
+
+    def _run(self, image, lang: str, config: str, output: str = "") -> str:
+        command = [self.tesseract_cmd, "stdin", "stdout"]
+        if lang:
+            command.extend(["-l", lang])
+        command.extend(shlex.split(config or ""))
+        if output:
+            command.append(output)
+        encoded = self._encoded.get(image)
+        with self._slots:
+            completed = subprocess.run(
+                command,
+                input=encoded,
+                capture_output=True,
+                check=False,
+                **subprocess_kwargs(),
+            )
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip()
+            raise RuntimeError(message or f"tesseract saiu com {completed.returncode}")
+        return completed.stdout.decode("utf-8", "replace")
+
+
+class TesserocrEngine:
+    """Pool de instâncias `PyTessBaseAPI` mantidas carregadas entre chamadas.
+
+    Cada instância carrega o traineddata uma única vez e recebe imagens em
+    memória. Instâncias não são thread-safe; o pool entrega uma por thread e
+    limita o total a `max_instances` por idioma/OEM.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, max_instances: int = 1, tessdata_path: str = "") -> None:
+        self.max_instances = max(1, max_instances)
+        self.tessdata_path = tessdata_path
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, int], List] = {}
+        self._slots: Dict[Tuple[str, int], threading.BoundedSemaphore] = {}
+        self._all: List = []
+        self._capabilities: Optional[OcrCapabilities] = None
+
+    def image_to_string(self, image, lang: str = "", config: str = "") -> str:
+        return self._run(image, lang, config, lambda api: api.GetUTF8Text() or "")
+
+    def image_to_data(self, image, lang: str = "", config: str = "") -> List[OcrWord]:
+        return self._run(image, lang, config, self._read_words)
+
+    @staticmethod
+    def _read_words(api) -> List[OcrWord]:
+        api.Recognize()
+        words: List[OcrWord] = []
+        level = tesserocr.RIL.WORD
+        line = 0
+        for item in tesserocr.iterate_level(api.GetIterator(), level):
+            if item.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line += 1
+            text = (item.GetUTF8Text(level) or "").strip()
+            box = item.BoundingBox(level)
+            if not text or not box:
+                continue
+            left, top, right, bottom = box
+            words.append(
+                OcrWord(
+                    text=text,
+                    left=left,
+                    top=top,
+                    width=right - left,
+                    height=bottom - top,
+                    conf=float(item.Confidence(level)),
+                    line=(0, 0, line),
+                )
+            )
+        return words
+
+    def _run(self, image, lang: str, config: str, read: Callable[[Any], Any]):
+        oem, psm, variables = _parse_config(config)
+        key = (lang or "eng", oem)
+        api = self._acquire(key)
+        try:
+            previous = {name: api.GetVariableAsString(name) for name in variables}
+            try:
+                for name, value in variables.items():
+                    api.SetVariable(name, value)
+                api.SetPageSegMode(psm)
+                api.SetImage(image)
+                return read(api)
+            finally:
+                for name, value in previous.items():
+                    api.SetVariable(name, value or "")
+                api.Clear()
+        finally:
+            self._release(key, api)
+
+    def version(self) -> str:
+        return self.capabilities().version
+
+    def capabilities(self) -> OcrCapabilities:
+        # A biblioteca já está carregada: consulta direta, sem subprocesso.
+        if self._capabilities is None:
+            version = str(tesserocr.tesseract_version()).split("\n", 1)[0]
+            path = self.tessdata_path or None
+            _, languages = (
+                tesserocr.get_languages(path) if path else tesserocr.get_languages()
+            )
+            self._capabilities = OcrCapabilities(
+                version=version,
+                languages=tuple(sorted(languages)),
+                lstm=parse_major_version(version) >= 4,
+            )
+        return self._capabilities
+
+    def close(self) -> None:
+        with self._lock:
+            apis, self._all = self._all, []
+            self._idle.clear()
+        for api in apis:
+            try:
+                api.End()
+            except Exception:  # noqa: BLE001
+                pass
+
+    def _acquire(self, key: Tuple[str, int]):
+        with self._lock:
+            slots = self._slots.setdefault(
+                key, threading.BoundedSemaphore(self.max_instances)
+            )
+        slots.acquire()
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if idle:
+                return idle.pop()
+        try:
+            kwargs = {"lang": key[0], "oem": tesserocr.OEM(key[1])}
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+        except Exception:
+            slots.release()
+            raise
+        with self._lock:
+            self._all.append(api)
+        return api
+
+    def _release(self, key: Tuple[str, int], api) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(api)
+        self._slots[key].release()
+
+
+_engine_lock = threading.Lock()
+_engine: Optional[OcrEngine] = None
+_engine_resolved = False
+
+
+def create_ocr_engine(
+    preference: str = "", max_instances: int = 1
+) -> Optional[OcrEngine]:
+    """
+    Seleciona o motor de OCR.
+
+    Variáveis:
+    - OCR_ENGINE=auto|tesserocr|tesseract|pytesseract (default: auto)
+    - TESSERACT_CMD=... (opcional, caminho do binário; sondado uma única vez)
+    - TESSDATA_PREFIX=... (opcional, diretório do traineddata para tesserocr)
+    """
+    choice = (preference or os.environ.get("OCR_ENGINE", "auto")).strip().lower()
+    if choice in {"auto", "tesserocr"} and tesserocr is not None:
+        return TesserocrEngine(
+            max_instances=max_instances,
+            tessdata_path=os.environ.get("TESSDATA_PREFIX", "").strip(),
+        )
+    if choice != "pytesseract":
+        tesseract_cmd = get_tesseract_capabilities().tesseract_cmd
+        if tesseract_cmd:
+            return TesseractStdinEngine(tesseract_cmd, max_concurrency=max_instances)
+    if pytesseract is not None:
+        return PytesseractEngine(max_concurrency=max_instances)
+    return None
+
+
+def get_ocr_engine() -> Optional[OcrEngine]:
+    """Motor compartilhado pelo processo (modelos carregados uma única vez)."""
+    global _engine, _engine_resolved
+    with _engine_lock:
+        if not _engine_resolved:
+            _engine = create_ocr_engine(max_instances=default_ocr_workers())
+            _engine_resolved = True
+        return _engine
@@ -0,0 +1,221 @@
+"""Planejamento das chamadas OCR de um documento: deduplicação e orçamento."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .settings import env_float, env_int
+
+# Teto por imagem (foto ou página escaneada). 0 desativa o limite.
+OCR_MAX_CALLS_PER_DOCUMENT = 32
+OCR_MAX_SECONDS_PER_DOCUMENT = 60.0
+
+
+@dataclass(frozen=True)
+class OcrBudget:
+    """Limite de chamadas OCR e de tempo de parede por documento (0 = sem limite)."""
+
+    max_calls: int = OCR_MAX_CALLS_PER_DOCUMENT
+    max_seconds: float = OCR_MAX_SECONDS_PER_DOCUMENT
+
+    @classmethod
+    def from_env(cls) -> "OcrBudget":
+        """
+        Variáveis:
+        - OCR_MAX_CALLS_PER_DOCUMENT (default: 32)
+        - OCR_MAX_SECONDS_PER_DOCUMENT (default: 60)
+        """
+        return cls(
+            max_calls=env_int(
+                "OCR_MAX_CALLS_PER_DOCUMENT", OCR_MAX_CALLS_PER_DOCUMENT, minimum=0
+            ),
+            max_seconds=env_float(
+                "OCR_MAX_SECONDS_PER_DOCUMENT", OCR_MAX_SECONDS_PER_DOCUMENT
+            ),
+        )
+
+    @property
+    def tag(self) -> str:
+        return f"{self.max_calls}c{self.max_seconds:g}s"
+
+
+def image_fingerprint(image) -> str:
+    """Identifica imagens com os mesmos pixels, independente de como foram geradas."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{getattr(image, 'mode', '')}:{getattr(image, 'size', '')}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class OcrProfile:
+    """Busca OCR específica de um tipo de documento.
+
+    `preprocessing` usa os nomes de `OCR_PREPROCESSING` e `configs` as flags do
+    Tesseract, ambos em ordem de prioridade; tupla vazia mantém a busca
+    completa naquele eixo.
+    """
+
+    preprocessing: Tuple[str, ...] = ()
+    configs: Tuple[str, ...] = ()
+
+
+@dataclass
+class OcrJob:
+    image: Any
+    config: str
+    rank: int
+    # Grupos (ex.: variações geométricas) que recebem o resultado deste job.
+    groups: List[int] = field(default_factory=list)
+    order: int = 0
+    fingerprint: str = ""
+
+
+class OcrPlan:
+    """Fila de jobs OCR de um documento.
+
+    Jobs com os mesmos pixels e a mesma configuração rodam uma única vez e o
+    resultado vale para todos os grupos que os pediram. A ordem segue o ganho
+    esperado: primeiro o job mais promissor de cada grupo ainda não testado,
+    depois os demais jobs dos grupos com melhor pontuação observada, que
+    completam cada onda até a largura pedida. O plano para quando o orçamento
+    de chamadas ou de tempo se esgota.
+    """
+
+    def __init__(
+        self,
+        budget: OcrBudget,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budget = budget
+        self._clock = clock
+        self._started = clock()
+        self._pending: List[OcrJob] = []
+        self._by_key: Dict[Tuple[str, str], OcrJob] = {}
+        self._group_scores: Dict[int, int] = {}
+        # Imagem de origem de cada grupo, antes do pré-processamento.
+        self.sources: Dict[int, Any] = {}
+        self.calls = 0
+        self.duplicates = 0
+        self.skipped = 0
+
+    def add(
+        self,
+        group: int,
+        image,
+        config: str,
+        rank: int = 0,
+        fingerprint: str = "",
+    ) -> bool:
+        """Agenda um job; `rank` menor indica ganho esperado maior no grupo.
+
+        `fingerprint` evita recalcular o hash da mesma imagem para cada
+        configuração. Retorna False quando o job equivale a outro já agendado.
+        """
+        fingerprint = fingerprint or image_fingerprint(image)
+        key = (fingerprint, config)
+        existing = self._by_key.get(key)
+        if existing is not None:
+            if group not in existing.groups:
+                existing.groups.append(group)
+            self.duplicates += 1
+            return False
+        job = OcrJob(
+            image=image,
+            config=config,
+            rank=rank,
+            groups=[group],
+            order=len(self._by_key),
+            fingerprint=fingerprint,
+        )
+        self._by_key[key] = job
+        self._pending.append(job)
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    @property
+    def exhausted(self) -> bool:
+        budget = self.budget
+        if budget.max_calls and self.calls >= budget.max_calls:
+            return True
+        return bool(budget.max_seconds) and self.elapsed >= budget.max_seconds
+
+    def next_wave(self, width: int) -> List[OcrJob]:
+        """Retira até `width` jobs da fila, respeitando o orçamento restante."""
+        if self.exhausted or not self._pending:
+            return []
+        if self.budget.max_calls:
+            width = min(width, self.budget.max_calls - self.calls)
+        width = max(1, width)
+
+        untested = [
+            job
+            for job in self._pending
+            if not any(group in self._group_scores for group in job.groups)
+        ]
+        explore: List[OcrJob] = []
+        seen_groups: set[int] = set()
+        for job in sorted(untested, key=self._static_key):
+            if job.groups[0] in seen_groups:
+                continue
+            seen_groups.add(job.groups[0])
+            explore.append(job)
+        # Os grupos não testados vêm primeiro; o restante da onda segue a
+        # evidência, para que a busca exaustiva mantenha a onda cheia.
+        wave = explore[:width]
+        chosen = {id(job) for job in wave}
+        if len(wave) < width:
+            rest = [job for job in self._pending if id(job) not in chosen]
+            wave.extend(sorted(rest, key=self._evidence_key)[: width - len(wave)])
+            chosen = {id(job) for job in wave}
+        self._pending = [job for job in self._pending if id(job) not in chosen]
+        self.calls += len(wave)
+        return wave
+
+    def drop_alternatives(self, job: OcrJob) -> int:
+        """Descarta os jobs pendentes da mesma imagem com outra configuração.
+
+        Usado quando a primeira leitura da imagem já é confiável: os demais
+        PSMs não trariam informação nova. Retorna quantos jobs saíram da fila.
+        """
+        kept = [
+            pending
+            for pending in self._pending
+            if pending.fingerprint != job.fingerprint
+        ]
+        dropped = len(self._pending) - len(kept)
+        self._pending = kept
+        self.skipped += dropped
+        return dropped
+
+    def charge(self, calls: int) -> None:
+        """Desconta do orçamento chamadas feitas fora do plano (ex.: recortes)."""
+        self.calls += calls
+
+    def record(self, job: OcrJob, score: int) -> None:
+        for group in job.groups:
+            if score > self._group_scores.get(group, -(10**9)):
+                self._group_scores[group] = score
+
+    def group_score(self, group: int) -> Optional[int]:
+        return self._group_scores.get(group)
+
+    @staticmethod
+    def _static_key(job: OcrJob) -> Tuple[int, int, int]:
+        return job.rank, min(job.groups), job.order
+
+    def _evidence_key(self, job: OcrJob) -> Tuple[int, int, int, int]:
+        observed = max(
+            (self._group_scores.get(group, -(10**9)) for group in job.groups),
+        )
+        return -observed, job.rank, min(job.groups), job.order
@@ -0,0 +1,42 @@
+"""Diretórios de dados gravados pelos extratores.
+
+Ficam no diretório de cache do usuário, e não no diretório de trabalho, para
+que o aplicativo empacotado ou aberto de outra pasta reaproveite o mesmo cache.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+APP_DIR_NAME = "Qualificador"
+
+
+def user_cache_dir() -> Path:
+    """Diretório de cache do usuário reservado ao aplicativo.
+
+    Windows: %LOCALAPPDATA%; macOS: ~/Library/Caches; demais: $XDG_CACHE_HOME
+    ou ~/.cache.
+    """
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")
+        root = Path(base) if base else Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        root = Path.home() / "Library" / "Caches"
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME", "").strip()
+        root = Path(xdg) if xdg else Path.home() / ".cache"
+    return root / APP_DIR_NAME
+
+
+def extraction_cache_dir() -> Path:
+    """Diretório do cache de extração e da sondagem do Tesseract.
+
+    `EXTRACTION_CACHE_DIR` tem precedência; caminhos relativos são resolvidos
+    uma vez, contra o diretório atual.
+    """
+    configured = os.environ.get("EXTRACTION_CACHE_DIR", "").strip()
+    if configured:
+        return Path(configured).expanduser().resolve()
+    return user_cache_dir() / "extraction_cache"
@@ -0,0 +1,159 @@
+"""Backends de leitura de PDF: um único handle para texto e rasterização."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+try:
+    from PIL import Image  # type: ignore
+except Exception:  # noqa: BLE001
+    Image = None  # type: ignore[assignment]
+
+try:
+    import fitz  # type: ignore
+except Exception:  # noqa: BLE001
+    fitz = None  # type: ignore[assignment]
+
+
+def _load_pdf_reader_class() -> Any:
+    try:
+        from pypdf import PdfReader as pdf_reader_class  # type: ignore
+
+        return pdf_reader_class
+    except Exception:  # noqa: BLE001
+        try:
+            from PyPDF2 import PdfReader as pdf_reader_class  # type: ignore
+
+            return pdf_reader_class
+        except Exception:  # noqa: BLE001
+            return None
+
+
+PdfReaderClass = _load_pdf_reader_class()
+
+
+class PdfBackendUnavailable(RuntimeError):
+    """Nenhuma biblioteca de PDF instalada atende ao pedido."""
+
+
+class MuPdfDocument:
+    """PDF aberto via PyMuPDF: extração de texto e rasterização no mesmo handle.
+
+    Não é thread-safe; chamadas devem partir sempre da mesma thread.
+    """
+
+    backend = "mupdf"
+    can_render = True
+
+    def __init__(self, file_path: Path) -> None:
+        self._doc = fitz.open(str(file_path))
+
+    @property
+    def page_count(self) -> int:
+        return int(self._doc.page_count)
+
+    def page_text(self, index: int) -> str:
+        return self._doc[index].get_text("text") or ""
+
+    def page_size(self, index: int) -> Tuple[float, float]:
+        rect = self._doc[index].rect
+        return float(rect.width), float(rect.height)
+
+    def render_page(self, index: int, zoom: float, grayscale: bool = False):
+        """Rasteriza a página direto num buffer do Pillow, sem PNG intermediário."""
+        pix = self._doc[index].get_pixmap(
+            matrix=fitz.Matrix(zoom, zoom),
+            colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+            alpha=False,
+        )
+        mode = "L" if pix.n == 1 else "RGB"
+        samples = getattr(pix, "samples_mv", None) or pix.samples
+        image = Image.frombuffer(
+            mode, (pix.width, pix.height), samples, "raw", mode, pix.stride, 1
+        )
+        # Em modo "L" o Pillow mapeia a memória do pixmap: ele precisa viver junto.
+        image._source_pixmap = pix
+        image.info["ocr_scale"] = zoom
+        return image
+
+    def close(self) -> None:
+        self._doc.close()
+
+    def __enter__(self) -> "MuPdfDocument":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+class PyPdfDocument:
+    """Fallback em Python puro: apenas texto, sem rasterização."""
+
+    backend = "pypdf"
+    can_render = False
+
+    def __init__(self, file_path: Path) -> None:
+        self._reader = PdfReaderClass(str(file_path))
+
+    @property
+    def page_count(self) -> int:
+        return len(self._reader.pages)
+
+    def page_text(self, index: int) -> str:
+        return self._reader.pages[index].extract_text() or ""
+
+    def page_size(self, index: int) -> Tuple[float, float]:
+        box = self._reader.pages[index].mediabox
+        return float(box.width), float(box.height)
+
+    def render_page(self, index: int, zoom: float, grayscale: bool = False):
+        raise PdfBackendUnavailable(
+            "rasterização de PDF indisponível (instale 'pymupdf')."
+        )
+
+    def close(self) -> None:
+        return None
+
+    def __enter__(self) -> "PyPdfDocument":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+def available_pdf_backends() -> Tuple[str, ...]:
+    backends = []
+    if fitz is not None and Image is not None:
+        backends.append(MuPdfDocument.backend)
+    if PdfReaderClass is not None:
+        backends.append(PyPdfDocument.backend)
+    return tuple(backends)
+
+
+def open_pdf(file_path: Path, preference: str = ""):
+    """
+    Abre o PDF no backend mais rápido disponível.
+
+    Variáveis:
+    - PDF_BACKEND=auto|mupdf|pypdf (default: auto, MuPDF com fallback para pypdf)
+    """
+    choice = (preference or os.environ.get("PDF_BACKEND", "auto")).strip().lower()
+    available = available_pdf_backends()
+    if not available:
+        raise PdfBackendUnavailable(
+            "Biblioteca de PDF indisponível (instale 'pymupdf' ou 'pypdf')."
+        )
+    order = [choice] if choice in available else []
+    order.extend(name for name in available if name not in order)
+
+    last_error: Optional[Exception] = None
+    for name in order:
+        try:
+            if name == MuPdfDocument.backend:
+                return MuPdfDocument(file_path)
+            return PyPdfDocument(file_path)
+        except Exception as exc:  # noqa: BLE001
+            last_error = exc
+    raise last_error or PdfBackendUnavailable("falha ao abrir PDF.")
@@ -0,0 +1,25 @@
+"""Leitura de ajustes numéricos dos extratores a partir de variáveis de ambiente."""
+
+from __future__ import annotations
+
+import os
+
+
+def env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Inteiro da variável `name`; vazio ou inválido usa `default`."""
+    raw = os.environ.get(name, "").strip()
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        value = default
+    return max(minimum, value)
+
+
+def env_float(name: str, default: float, minimum: float = 0.0) -> float:
+    """Número real da variável `name`; vazio ou inválido usa `default`."""
+    raw = os.environ.get(name, "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        value = default
+    return max(minimum, value)
@@ -13,6 +13,7 @@ import customtkinter as ctk
 
 try:
     from .config import get_config
+    from .extraction import preload_document_extractor
     from .handlers import EventHandlers
     from .history import get_history_manager
     from .logger import setup_logging
@@ -46,6 +47,7 @@ try:
     )
 except ImportError:
     from config import get_config  # type: ignore
+    from extraction import preload_document_extractor  # type: ignore
     from handlers import EventHandlers  # type: ignore
     from history import get_history_manager  # type: ignore
     from logger import setup_logging  # type: ignore
@@ -210,6 +212,9 @@ class App(tk.Tk):
 
         logger.info("Aplicação inicializada com sucesso")
 
+        # Modelo ML e OCR carregam em segundo plano assim que a janela aparece.
+        self.after_idle(preload_document_extractor)
+
     def _setup_window_icon(self) -> None:
         """Configura ícone com fallback para Windows/macOS/Linux."""
         ico_path = self.base_dir / "Qualificador.ico"
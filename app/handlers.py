@@ -6,13 +6,19 @@ import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 try:
     from .config import get_config
-    from .extraction import create_document_extractor
+    from .extraction import (
+        CancellationToken,
+        ExtractionCancelled,
+        ExtractionResult,
+        get_document_extractor,
+    )
+    from .extractors.cache import get_extraction_cache
     from .history import get_history_manager
     from .template_engine import clear_template_cache, render_template
     from .validators import (
@@ -24,7 +30,13 @@ try:
     )
 except ImportError:
     from config import get_config  # type: ignore
-    from extraction import create_document_extractor  # type: ignore
+    from extraction import (  # type: ignore
+        CancellationToken,
+        ExtractionCancelled,
+        ExtractionResult,
+        get_document_extractor,
+    )
+    from extractors.cache import get_extraction_cache  # type: ignore
     from history import get_history_manager  # type: ignore
     from template_engine import clear_template_cache, render_template  # type: ignore
     from validators import (  # type: ignore
@@ -843,24 +855,45 @@ class EventHandlers:
         self.app.status.configure(text=info)
 
     def on_extraction_run(self) -> None:
+        if getattr(self, "_extraction_in_progress", False):
+            self.on_extraction_cancel()
+            return
+
         files = getattr(self.app, "extraction_files", [])
         if not files:
             messagebox.showinfo("Extração", "Selecione ao menos um PDF ou imagem.")
             return
 
-        if getattr(self, "_extraction_in_progress", False):
-            return
         self._extraction_in_progress = True
+        cancel_token = CancellationToken()
+        self._extraction_cancel_token = cancel_token
 
         button = getattr(self.app, "btn_extraction_run", None)
         if button is not None:
-            button.configure(state="disabled", text="Extraindo...")
+            button.configure(text="Cancelar Extração")
         self.app.status.configure(text="Extraindo informações, aguarde...")
+        # Variáveis Tk só podem ser lidas na thread da interface.
+        target = str(getattr(self.app, "extraction_target").get())
+        required_keys = list(self._get_extraction_target_map(target).keys())
 
         def worker() -> None:
+            result = ExtractionResult(raw_text="", fields={}, warnings=[])
             try:
-                extractor, setup_warnings = create_document_extractor()
-                result = extractor.extract_from_files(files)
+                extractor, setup_warnings = get_document_extractor()
+                for progress in extractor.iter_extract_from_files(
+                    files, required_keys=required_keys, cancel_token=cancel_token
+                ):
+                    if progress.result is not None:
+                        result = progress.result
+                    self.app.after(
+                        0,
+                        lambda progress=progress: self._show_extraction_progress(
+                            progress
+                        ),
+                    )
+            except ExtractionCancelled:
+                self.app.after(0, lambda: self._cancel_extraction_run(button))
+                return
             except Exception as exc:  # noqa: BLE001
                 self.app.after(0, lambda exc=exc: self._fail_extraction_run(exc, button))
                 return
@@ -873,8 +906,47 @@ class EventHandlers:
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def on_extraction_cancel(self) -> None:
+        token = getattr(self, "_extraction_cancel_token", None)
+        if token is None or token.cancelled:
+            return
+        token.cancel()
+        button = getattr(self.app, "btn_extraction_run", None)
+        if button is not None:
+            button.configure(state="disabled", text="Cancelando...")
+        self.app.status.configure(text="Cancelando extração...")
+
+    def _show_extraction_progress(self, progress) -> None:
+        if not getattr(self, "_extraction_in_progress", False):
+            return
+        position = f"{progress.file_index + 1}/{progress.file_count}"
+        if progress.result is None:
+            self.app.status.configure(
+                text=(
+                    f"Extraindo {progress.file_name} ({position}): "
+                    f"página {progress.page} de {progress.page_count}"
+                )
+            )
+            return
+
+        # Resultado parcial: o operador já pode revisar os arquivos concluídos.
+        self._show_extraction_result(progress.result)
+        self.app.status.configure(
+            text=f"{position} arquivo(s) concluído(s); extraindo os demais..."
+        )
+
+    def _cancel_extraction_run(self, button: object) -> None:
+        self._extraction_in_progress = False
+        self._extraction_cancel_token = None
+        if button is not None:
+            button.configure(state="normal", text="Extrair Informações")
+        self.app.status.configure(
+            text="Extração cancelada; resultados parciais mantidos"
+        )
+
     def _fail_extraction_run(self, exc: Exception, button: object) -> None:
         self._extraction_in_progress = False
+        self._extraction_cancel_token = None
         if button is not None:
             button.configure(state="normal", text="Extrair Informações")
         logger.exception("Erro ao extrair documento(s)")
@@ -885,17 +957,13 @@ class EventHandlers:
         self, extractor, setup_warnings: List[str], result, button: object
     ) -> None:
         self._extraction_in_progress = False
+        self._extraction_cancel_token = None
         if button is not None:
             button.configure(state="normal", text="Extrair Informações")
 
         if setup_warnings:
             result.warnings = list(dict.fromkeys([*setup_warnings, *result.warnings]))
-        self.app.extraction_data = result.fields
-        self.app.extraction_raw_text = result.raw_text
-        target = str(getattr(self.app, "extraction_target").get())
-        missing_required = self._missing_extraction_keys_for_target(
-            target, result.fields
-        )
+        target, missing_required = self._show_extraction_result(result)
         if missing_required:
             result.warnings.append(
                 (
@@ -904,6 +972,43 @@ class EventHandlers:
                 )
             )
 
+        filtered_warnings = [
+            item
+            for item in result.warnings
+            if "extração via gemini api" not in item.lower()
+            and "resposta gemini normalizada para campos-alvo" not in item.lower()
+        ]
+        if filtered_warnings:
+            warning_text = "\n".join(f"- {item}" for item in filtered_warnings[:8])
+            messagebox.showwarning(
+                "Extração concluída com avisos",
+                f"A extração terminou com alertas:\n\n{warning_text}",
+            )
+
+        provider_label = (
+            "Gemini"
+            if extractor.__class__.__name__ == "GeminiDocumentExtractor"
+            else (
+                "ML Híbrido"
+                if extractor.__class__.__name__ == "MLHybridDocumentExtractor"
+                else "Local"
+            )
+        )
+        self.app.status.configure(
+            text=(
+                f"Extração concluída ({provider_label}): "
+                f"{len(result.fields)} campo(s) identificado(s)"
+            )
+        )
+
+    def _show_extraction_result(self, result) -> Tuple[str, List[str]]:
+        self.app.extraction_data = result.fields
+        self.app.extraction_raw_text = result.raw_text
+        target = str(getattr(self.app, "extraction_target").get())
+        missing_required = self._missing_extraction_keys_for_target(
+            target, result.fields
+        )
+
         if result.fields:
             preferred_order = [
                 "nome",
@@ -954,35 +1059,7 @@ class EventHandlers:
         self._set_textbox_content(
             "extraction_raw_box", result.raw_text or "Sem texto extraído."
         )
-
-        filtered_warnings = [
-            item
-            for item in result.warnings
-            if "extração via gemini api" not in item.lower()
-            and "resposta gemini normalizada para campos-alvo" not in item.lower()
-        ]
-        if filtered_warnings:
-            warning_text = "\n".join(f"- {item}" for item in filtered_warnings[:8])
-            messagebox.showwarning(
-                "Extração concluída com avisos",
-                f"A extração terminou com alertas:\n\n{warning_text}",
-            )
-
-        provider_label = (
-            "Gemini"
-            if extractor.__class__.__name__ == "GeminiDocumentExtractor"
-            else (
-                "ML Híbrido"
-                if extractor.__class__.__name__ == "MLHybridDocumentExtractor"
-                else "Local"
-            )
-        )
-        self.app.status.configure(
-            text=(
-                f"Extração concluída ({provider_label}): "
-                f"{len(result.fields)} campo(s) identificado(s)"
-            )
-        )
+        return target, missing_required
 
     def on_extraction_apply(self) -> None:
         extracted = getattr(self.app, "extraction_data", {})
@@ -1232,7 +1309,7 @@ class EventHandlers:
             "Limpar cache",
             (
                 "Isto removerá caches temporários (templates em memória, "
-                "__pycache__, .mypy_cache, logs e .coverage).\n\n"
+                "extrações salvas, __pycache__, .mypy_cache, logs e .coverage).\n\n"
                 "Deseja continuar?"
             ),
         )
@@ -1249,6 +1326,14 @@ class EventHandlers:
             logger.warning(f"Falha ao limpar cache de templates: {exc}")
             errors.append("cache de templates")
 
+        try:
+            extraction_cache = get_extraction_cache()
+            if extraction_cache is not None:
+                extraction_cache.clear()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Falha ao limpar cache de extração: {exc}")
+            errors.append("cache de extração")
+
         roots = {
             Path.cwd().resolve(),
             Path(self.app.base_dir).resolve(),
@@ -1258,6 +1343,7 @@ class EventHandlers:
             ".mypy_cache",
             ".pytest_cache",
             ".ruff_cache",
+            ".extraction_cache",
             "logs",
         }
         cache_files = {".coverage", ".DS_Store"}
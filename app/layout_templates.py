@@ -0,0 +1,115 @@
+"""Gabaritos de regiões (ROI) dos layouts padrão de RG e CNH.
+
+As caixas são normalizadas (0-1) sobre o cartão já retificado (warp/deskew) e
+em paisagem. Cada região é lida com uma configuração de OCR própria: linha
+única, só dígitos ou bloco curto. Valores que não passam na validação do campo
+são descartados e o extrator volta ao OCR da página inteira.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Flags do Tesseract por tipo de região.
+ROI_CONFIGS: Dict[str, str] = {
+    "text": "--oem 1 --psm 7",
+    "digits": "--oem 1 --psm 7 -c tessedit_char_whitelist=0123456789.-/xX",
+    "date": "--oem 1 --psm 7 -c tessedit_char_whitelist=0123456789/",
+    "lines": "--oem 1 --psm 6",
+}
+# Folga ao redor da caixa, em fração do lado do cartão.
+ROI_MARGIN = 0.01
+# Altura mínima do recorte em pixels; recortes menores são ampliados.
+ROI_MIN_HEIGHT = 48
+
+
+@dataclass(frozen=True)
+class RoiField:
+    key: str
+    box: Tuple[float, float, float, float]
+    kind: str = "text"
+
+    @property
+    def config(self) -> str:
+        return ROI_CONFIGS[self.kind]
+
+
+@dataclass(frozen=True)
+class LayoutTemplate:
+    """Posições dos campos de um tipo/lado de documento.
+
+    `fields` segue a ordem de leitura; campos `lines` (filiação) geram
+    `nome_pai` e `nome_mae` a partir das duas primeiras linhas.
+    """
+
+    doc_type: str
+    doc_side: str
+    fields: Tuple[RoiField, ...]
+    min_aspect: float = 1.3
+    max_aspect: float = 1.8
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        keys = []
+        for field in self.fields:
+            if field.kind == "lines":
+                keys.extend(("nome_pai", "nome_mae"))
+            else:
+                keys.append(field.key)
+        return tuple(keys)
+
+    def matches(self, size: Tuple[int, int]) -> bool:
+        """O recorte retificado tem a proporção (paisagem) do cartão?"""
+        width, height = size
+        if not width or not height:
+            return False
+        return self.min_aspect <= width / height <= self.max_aspect
+
+    def crop(self, image, field: RoiField):
+        width, height = image.size
+        x0, y0, x1, y1 = field.box
+        left = max(0, int((x0 - ROI_MARGIN) * width))
+        top = max(0, int((y0 - ROI_MARGIN) * height))
+        right = min(width, int((x1 + ROI_MARGIN) * width))
+        bottom = min(height, int((y1 + ROI_MARGIN) * height))
+        region = image.crop((left, top, right, bottom))
+        if region.height and region.height < ROI_MIN_HEIGHT:
+            factor = ROI_MIN_HEIGHT / region.height
+            region = region.resize(
+                (max(1, round(region.width * factor)), ROI_MIN_HEIGHT)
+            )
+        return region
+
+
+# RG (modelo de papel): o verso traz os dados; a frente só foto e digital.
+# CNH (modelo de papel dobrado): a frente traz os dados, à direita da foto.
+LAYOUT_TEMPLATES: Dict[Tuple[str, str], LayoutTemplate] = {
+    ("RG", "VERSO"): LayoutTemplate(
+        doc_type="RG",
+        doc_side="VERSO",
+        fields=(
+            RoiField("rg", (0.05, 0.08, 0.45, 0.18), "digits"),
+            RoiField("nome", (0.05, 0.22, 0.95, 0.32)),
+            RoiField("filiacao", (0.05, 0.34, 0.95, 0.55), "lines"),
+            RoiField("data_nascimento", (0.62, 0.56, 0.95, 0.66), "date"),
+            RoiField("cpf", (0.05, 0.80, 0.50, 0.90), "digits"),
+        ),
+    ),
+    ("CNH", "FRENTE"): LayoutTemplate(
+        doc_type="CNH",
+        doc_side="FRENTE",
+        fields=(
+            RoiField("nome", (0.05, 0.17, 0.95, 0.27)),
+            RoiField("rg", (0.37, 0.28, 0.98, 0.38), "digits"),
+            RoiField("cpf", (0.37, 0.38, 0.68, 0.48), "digits"),
+            RoiField("data_nascimento", (0.68, 0.38, 0.98, 0.48), "date"),
+            RoiField("filiacao", (0.37, 0.48, 0.98, 0.70), "lines"),
+            RoiField("cnh_numero", (0.05, 0.80, 0.35, 0.90), "digits"),
+        ),
+    ),
+}
+
+
+def get_layout_template(doc_type: str, doc_side: str) -> Optional[LayoutTemplate]:
+    return LAYOUT_TEMPLATES.get((doc_type, doc_side))
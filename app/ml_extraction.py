@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import os
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 try:
     import cv2  # type: ignore
@@ -28,9 +29,94 @@ except Exception:  # noqa: BLE001
     Image = None  # type: ignore[assignment]
 
 try:
-    from .extraction import DocumentExtractor, ExtractionResult
+    from sklearn.feature_extraction.text import HashingVectorizer  # type: ignore
+except Exception:  # noqa: BLE001
+    HashingVectorizer = None  # type: ignore[assignment]
+
+try:
+    from .layout_templates import LayoutTemplate, RoiField, get_layout_template
 except ImportError:
-    from extraction import DocumentExtractor, ExtractionResult  # type: ignore
+    from layout_templates import (  # type: ignore
+        LayoutTemplate,
+        RoiField,
+        get_layout_template,
+    )
+
+try:
+    from .validators import validar_cnh
+except ImportError:
+    from validators import validar_cnh  # type: ignore
+
+try:
+    from .extraction import (
+        CancellationToken,
+        DocumentExtractor,
+        ExtractionProgress,
+        ExtractionResult,
+        FileExtraction,
+        OcrCandidate,
+        OcrProfile,
+        image_fingerprint,
+    )
+except ImportError:
+    from extraction import (  # type: ignore
+        CancellationToken,
+        DocumentExtractor,
+        ExtractionProgress,
+        ExtractionResult,
+        FileExtraction,
+        OcrCandidate,
+        OcrProfile,
+        image_fingerprint,
+    )
+
+# Lado maior do nível da pirâmide usado para achar inclinação e perspectiva.
+GEOMETRY_ANALYSIS_SIDE = 1024
+# Busca de inclinação residual por perfil de projeção numa miniatura.
+ORIENTATION_THUMB_SIDE = 800
+ORIENTATION_SEARCH_DEGREES = 15
+ORIENTATION_MIN_CONFIDENCE = 2.5
+ORIENTATION_MIN_ANGLE = 0.5
+# Rotações de força bruta usadas quando a estimativa não é confiável.
+FALLBACK_ROTATIONS = (-12.0, -6.0, 6.0, 12.0)
+# Pré-classificação visual (antes do OCR) sobre uma miniatura.
+IMAGE_FEATURE_SIDE = 256
+IMAGE_CLASSIFIER_MIN_PROBABILITY = 0.7
+DEFAULT_IMAGE_MODEL_PATH = "app/models/doc_image_classifier.joblib"
+# Pontuação mínima (`_score_field_value`) para aceitar um campo lido por ROI.
+ROI_MIN_FIELD_SCORE = 80
+# Campos cujo valor lido por ROI pode ser conferido de forma estrita (dígito
+# verificador ou formato fechado). Os gabaritos são aproximados: um recorte
+# desalinhado só dispensa a página inteira quando os campos do gabarito que
+# estão aqui passam na conferência e os demais foram lidos.
+ROI_STRICT_KEYS = ("cpf", "rg", "cnh_numero")
+
+_PSM_BLOCK = "--oem 1 --psm 6"
+_PSM_SPARSE = "--oem 1 --psm 11"
+_PSM_COLUMNS = "--oem 1 --psm 4"
+# Busca OCR por tipo/lado previsto na imagem. O verso do RG concentra nome,
+# filiação, nascimento e CPF e mantém a busca completa; lados com pouco texto
+# útil rodam só os pré-processamentos e PSMs que costumam lê-los.
+OCR_PROFILES: Dict[Tuple[str, str], OcrProfile] = {
+    ("RG", "FRENTE"): OcrProfile(
+        preprocessing=("gray", "contrast"), configs=(_PSM_SPARSE, _PSM_BLOCK)
+    ),
+    ("RG", "VERSO"): OcrProfile(),
+    ("CNH", "FRENTE"): OcrProfile(
+        preprocessing=("contrast", "gray", "sharp"),
+        configs=(_PSM_BLOCK, _PSM_SPARSE),
+    ),
+    ("CNH", "VERSO"): OcrProfile(
+        preprocessing=("contrast",), configs=(_PSM_SPARSE, _PSM_BLOCK)
+    ),
+    ("CPF", "FRENTE"): OcrProfile(
+        preprocessing=("gray", "contrast", "sharp"),
+        configs=(_PSM_BLOCK, _PSM_SPARSE),
+    ),
+    ("CPF", "VERSO"): OcrProfile(
+        preprocessing=("gray", "contrast"), configs=(_PSM_SPARSE, _PSM_BLOCK)
+    ),
+}
 
 _UFS = {
     "AC",
@@ -63,6 +149,63 @@ _UFS = {
 }
 
 
+def image_layout_features(image):
+    """Vetor visual de uma miniatura: cores, bordas por região e orientação.
+
+    Aceita imagem PIL (RGB) ou array BGR do OpenCV; usado no treino e na
+    pré-classificação, então ambos precisam gerar exatamente o mesmo vetor.
+    """
+    if isinstance(image, np.ndarray):
+        bgr = image
+    else:
+        # Reduz na PIL antes de converter (como o `draft` do treino): só a
+        # miniatura, com ao menos o dobro do lado final, é copiada para o OpenCV.
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        factor = max(image.size) // (IMAGE_FEATURE_SIDE * 2)
+        if factor > 1:
+            image = image.reduce(factor)
+        bgr = cv2.cvtColor(np.asarray(image.convert("RGB")), cv2.COLOR_RGB2BGR)
+    height, width = bgr.shape[:2]
+    scale = IMAGE_FEATURE_SIDE / max(height, width, 1)
+    if scale < 1:
+        bgr = cv2.resize(
+            bgr,
+            (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    colour = cv2.calcHist([hsv], [0, 1], None, [8, 4], [0, 180, 0, 256]).ravel()
+    value = cv2.calcHist([hsv], [2], None, [8], [0, 256]).ravel()
+
+    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    edges = cv2.Canny(gray, 60, 180)
+    # Layout sempre em paisagem: a grade compara as mesmas regiões do cartão.
+    if edges.shape[0] > edges.shape[1]:
+        edges = cv2.rotate(edges, cv2.ROTATE_90_CLOCKWISE)
+    layout = cv2.resize(
+        (edges > 0).astype(np.float32), (6, 4), interpolation=cv2.INTER_AREA
+    ).ravel()
+
+    grad_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0)
+    grad_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1)
+    magnitude, angle = cv2.cartToPolar(grad_x, grad_y, angleInDegrees=True)
+    orientation, _ = np.histogram(
+        angle % 180, bins=6, range=(0, 180), weights=magnitude
+    )
+
+    return np.concatenate(
+        [
+            colour / max(float(colour.sum()), 1.0),
+            value / max(float(value.sum()), 1.0),
+            layout,
+            orientation / max(float(orientation.sum()), 1e-6),
+            [float((edges > 0).mean()), min(height, width) / max(height, width, 1)],
+        ]
+    ).astype(np.float32)
+
+
 @dataclass
 class _PerFileExtraction:
     file_name: str
@@ -72,13 +215,65 @@ class _PerFileExtraction:
     doc_type: str
     doc_side: str
     warnings: List[str]
+    pages_skipped: int = 0
+    # Etapa de origem de cada campo (ver `FileExtraction.provenance`).
+    provenance: Dict[str, str] = field(default_factory=dict)
+
+
+class _LinearHead:
+    """Cabeça linear (coeficientes float32) exportada de um LinearSVC.
+
+    `columns` lista as colunas do espaço de hashing que têm peso; `coef` guarda
+    apenas essas colunas.
+    """
+
+    def __init__(self, coef, intercept, classes: Sequence[str], columns=None) -> None:
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = list(classes)
+        self.columns = columns
+
+    def predict(self, features) -> List[str]:
+        scores = self._scores(features)
+        if scores.shape[1] == 1:
+            # Binário: o LinearSVC guarda só o hiperplano da segunda classe.
+            indexes = (scores[:, 0] > 0).astype(int)
+        else:
+            indexes = scores.argmax(axis=1)
+        return [self.classes[index] for index in indexes]
+
+    def predict_proba(self, features):
+        """Probabilidades por classe (logística/softmax sobre as margens).
+
+        Só são calibradas para cabeças treinadas com regressão logística.
+        """
+        scores = self._scores(features)
+        if scores.shape[1] == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        shifted = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return shifted / shifted.sum(axis=1, keepdims=True)
+
+    def _scores(self, features):
+        if self.columns is not None:
+            features = features[:, self.columns]
+        return np.asarray(features @ self.coef.T) + self.intercept
 
 
 class _DocumentTypeSideClassifier:
-    """Classificador opcional de tipo/lado baseado em texto OCR."""
+    """Classificador opcional de tipo/lado baseado em texto OCR.
+
+    Aceita três formatos de artefato:
+    - compacto: parâmetros de um HashingVectorizer (sem vocabulário) e
+      coeficientes float32 das duas cabeças, lidos via memory map;
+    - conjunto: um vetorizador compartilhado (`vectorizer`) e duas cabeças
+      lineares (`type_head`/`side_head`), vetorizando cada texto uma vez;
+    - legado: dois pipelines independentes (`type_model`/`side_model`).
+    """
 
     def __init__(self, model_path: Path) -> None:
         self.model_path = model_path
+        self.vectorizer = None
         self.type_model = None
         self.side_model = None
         self.warnings: List[str] = []
@@ -98,46 +293,86 @@ class _DocumentTypeSideClassifier:
             return
 
         try:
-            payload = joblib.load(self.model_path)
+            # Arrays numpy do artefato são mapeados do disco, não copiados.
+            payload = joblib.load(self.model_path, mmap_mode="r")
         except Exception as exc:  # noqa: BLE001
             self.warnings.append(
                 f"Falha ao carregar modelo ML ({self.model_path.name}): {exc}"
             )
             return
 
+        if isinstance(payload, dict) and payload.get("format") == "compact":
+            self._load_compact(payload)
+            return
         if isinstance(payload, dict):
-            self.type_model = payload.get("type_model")
-            self.side_model = payload.get("side_model")
+            if payload.get("vectorizer") is not None:
+                self.vectorizer = payload.get("vectorizer")
+                self.type_model = payload.get("type_head")
+                self.side_model = payload.get("side_head")
+            else:
+                self.type_model = payload.get("type_model")
+                self.side_model = payload.get("side_model")
 
         if self.type_model is None or self.side_model is None:
+            self.vectorizer = None
             self.warnings.append(
-                "Artefato ML inválido (esperado: type_model/side_model); usando heurísticas."
+                "Artefato ML inválido (esperado: vectorizer/type_head/side_head ou "
+                "type_model/side_model); usando heurísticas."
             )
 
-    def predict(self, text: str, file_name: str = "") -> Tuple[str, str]:
-        doc_type = "DESCONHECIDO"
-        doc_side = "NAO_IDENTIFICADO"
-
-        if self.type_model is not None and text.strip():
-            try:
-                predicted = self.type_model.predict([text])[0]
-                doc_type = str(predicted).strip().upper() or doc_type
-            except Exception:
-                pass
+    def _load_compact(self, payload: Dict) -> None:
+        if HashingVectorizer is None or np is None:
+            self.warnings.append(
+                "Artefato ML compacto requer scikit-learn e numpy; usando heurísticas."
+            )
+            return
+        try:
+            self.vectorizer = HashingVectorizer(**payload["hashing"])
+            self.type_model = _LinearHead(**payload["type_head"])
+            self.side_model = _LinearHead(**payload["side_head"])
+        except Exception as exc:  # noqa: BLE001
+            self.vectorizer = self.type_model = self.side_model = None
+            self.warnings.append(f"Artefato ML compacto inválido: {exc}")
 
-        if self.side_model is not None and text.strip():
+    def predict(self, text: str, file_name: str = "") -> Tuple[str, str]:
+        return self.predict_batch([text], [file_name])[0]
+
+    def predict_batch(
+        self, texts: Sequence[str], file_names: Sequence[str] = ()
+    ) -> List[Tuple[str, str]]:
+        """Classifica vários textos com uma única vetorização."""
+        names = list(file_names) + [""] * (len(texts) - len(file_names))
+        filled = [index for index, text in enumerate(texts) if text.strip()]
+        types: Dict[int, str] = {}
+        sides: Dict[int, str] = {}
+
+        if filled and self.type_model is not None and self.side_model is not None:
+            features = [texts[index] for index in filled]
             try:
-                predicted = self.side_model.predict([text])[0]
-                doc_side = str(predicted).strip().upper() or doc_side
+                if self.vectorizer is not None:
+                    features = self.vectorizer.transform(features)
             except Exception:
-                pass
-
-        if doc_type in {"", "DESCONHECIDO"}:
-            doc_type = self._heuristic_doc_type(text, file_name)
-        if doc_side in {"", "NAO_IDENTIFICADO"}:
-            doc_side = self._heuristic_doc_side(text, file_name)
-
-        return doc_type, doc_side
+                features = None
+            if features is not None:
+                try:
+                    types = dict(zip(filled, self.type_model.predict(features)))
+                except Exception:
+                    pass
+                try:
+                    sides = dict(zip(filled, self.side_model.predict(features)))
+                except Exception:
+                    pass
+
+        predictions: List[Tuple[str, str]] = []
+        for index, text in enumerate(texts):
+            doc_type = str(types.get(index, "")).strip().upper() or "DESCONHECIDO"
+            doc_side = str(sides.get(index, "")).strip().upper() or "NAO_IDENTIFICADO"
+            if doc_type in {"", "DESCONHECIDO"}:
+                doc_type = self._heuristic_doc_type(text, names[index])
+            if doc_side in {"", "NAO_IDENTIFICADO"}:
+                doc_side = self._heuristic_doc_side(text, names[index])
+            predictions.append((doc_type, doc_side))
+        return predictions
 
     @staticmethod
     def _heuristic_doc_type(text: str, file_name: str = "") -> str:
@@ -202,6 +437,67 @@ class _DocumentTypeSideClassifier:
         return "FRENTE" if front_score >= back_score else "VERSO"
 
 
+class _ImageTypeSideClassifier:
+    """Pré-classificador de tipo/lado pela aparência, antes do OCR.
+
+    O artefato (`format: image`) guarda duas cabeças logísticas sobre
+    `image_layout_features`, com a padronização das features já embutida nos
+    coeficientes. Sem artefato, `predict` não arrisca e a busca OCR é completa.
+    """
+
+    def __init__(self, model_path: Path) -> None:
+        self.model_path = model_path
+        self.type_model: Optional[_LinearHead] = None
+        self.side_model: Optional[_LinearHead] = None
+        self.warnings: List[str] = []
+        self._load()
+
+    @property
+    def available(self) -> bool:
+        return self.type_model is not None and self.side_model is not None
+
+    def _load(self) -> None:
+        # Modelo opcional: a ausência do arquivo não gera aviso.
+        if joblib is None or cv2 is None or np is None:
+            return
+        if not self.model_path.exists():
+            return
+        try:
+            payload = joblib.load(self.model_path, mmap_mode="r")
+            if not isinstance(payload, dict) or payload.get("format") != "image":
+                raise ValueError("formato diferente de 'image'")
+            if payload.get("feature_side") != IMAGE_FEATURE_SIDE:
+                raise ValueError("features geradas com outra miniatura; retreine")
+            self.type_model = _LinearHead(**payload["type_head"])
+            self.side_model = _LinearHead(**payload["side_head"])
+        except Exception as exc:  # noqa: BLE001
+            self.type_model = self.side_model = None
+            self.warnings.append(
+                f"Falha ao carregar classificador visual ({self.model_path.name}): "
+                f"{exc}"
+            )
+
+    def predict(self, image) -> Tuple[str, str, float]:
+        """Retorna tipo, lado e a menor das duas probabilidades.
+
+        Abaixo de `IMAGE_CLASSIFIER_MIN_PROBABILITY` devolve o par desconhecido.
+        """
+        if not self.available:
+            return "DESCONHECIDO", "NAO_IDENTIFICADO", 0.0
+        try:
+            features = image_layout_features(image)[np.newaxis, :]
+            type_proba = self.type_model.predict_proba(features)[0]
+            side_proba = self.side_model.predict_proba(features)[0]
+        except Exception:  # noqa: BLE001
+            return "DESCONHECIDO", "NAO_IDENTIFICADO", 0.0
+        doc_type = str(self.type_model.classes[int(type_proba.argmax())]).upper()
+        doc_side = str(self.side_model.classes[int(side_proba.argmax())]).upper()
+        confidence = float(min(type_proba.max(), side_proba.max()))
+        if confidence < IMAGE_CLASSIFIER_MIN_PROBABILITY:
+            return "DESCONHECIDO", "NAO_IDENTIFICADO", confidence
+        return doc_type, doc_side, confidence
+
+
 class MLHybridDocumentExtractor:
     """Extrator local com técnicas de visão computacional para imagens difíceis."""
 
@@ -210,11 +506,21 @@ class MLHybridDocumentExtractor:
     def __init__(
         self,
         model_path: str = "app/models/doc_classifier.joblib",
+        image_model_path: str = DEFAULT_IMAGE_MODEL_PATH,
     ) -> None:
         self.local_extractor = DocumentExtractor()
         self.model_path = Path(model_path)
         self.classifier = _DocumentTypeSideClassifier(self.model_path)
+        self.image_model_path = Path(image_model_path)
+        self.image_classifier = _ImageTypeSideClassifier(self.image_model_path)
+        try:
+            self.geometry_analysis_side = int(
+                os.environ.get("ML_GEOMETRY_ANALYSIS_SIDE", GEOMETRY_ANALYSIS_SIDE)
+            )
+        except ValueError:
+            self.geometry_analysis_side = GEOMETRY_ANALYSIS_SIDE
         self._setup_warnings: List[str] = list(self.classifier.warnings)
+        self._setup_warnings.extend(self.image_classifier.warnings)
 
         if Image is None:
             self._setup_warnings.append(
@@ -228,45 +534,119 @@ class MLHybridDocumentExtractor:
     def get_setup_warnings(self) -> List[str]:
         return list(self._setup_warnings)
 
-    def extract_from_files(self, files: Sequence[Path]) -> ExtractionResult:
+    def warm_up(self) -> None:
+        # Primeira predição inicializa o vetorizador; o OCR aquece em seguida.
+        self.classifier.predict("registro geral", file_name="warm_up")
+        self.local_extractor.warm_up()
+
+    def extract_from_files(
+        self, files: Sequence[Path], required_keys: Sequence[str] = ()
+    ) -> ExtractionResult:
+        return self.local_extractor._collect(
+            self.iter_extract_from_files(files, required_keys),
+            ExtractionResult(
+                raw_text="", fields={}, warnings=self.get_setup_warnings()
+            ),
+        )
+
+    def iter_extract_from_files(
+        self,
+        files: Sequence[Path],
+        required_keys: Sequence[str] = (),
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[ExtractionProgress]:
         blocks: List[str] = []
         warnings: List[str] = self.get_setup_warnings()
 
         merged_fields: Dict[str, str] = {}
         field_scores: Dict[str, int] = {}
-
-        for file_path in files:
-            if not file_path.exists():
-                warnings.append(f"Arquivo não encontrado: {file_path.name}")
+        provenance: Dict[str, str] = {}
+
+        # Extração por arquivo em paralelo; a fusão dos campos segue a ordem de
+        # entrada para que o resultado não dependa de qual arquivo terminou antes.
+        for progress, result in self.local_extractor._stream_files(
+            lambda path: self._extract_single_cached(path, required_keys),
+            files,
+            cancel_token,
+        ):
+            if progress.page:
+                yield progress
                 continue
-
-            result = self._extract_single(file_path)
-            warnings.extend(result.warnings)
-
-            if result.text.strip():
-                header = (
-                    f"===== {result.file_name} "
-                    f"({result.doc_type}/{result.doc_side}) ====="
+            if result is None:
+                warnings.append(f"Arquivo não encontrado: {progress.file_name}")
+            else:
+                warnings.extend(result.warnings)
+
+                if result.text.strip():
+                    header = (
+                        f"===== {result.file_name} "
+                        f"({result.doc_type}/{result.doc_side}) ====="
+                    )
+                    blocks.append(f"{header}\n{result.text.strip()}")
+
+                self._merge_fields(
+                    out=merged_fields,
+                    out_scores=field_scores,
+                    incoming=result.fields,
+                    extraction_score=result.score,
+                    doc_side=result.doc_side,
+                    out_provenance=provenance,
+                    incoming_provenance=result.provenance,
                 )
-                blocks.append(f"{header}\n{result.text.strip()}")
-
-            self._merge_fields(
-                out=merged_fields,
-                out_scores=field_scores,
-                incoming=result.fields,
-                extraction_score=result.score,
-                doc_side=result.doc_side,
-            )
 
-        raw_text = "\n\n".join(blocks).strip()
-        return ExtractionResult(
-            raw_text=raw_text, fields=merged_fields, warnings=warnings
+            progress.result = ExtractionResult(
+                raw_text="\n\n".join(blocks).strip(),
+                fields=dict(merged_fields),
+                warnings=list(warnings),
+                provenance=dict(provenance),
+            )
+            yield progress
+
+    def _cache_provider(self) -> str:
+        local = self.local_extractor
+        return (
+            f"ml:{local.ocr_search_mode}:{local.ocr_budget.tag}:"
+            f"{self._model_stamp(self.model_path)}:"
+            f"{self._model_stamp(self.image_model_path)}"
         )
 
-    def _extract_single(self, file_path: Path) -> _PerFileExtraction:
+    @staticmethod
+    def _model_stamp(path: Path) -> str:
+        try:
+            stat = path.stat()
+        except OSError:
+            return "sem-modelo"
+        return f"{path.name}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def _extract_single_cached(
+        self, file_path: Path, required_keys: Sequence[str] = ()
+    ) -> _PerFileExtraction:
+        cache = self.local_extractor.cache
+        if cache is None:
+            return self._extract_single(file_path, required_keys)
+        try:
+            key = cache.make_key(file_path, self._cache_provider())
+        except OSError:
+            return self._extract_single(file_path, required_keys)
+
+        cached = cache.get(key)
+        if self.local_extractor._cached_entry_covers(cached, required_keys):
+            try:
+                return _PerFileExtraction(**cached)
+            except TypeError:
+                pass
+
+        result = self._extract_single(file_path, required_keys)
+        if result.text.strip():
+            cache.put(key, asdict(result))
+        return result
+
+    def _extract_single(
+        self, file_path: Path, required_keys: Sequence[str] = ()
+    ) -> _PerFileExtraction:
         suffix = file_path.suffix.lower()
         if suffix == ".pdf":
-            return self._extract_pdf(file_path)
+            return self._extract_pdf(file_path, required_keys)
         if suffix in self.SUPPORTED_IMAGES:
             return self._extract_image(file_path)
         return _PerFileExtraction(
@@ -279,12 +659,13 @@ class MLHybridDocumentExtractor:
             warnings=[f"Formato não suportado: {file_path.name}"],
         )
 
-    def _extract_pdf(self, file_path: Path) -> _PerFileExtraction:
-        text, warnings = self.local_extractor._extract_single(file_path)
-        text = self.local_extractor._normalize_extracted_text(text)
-
-        fields = self.local_extractor.parse_fields(text) if text else {}
-        fields.update(self._extract_cnh_fields(text))
+    def _extract_pdf(
+        self, file_path: Path, required_keys: Sequence[str] = ()
+    ) -> _PerFileExtraction:
+        # Texto já normalizado e campos já interpretados pelo extrator local.
+        extraction = self.local_extractor._extract_single(file_path, required_keys)
+        text = extraction.text
+        fields, provenance = self._with_cnh_fields(extraction)
         score = self.local_extractor._score_ocr_text(text)
         doc_type, doc_side = self.classifier.predict(text, file_name=file_path.name)
 
@@ -295,14 +676,27 @@ class MLHybridDocumentExtractor:
             score=score,
             doc_type=doc_type,
             doc_side=doc_side,
-            warnings=warnings,
+            warnings=extraction.warnings,
+            pages_skipped=extraction.pages_skipped,
+            provenance=provenance,
         )
 
+    def _with_cnh_fields(
+        self, extraction: FileExtraction
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Campos do extrator local somados às heurísticas de CNH sobre o texto."""
+        fields = dict(extraction.fields)
+        provenance = dict(extraction.provenance)
+        for key, value in self._extract_cnh_fields(extraction.text).items():
+            fields[key] = value
+            provenance[key] = "cnh"
+        return fields, provenance
+
     def _extract_image(self, file_path: Path) -> _PerFileExtraction:
         if Image is None:
-            text, fallback_warnings = self.local_extractor._extract_single(file_path)
-            fields = self.local_extractor.parse_fields(text) if text else {}
-            fields.update(self._extract_cnh_fields(text))
+            extraction = self.local_extractor._extract_single(file_path)
+            text = extraction.text
+            fields, provenance = self._with_cnh_fields(extraction)
             score = self.local_extractor._score_ocr_text(text)
             doc_type, doc_side = self.classifier.predict(text, file_name=file_path.name)
             return _PerFileExtraction(
@@ -312,14 +706,14 @@ class MLHybridDocumentExtractor:
                 score=score,
                 doc_type=doc_type,
                 doc_side=doc_side,
-                warnings=fallback_warnings,
+                warnings=extraction.warnings,
+                provenance=provenance,
             )
 
         warnings: List[str] = []
         try:
-            with Image.open(file_path) as source_image:
-                rgb_image = source_image.convert("RGB")
-                variants = self._prepare_variants(rgb_image)
+            rgb_image, _ = self.local_extractor._load_image_for_ocr(file_path)
+            variants, card = self._prepare_variants(rgb_image)
         except Exception as exc:  # noqa: BLE001
             return _PerFileExtraction(
                 file_name=file_path.name,
@@ -331,26 +725,80 @@ class MLHybridDocumentExtractor:
                 warnings=[f"Falha ao processar imagem {file_path.name}: {exc}"],
             )
 
-        best_text = ""
+        # Tipo/lado previstos pela aparência escolhem a busca OCR; sem previsão
+        # confiável, a busca é completa.
+        image_type, image_side, _ = self.image_classifier.predict(rgb_image)
+        profile = OCR_PROFILES.get((image_type, image_side))
+
+        # Um único plano para todas as variações: jobs repetidos rodam uma vez e
+        # o orçamento de OCR vale para o documento inteiro.
+        candidates: Dict[int, List[OcrCandidate]] = {}
+        roi_fields: Dict[str, str] = {}
+        if self.local_extractor.ocr_engine is None:
+            warnings.append("pytesseract indisponível.")
+        else:
+            plan = self.local_extractor._new_ocr_plan()
+            # Layout conhecido: primeiro só os recortes dos campos; a página
+            # inteira fica de fallback para o que não for lido/validado.
+            template = get_layout_template(image_type, image_side)
+            if (
+                template is not None
+                and card is not None
+                and template.matches(card.size)
+            ):
+                roi_fields = self._ocr_template(card, template, plan)
+            if template is None or not self._roi_covers_template(template, roi_fields):
+                for index, variant in enumerate(variants):
+                    self.local_extractor._plan_image_jobs(
+                        plan, variant, group=index, profile=profile
+                    )
+                candidates, ocr_warnings = self.local_extractor._run_ocr_plan(plan)
+                warnings.extend(
+                    ocr_warnings
+                    or ([] if candidates or roi_fields else ["Falha no OCR."])
+                )
+
+        # Cada variação já traz texto normalizado e campos fundidos por
+        # confiança; nada é reinterpretado aqui.
+        best = FileExtraction()
         best_score = -1
-        for variant in variants:
-            text, ocr_warnings = self.local_extractor._ocr_pil_image(variant)
-            warnings.extend(ocr_warnings)
-            normalized = self.local_extractor._normalize_extracted_text(text)
-            score = self.local_extractor._score_ocr_text(normalized)
+        for index in sorted(candidates):
+            extraction = self.local_extractor._merge_candidate_fields(candidates[index])
+            score = self.local_extractor._score_ocr_text(extraction.text)
             if score > best_score:
                 best_score = score
-                best_text = normalized
+                best = extraction
 
+        best_text = best.text
+        if roi_fields and not best_text:
+            # Só para exibição: os campos do gabarito entram direto abaixo.
+            best_text = "\n".join(self._fields_to_hint_lines(roi_fields))
+            best_score = self.local_extractor._score_ocr_text(best_text)
         if best_score < 0:
             best_score = 0
 
-        fields = self.local_extractor.parse_fields(best_text) if best_text else {}
-        fields.update(self._extract_cnh_fields(best_text))
+        fields, provenance = self._with_cnh_fields(best)
+        score_field = self.local_extractor._score_field_value
+        for key, value in roi_fields.items():
+            # Valores conferidos disputam com a página inteira; os demais só
+            # preenchem o que a página inteira não leu.
+            if self._roi_value_is_strict(key, value, roi_fields):
+                replace = score_field(key, value) >= score_field(
+                    key, fields.get(key, "")
+                )
+            else:
+                replace = not fields.get(key)
+            if replace:
+                fields[key] = value
+                provenance[key] = "roi"
 
         doc_type, doc_side = self.classifier.predict(
             best_text, file_name=file_path.name
         )
+        if doc_type == "DESCONHECIDO":
+            doc_type = image_type
+        if doc_side == "NAO_IDENTIFICADO":
+            doc_side = image_side
         best_score += self._document_bonus(doc_type, doc_side, best_text)
 
         return _PerFileExtraction(
@@ -361,17 +809,133 @@ class MLHybridDocumentExtractor:
             doc_type=doc_type,
             doc_side=doc_side,
             warnings=warnings,
+            provenance=provenance,
         )
 
-    def _prepare_variants(self, image_obj) -> List:
+    def _ocr_template(self, card, template: LayoutTemplate, plan) -> Dict[str, str]:
+        """Lê só as regiões do gabarito; devolve os campos que passaram na validação."""
+        jobs = [(template.crop(card, field), field.config) for field in template.fields]
+        plan.charge(len(jobs))
+        outcomes = self.local_extractor._run_ocr_jobs(jobs)
+        fields: Dict[str, str] = {}
+        for roi, (result, _) in zip(template.fields, outcomes):
+            fields.update(self._roi_values(roi, result.text))
+        return fields
+
+    def _roi_values(self, field: RoiField, text: str) -> Dict[str, str]:
+        """Converte o texto de um recorte em campos, só quando válidos."""
+        local = self.local_extractor
+        if field.key == "cpf":
+            digits = local._ocr_to_digits(text)
+            for start in range(max(0, len(digits) - 10)):
+                window = digits[start : start + 11]
+                if local._is_valid_cpf(window):
+                    return {"cpf": local._format_cpf_digits(window)}
+            return {}
+        if field.key in {"rg", "cnh_numero"}:
+            value = re.sub(r"[^0-9Xx]", "", text).upper()
+            minimum = 11 if field.key == "cnh_numero" else 5
+            return {field.key: value} if len(value) >= minimum else {}
+
+        if field.key == "data_nascimento":
+            values = {"data_nascimento": local._extract_date_from_text(text)}
+        elif field.kind == "lines":
+            names = [
+                local._clean_person_name(line)
+                for line in text.splitlines()
+                if line.strip()
+            ]
+            values = dict(zip(("nome_pai", "nome_mae"), [n for n in names if n]))
+        else:
+            values = {field.key: local._clean_person_name(text)}
+        return {
+            key: value
+            for key, value in values.items()
+            if value and local._score_field_value(key, value) >= ROI_MIN_FIELD_SCORE
+        }
+
+    def _roi_covers_template(
+        self, template: LayoutTemplate, roi_fields: Dict[str, str]
+    ) -> bool:
+        """Os recortes bastam para dispensar a página inteira?
+
+        Campos conferíveis (`ROI_STRICT_KEYS`) precisam passar na conferência
+        estrita; os demais só precisam ter sido lidos, o que em `_roi_values`
+        já exige `ROI_MIN_FIELD_SCORE`.
+        """
+        for key in template.keys:
+            value = roi_fields.get(key, "")
+            if key in ROI_STRICT_KEYS:
+                if not self._roi_value_is_strict(key, value, roi_fields):
+                    return False
+            elif not value:
+                return False
+        return True
+
+    def _roi_value_is_strict(
+        self, key: str, value: str, roi_fields: Dict[str, str]
+    ) -> bool:
+        """Valor de recorte conferido por dígito verificador ou formato fechado."""
+        if key not in ROI_STRICT_KEYS or not value:
+            return False
+        local = self.local_extractor
+        if key == "cpf":
+            return local._is_valid_cpf(local._ocr_to_digits(value))
+        if key == "cnh_numero":
+            return validar_cnh(value)
+        # RG: 6 a 9 dígitos e o verificador (dígito ou X); descarta datas
+        # compactadas e o próprio CPF lido em outro recorte.
+        if not re.fullmatch(r"\d{6,9}[0-9X]", value):
+            return False
+        if len(value) == 8 and value.startswith(("19", "20")):
+            return False
+        return value != local._ocr_to_digits(roi_fields.get("cpf", ""))
+
+    def _fields_to_hint_lines(self, fields: Dict[str, str]) -> List[str]:
+        """Linhas "RÓTULO: valor" para exibir campos lidos só pelo gabarito."""
+        hint_map = (
+            ("nome", "NOME"),
+            ("nome_pai", "NOME_PAI"),
+            ("nome_mae", "NOME_MAE"),
+            ("cpf", "CPF"),
+            ("data_nascimento", "DATA DE NASCIMENTO"),
+            ("sexo", "SEXO"),
+            ("nacionalidade", "NACIONALIDADE"),
+            ("naturalidade", "NATURALIDADE"),
+            ("rg", "RG"),
+            ("orgao_rg", "ORGAO_RG"),
+            ("uf_rg", "UF_RG"),
+            ("cnh_numero", "CNH_NUMERO"),
+            ("cnh_uf", "CNH_UF"),
+            ("cnh_data_expedicao", "CNH_DATA_EXPEDICAO"),
+        )
+        local = self.local_extractor
+        out: List[str] = []
+        for key, label in hint_map:
+            value = local._clean_value(str(fields.get(key, "")))
+            if key == "naturalidade":
+                value = local._clean_location_value(value)
+            elif key == "nacionalidade":
+                value = local._clean_nationality_value(value)
+            if not value:
+                continue
+            out.append(f"{label}: {value}")
+        return out
+
+    def _prepare_variants(self, image_obj) -> Tuple[List, Optional[object]]:
+        """Variações geométricas da foto e o cartão retificado, se encontrado.
+
+        O cartão só existe quando o warp achou o contorno do documento; é sobre
+        ele que os gabaritos de ROI são aplicados.
+        """
         variants = [image_obj]
         if cv2 is None or np is None:
-            return variants
+            return variants, None
 
         try:
             bgr = cv2.cvtColor(np.array(image_obj), cv2.COLOR_RGB2BGR)
         except Exception:
-            return variants
+            return variants, None
 
         cv_variants = [bgr]
 
@@ -381,39 +945,120 @@ class MLHybridDocumentExtractor:
         warped = self._try_perspective_warp(deskewed)
         cv_variants.append(warped)
 
-        for angle in (-12, -6, 6, 12):
-            cv_variants.append(self._rotate_bound(warped, angle))
-
-        seen_signatures: set[Tuple[int, int, int]] = set()
+        # Inclinação residual estimada numa miniatura; rotações fixas só quando a
+        # estimativa não é confiável.
+        angles, confidence = self._estimate_skew_angles(warped)
+        if confidence < ORIENTATION_MIN_CONFIDENCE:
+            angles = list(FALLBACK_ROTATIONS)
+        for angle in angles:
+            if abs(angle) >= ORIENTATION_MIN_ANGLE:
+                cv_variants.append(self._rotate_bound(warped, angle))
+
+        # Deduplicação pelos pixels: rotações +θ e −θ têm as mesmas dimensões,
+        # mas são leituras diferentes.
+        seen_fingerprints = {image_fingerprint(image_obj)}
         output = [image_obj]
         for item in cv_variants:
             if item is None or not hasattr(item, "shape"):
                 continue
-            shape = getattr(item, "shape", None)
-            if shape is None or len(shape) < 2:
+            try:
+                variant = Image.fromarray(cv2.cvtColor(item, cv2.COLOR_BGR2RGB))
+            except Exception:
                 continue
-            signature = (
-                int(shape[0]),
-                int(shape[1]),
-                int(shape[2] if len(shape) > 2 else 1),
-            )
-            if signature in seen_signatures:
+            fingerprint = image_fingerprint(variant)
+            if fingerprint in seen_fingerprints:
                 continue
-            seen_signatures.add(signature)
+            seen_fingerprints.add(fingerprint)
+            output.append(variant)
+
+        card = None
+        if warped is not deskewed:
             try:
-                rgb = cv2.cvtColor(item, cv2.COLOR_BGR2RGB)
-                output.append(Image.fromarray(rgb))
+                card = Image.fromarray(cv2.cvtColor(warped, cv2.COLOR_BGR2RGB))
             except Exception:
-                continue
+                card = None
+        return output, card
+
+    def _estimate_skew_angles(self, image) -> Tuple[List[float], float]:
+        """Estima a inclinação das linhas de texto por perfil de projeção.
+
+        Gira uma miniatura binarizada dentro de ±ORIENTATION_SEARCH_DEGREES e
+        mede a nitidez do perfil horizontal (linhas de texto alinhadas geram
+        picos e vales bem marcados). Retorna até dois ângulos candidatos e a
+        confiança do melhor, em desvios-padrão acima da média dos ângulos
+        testados.
+        """
+        if cv2 is None or np is None:
+            return [], 0.0
+        try:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            height, width = gray.shape[:2]
+            factor = ORIENTATION_THUMB_SIDE / max(height, width)
+            if factor < 1:
+                gray = cv2.resize(
+                    gray,
+                    (max(1, int(width * factor)), max(1, int(height * factor))),
+                    interpolation=cv2.INTER_AREA,
+                )
+            _, binary = cv2.threshold(
+                gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU
+            )
+        except Exception:
+            return [], 0.0
+
+        def profile_score(angle: float) -> float:
+            h, w = binary.shape[:2]
+            matrix = cv2.getRotationMatrix2D((w / 2.0, h / 2.0), angle, 1.0)
+            rotated = cv2.warpAffine(binary, matrix, (w, h), flags=cv2.INTER_NEAREST)
+            rows = rotated.sum(axis=1, dtype=np.float64)
+            return float(np.sum(np.diff(rows) ** 2))
 
-        return output
+        coarse = np.arange(
+            -ORIENTATION_SEARCH_DEGREES, ORIENTATION_SEARCH_DEGREES + 0.5, 1.0
+        )
+        scores = np.array([profile_score(float(angle)) for angle in coarse])
+        spread = float(scores.std())
+        if spread <= 0:
+            return [], 0.0
+        confidence = float((scores.max() - scores.mean()) / spread)
+
+        best = float(coarse[int(scores.argmax())])
+        fine = np.arange(best - 0.75, best + 0.8, 0.25)
+        refined = float(fine[int(np.argmax([profile_score(a) for a in fine]))])
+        angles = [refined]
+
+        # Segundo pico distinto e quase tão bom (ex.: texto e bordas em ângulos
+        # diferentes) também vira candidato.
+        far = np.abs(coarse - best) >= 3
+        if far.any():
+            runner_up = int(np.argmax(np.where(far, scores, -np.inf)))
+            if scores[runner_up] >= scores.max() * 0.95:
+                angles.append(float(coarse[runner_up]))
+        return angles, confidence
+
+    def _analysis_level(self, image) -> Tuple[object, Tuple[float, float]]:
+        """Desce a pirâmide gaussiana até o lado maior caber na análise.
+
+        Retorna a imagem reduzida e a escala (x, y) para voltar à resolução
+        original. Com `geometry_analysis_side` <= 0 a análise usa a imagem
+        inteira.
+        """
+        level = image
+        limit = self.geometry_analysis_side
+        while limit > 0 and max(level.shape[:2]) > limit:
+            level = cv2.pyrDown(level)
+        height, width = image.shape[:2]
+        return level, (width / level.shape[1], height / level.shape[0])
 
     def _deskew_image(self, image):
         if cv2 is None or np is None:
             return image
 
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # O ângulo não depende da escala: mede no nível reduzido e gira o
+            # original uma única vez.
+            level, _ = self._analysis_level(image)
+            gray = cv2.cvtColor(level, cv2.COLOR_BGR2GRAY)
             gray = cv2.GaussianBlur(gray, (5, 5), 0)
             _, thresh = cv2.threshold(
                 gray,
@@ -440,7 +1085,8 @@ class MLHybridDocumentExtractor:
             return image
 
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            level, scale = self._analysis_level(image)
+            gray = cv2.cvtColor(level, cv2.COLOR_BGR2GRAY)
             blur = cv2.GaussianBlur(gray, (5, 5), 0)
             edges = cv2.Canny(blur, 60, 180)
             contours, _ = cv2.findContours(
@@ -451,18 +1097,20 @@ class MLHybridDocumentExtractor:
             if not contours:
                 return image
 
-            image_area = image.shape[0] * image.shape[1]
+            level_area = level.shape[0] * level.shape[1]
             contours = sorted(contours, key=cv2.contourArea, reverse=True)[:8]
 
             for contour in contours:
                 area = cv2.contourArea(contour)
-                if area < image_area * 0.20:
+                if area < level_area * 0.20:
                     continue
                 perimeter = cv2.arcLength(contour, True)
                 approx = cv2.approxPolyDP(contour, 0.02 * perimeter, True)
                 if len(approx) != 4:
                     continue
+                # Cantos achados no nível reduzido; o warp usa a imagem original.
                 points = approx.reshape(4, 2).astype("float32")
+                points *= np.array(scale, dtype="float32")
                 ordered = self._order_points(points)
                 return self._warp_from_points(image, ordered)
         except Exception:
@@ -634,6 +1282,8 @@ class MLHybridDocumentExtractor:
         incoming: Dict[str, str],
         extraction_score: int,
         doc_side: str,
+        out_provenance: Optional[Dict[str, str]] = None,
+        incoming_provenance: Optional[Dict[str, str]] = None,
     ) -> None:
         for key, raw_value in incoming.items():
             value = self.local_extractor._clean_value(str(raw_value or ""))
@@ -645,6 +1295,8 @@ class MLHybridDocumentExtractor:
             if score > previous:
                 out[key] = value
                 out_scores[key] = score
+                if out_provenance is not None:
+                    out_provenance[key] = (incoming_provenance or {}).get(key, "")
 
     def _field_score(self, key: str, value: str, doc_side: str) -> int:
         score = len(value)
@@ -33,6 +33,26 @@ def validar_cpf(cpf: str) -> bool:
     return True
 
 
+def validar_cnh(cnh: str) -> bool:
+    """Valida número de registro da CNH (11 dígitos, algoritmo do DENATRAN)"""
+    digits = only_digits(cnh)
+    if len(digits) != 11 or digits == digits[0] * 11:
+        return False
+
+    base = [int(ch) for ch in digits[:9]]
+    digito1 = sum(value * (9 - i) for i, value in enumerate(base)) % 11
+    desconto = 0
+    if digito1 >= 10:
+        digito1 = 0
+        desconto = 2
+
+    resto = sum(value * (1 + i) for i, value in enumerate(base)) % 11
+    digito2 = (resto - desconto) % 11
+    if digito2 >= 10:
+        digito2 = 0
+    return digits[9:] == f"{digito1}{digito2}"
+
+
 def format_cpf(value: str) -> str:
     """Formata CPF para o padrão 000.000.000-00"""
     digits = only_digits(value)